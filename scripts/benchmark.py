@@ -0,0 +1,393 @@
+#!/usr/bin/env python3
+"""
+Headless benchmark suite for the game's hot paths.
+
+Runs with SDL's dummy video and audio drivers, so no window is opened and
+the suite works on CI machines. Each benchmark reports a single number with
+its unit and whether higher is better:
+
+    update        simulation ticks per second (BeaverSurvivalGame.step)
+    draw          frames per second of draw(), full and dirty-rect
+    collection    FoodManager.check_collection cost per call, 10..100k items
+    ui            UI.draw_hud and menu cost per call, cached and uncached
+    startup       milliseconds to import the game, open it and draw a frame
+    ecs           bulk movement, zone and sprite systems over many entities
+
+Usage:
+    python scripts/benchmark.py --output results.json
+    python scripts/benchmark.py --compare baseline.json [--threshold 0.1]
+
+With --compare, every result is checked against the baseline file and the
+script exits with code 1 if any got worse by more than the threshold.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+# Add src directory to path so we can import newgame
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+import pygame  # noqa: E402
+
+from newgame.config.settings import (  # noqa: E402
+    SCREEN_WIDTH,
+    SCREEN_HEIGHT,
+    PLAYER_SIZE,
+    PLAYER_SPEED,
+    PLAYER_SPEED_LAND,
+)
+from newgame.core import ecs  # noqa: E402
+from newgame.core.clock import SimulationClock  # noqa: E402
+from newgame.core.game import BeaverSurvivalGame  # noqa: E402
+from newgame.entities.food import FoodManager  # noqa: E402
+from newgame.entities.objects import Dam, Lodge  # noqa: E402
+from newgame.systems.ui import UI  # noqa: E402
+from newgame.utils.input import mask_to_keys  # noqa: E402
+
+# Run in a fresh interpreter by bench_startup, so nothing is imported or
+# initialized yet; prints the phase timings as JSON on its last line
+STARTUP_SCRIPT = """
+import json, time
+start = time.perf_counter()
+from newgame.core.game import BeaverSurvivalGame
+imported = time.perf_counter()
+game = BeaverSurvivalGame(seed=1)
+initialized = time.perf_counter()
+game.draw()
+drawn = time.perf_counter()
+print(json.dumps([imported - start, initialized - imported, drawn - initialized]))
+"""
+
+# check_collection calls per run by item count. Baseline timings are about
+# 1 us per call up to 100 items, 80 us at 10k and 1 ms at 100k, so the
+# largest size gets fewer calls; the counts are fixed so that a slower
+# build does the same work and its regression shows in full
+COLLECTION_CALLS = {10: 2000, 100: 2000, 1000: 2000, 10000: 2000, 100000: 500}
+ECS_SIZES = (1000, 5000)
+
+
+def best_of(repeats, func):
+    """Return the fastest of several timed runs of func, in seconds."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def random_inputs(count, seed=0):
+    """Return a list of keys_pressed dicts for held keys that change often."""
+    rng = random.Random(seed)
+    inputs = []
+    keys = mask_to_keys(0)
+    for _ in range(count):
+        if rng.random() < 0.05:
+            keys = mask_to_keys(rng.randrange(256))
+        inputs.append(keys)
+    return inputs
+
+
+def result(value, unit, higher_is_better):
+    return {"value": value, "unit": unit, "higher_is_better": higher_is_better}
+
+
+def bench_update(scale, repeats):
+    """Ticks per second of the game simulation, with and without food."""
+    ticks = 6000 * scale
+    inputs = random_inputs(ticks)
+    results = {}
+    for label, food in (("update", 0), ("update_200_food", 200)):
+
+        def run():
+            game = BeaverSurvivalGame(headless=True, seed=1)
+            for _ in range(food):
+                game.food_manager._spawn_food()
+            step = game.step
+            for keys in inputs:
+                step(keys)
+
+        results[label] = result(ticks / best_of(repeats, run), "ticks/s", True)
+    return results
+
+
+def bench_draw(scale, repeats):
+    """Frames per second of draw() against the dummy display."""
+    frames = 300 * scale
+    inputs = random_inputs(frames)
+    results = {}
+    for label, dirty_rects in (("draw_full", False), ("draw_dirty_rects", True)):
+        game = BeaverSurvivalGame(
+            seed=1, dirty_rects=dirty_rects, clock=SimulationClock()
+        )
+        for _ in range(100):
+            game.food_manager._spawn_food()
+
+        def run():
+            for keys in inputs:
+                game.keys_pressed = keys
+                game.update()
+                game.draw()
+
+        results[label] = result(frames / best_of(repeats, run), "frames/s", True)
+    return results
+
+
+def bench_collection(scale, repeats):
+    """Microseconds per check_collection call as the item count grows."""
+    rng = random.Random(0)
+    probes = [
+        pygame.Rect(rng.randrange(SCREEN_WIDTH), rng.randrange(SCREEN_HEIGHT), 20, 20)
+        for _ in range(max(COLLECTION_CALLS.values()) * scale)
+    ]
+    empty = pygame.Rect(0, 0, 0, 0)
+    results = {}
+    for size, calls in COLLECTION_CALLS.items():
+        calls *= scale
+        manager = FoodManager(
+            empty, empty, clock=SimulationClock(), rng=random.Random(1)
+        )
+        for _ in range(size):
+            manager.add_food(
+                rng.randrange(8, SCREEN_WIDTH - 16),
+                rng.randrange(18, SCREEN_HEIGHT - 16),
+                rng.choice(("berry", "leaf")),
+            )
+
+        best = float("inf")
+        for _ in range(repeats):
+            check = manager.check_collection
+            add = manager.add_food
+            elapsed = 0.0
+            for probe in probes[:calls]:
+                start = time.perf_counter()
+                collected = check(probe)
+                elapsed += time.perf_counter() - start
+                # Put collected food back so the item count stays constant
+                for item in collected:
+                    add(item.rect.x, item.rect.y, item.food_type)
+            best = min(best, elapsed / calls)
+        results[f"check_collection_{size}"] = result(best * 1e6, "us/call", False)
+    return results
+
+
+def bench_ui(scale, repeats):
+    """Microseconds per HUD and menu draw, with warm and cold text caches."""
+    calls = 2000 * scale
+    screen = pygame.display.get_surface()
+    ui = UI()
+    results = {}
+
+    def hud_cached():
+        for _ in range(calls):
+            ui.draw_hud(screen, 150)
+
+    def hud_changing():
+        for food in range(calls):
+            ui.draw_hud(screen, food % 200)
+
+    def hud_uncached():
+        for food in range(calls):
+            ui.text_cache.clear()
+            ui.draw_hud(screen, food % 200)
+
+    def pause_menu():
+        for _ in range(calls):
+            ui.draw_pause_menu(screen)
+
+    def game_over():
+        for seconds in range(calls):
+            ui.draw_game_over_screen(screen, seconds % 600)
+
+    for label, func in (
+        ("ui_hud_cached", hud_cached),
+        ("ui_hud_changing", hud_changing),
+        ("ui_hud_uncached", hud_uncached),
+        ("ui_pause_menu", pause_menu),
+        ("ui_game_over", game_over),
+    ):
+        results[label] = result(best_of(repeats, func) / calls * 1e6, "us/call", False)
+    return results
+
+
+def bench_ecs(scale, repeats):
+    """Ticks and frames per second of the ECS systems with many beavers."""
+    ticks = 60 * scale
+    rng = random.Random(0)
+    screen = pygame.display.get_surface()
+    results = {}
+    for size in ECS_SIZES:
+        registry = ecs.Registry()
+        Dam(registry)
+        Lodge(170, 280, registry)
+        sprite = registry.sprite_code("beaver")
+        for _ in range(size):
+            x = rng.randrange(SCREEN_WIDTH - PLAYER_SIZE)
+            y = rng.randrange(20, SCREEN_HEIGHT - PLAYER_SIZE)
+            registry.create(
+                position={"x": x, "y": y, "prev_x": x, "prev_y": y},
+                body={"w": PLAYER_SIZE, "h": PLAYER_SIZE},
+                heading={"x": rng.uniform(-1, 1), "y": rng.uniform(-1, 1)},
+                velocity={},
+                speed={"land": PLAYER_SPEED_LAND, "water": PLAYER_SPEED},
+                zone={},
+                sprite={"index": sprite},
+            )
+        blockers = registry.rects(registry.query("blocker"))
+        lodges = registry.rects(registry.query("lodge"))
+
+        def update():
+            for _ in range(ticks):
+                moving = registry.query("velocity")
+                ecs.move(registry, moving, blockers)
+                ecs.update_zones(registry, moving, lodges)
+
+        def draw():
+            for _ in range(ticks):
+                ecs.draw_sprites(registry, screen, registry.query("sprite"), 0.5)
+
+        results[f"ecs_update_{size}"] = result(
+            ticks / best_of(repeats, update), "ticks/s", True
+        )
+        results[f"ecs_draw_{size}"] = result(
+            ticks / best_of(repeats, draw), "frames/s", True
+        )
+    return results
+
+
+def bench_startup(scale, repeats):
+    """Milliseconds of each cold-start phase, in a fresh interpreter per run."""
+    env = dict(os.environ, PYTHONPATH=str(project_root / "src"))
+    best = [float("inf")] * 3
+    for _ in range(repeats * scale):
+        output = subprocess.run(
+            [sys.executable, "-c", STARTUP_SCRIPT],
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        phases = json.loads(output.splitlines()[-1])
+        best = [min(old, new) for old, new in zip(best, phases)]
+    return {
+        f"startup_{label}": result(seconds * 1000, "ms", False)
+        for label, seconds in zip(("import", "init", "first_frame"), best)
+    }
+
+
+BENCHMARKS = {
+    "update": bench_update,
+    "draw": bench_draw,
+    "collection": bench_collection,
+    "ui": bench_ui,
+    "startup": bench_startup,
+    "ecs": bench_ecs,
+}
+
+
+def run_benchmarks(names, scale, repeats):
+    """Run the selected benchmark groups and return all results."""
+    pygame.init()
+    pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    results = {}
+    for name in names:
+        print(f"Running {name}...", file=sys.stderr)
+        results.update(BENCHMARKS[name](scale, repeats))
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "platform": platform.platform(),
+            "scale": scale,
+            "repeats": repeats,
+        },
+        "results": results,
+    }
+
+
+def compare(current, baseline, threshold):
+    """Print a comparison table and return the names of regressed results."""
+    regressions = []
+    print(f"{'benchmark':<28}{'baseline':>14}{'current':>14}{'change':>9}")
+    for name, entry in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None or not base["value"]:
+            print(f"{name:<28}{'-':>14}{entry['value']:>14.2f}{'new':>9}")
+            continue
+        change = entry["value"] / base["value"] - 1
+        # Positive means better, whichever direction the unit goes
+        gain = change if entry["higher_is_better"] else -change
+        flag = ""
+        if gain < -threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(
+            f"{name:<28}{base['value']:>14.2f}{entry['value']:>14.2f}"
+            f"{gain:>+9.1%}{flag}"
+        )
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--output", "-o", help="write results as JSON to this file (default: stdout)"
+    )
+    parser.add_argument("--compare", metavar="BASELINE", help="baseline JSON file")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="relative slowdown counted as a regression (default: 0.10)",
+    )
+    parser.add_argument(
+        "--only",
+        choices=sorted(BENCHMARKS),
+        action="append",
+        help="run only this benchmark group (may be repeated)",
+    )
+    parser.add_argument(
+        "--scale", type=int, default=1, help="multiply the work done per run"
+    )
+    parser.add_argument(
+        "--repeats", type=int, default=3, help="runs per benchmark; best is kept"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    current = run_benchmarks(args.only or list(BENCHMARKS), args.scale, args.repeats)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(current, f, indent=2)
+    elif not args.compare:
+        json.dump(current, sys.stdout, indent=2)
+        print()
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(current, baseline, args.threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s): {', '.join(regressions)}")
+            return 1
+        print("\n✅ No regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
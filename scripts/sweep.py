@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Monte Carlo balance sweep over the food settings.
+
+Plays simulated games at every combination of the given values, with a
+scripted beaver that walks to the nearest food, spread over all cores.
+Each parameter point's survival distribution is printed as soon as all of
+its games are over, and every game's result is written to a columnar .npz
+file for analysis. Parameters left out keep their value in the game
+settings, which --settings and NEWGAME_<SETTING> variables can override.
+
+Usage:
+    python scripts/sweep.py --initial-food 80,120,160 \\
+        --spawn-interval 8000-12000,10000-15000 --output sweep.npz
+
+Requires NumPy (pip install -e .[sim]).
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add src directory to path so we can import newgame
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from newgame.config.settings import Settings  # noqa: E402
+from newgame.core.sweep import (  # noqa: E402
+    PARAMETERS,
+    SWEEP_GAMES,
+    SWEEP_MAX_SECONDS,
+    SweepResults,
+    grid_points,
+    run_sweep,
+)
+
+
+def int_list(text):
+    """Parse "80,120,160" into a list of ints."""
+    return [int(value) for value in text.split(",")]
+
+
+def range_list(text):
+    """Parse "8000-12000,10000-15000" into a list of (low, high) tuples."""
+    ranges = []
+    for value in text.split(","):
+        low, high = value.split("-")
+        ranges.append((int(low), int(high)))
+    return ranges
+
+
+def format_value(value):
+    """Format a parameter value the way it is given on the command line."""
+    if isinstance(value, tuple):
+        return "-".join(map(str, value))
+    return str(value)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--initial-food", type=int_list, help="comma-separated INITIAL_FOOD values"
+    )
+    parser.add_argument(
+        "--decrease-interval",
+        type=int_list,
+        help="comma-separated FOOD_DECREASE_INTERVAL values in milliseconds",
+    )
+    parser.add_argument(
+        "--collection-amount",
+        type=int_list,
+        help="comma-separated FOOD_COLLECTION_AMOUNT values",
+    )
+    parser.add_argument(
+        "--spawn-interval",
+        type=range_list,
+        help="comma-separated FOOD_SPAWN_INTERVAL ranges, e.g. 10000-15000",
+    )
+    parser.add_argument(
+        "--games",
+        type=int,
+        default=SWEEP_GAMES,
+        help=f"games per parameter point (default: {SWEEP_GAMES})",
+    )
+    parser.add_argument(
+        "--max-seconds",
+        type=int,
+        default=SWEEP_MAX_SECONDS,
+        help=f"cut games off after this much game time (default: {SWEEP_MAX_SECONDS})",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="sweep seed (default: 0)")
+    parser.add_argument(
+        "--settings",
+        metavar="PATH",
+        help="TOML file overriding game settings; NEWGAME_<SETTING> "
+        "environment variables override both",
+    )
+    parser.add_argument(
+        "--workers", type=int, help="worker processes (default: all cores)"
+    )
+    parser.add_argument(
+        "--output", "-o", default="sweep.npz", help="results file (default: sweep.npz)"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    settings = Settings.load(args.settings)
+    grid = {
+        "initial_food": args.initial_food,
+        "food_decrease_interval": args.decrease_interval,
+        "food_collection_amount": args.collection_amount,
+        "food_spawn_interval": args.spawn_interval,
+    }
+    points = grid_points(
+        {name: values for name, values in grid.items() if values}, settings
+    )
+    results = SweepResults(points, args.games)
+    print(f"Sweeping {len(points)} point(s) x {args.games} games...", file=sys.stderr)
+
+    names = list(PARAMETERS)
+    print("  ".join(f"{name:>22}" for name in names), end="")
+    print(f"{'median':>9}{'p10':>8}{'p90':>8}{'alive':>8}")
+    start = time.perf_counter()
+    for point, *chunk in run_sweep(
+        points, args.games, args.seed, args.max_seconds, args.workers, settings=settings
+    ):
+        if not results.add(point, *chunk):
+            continue
+        stats = results.summary(point)
+        values = (format_value(points[point][name]) for name in names)
+        print("  ".join(f"{value:>22}" for value in values), end="")
+        print(
+            f"{stats['median']:>9.0f}{stats['p10']:>8.0f}{stats['p90']:>8.0f}"
+            f"{stats['censored']:>8.0%}",
+            flush=True,
+        )
+
+    results.save(args.output)
+    print(f"Wrote {args.output} in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
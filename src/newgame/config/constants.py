@@ -22,11 +22,16 @@ COLORS = {
 ZONE_LODGE = "lodge"
 ZONE_WATER = "water"
 ZONE_LAND = "land"
+ZONE_TYPES = (ZONE_LAND, ZONE_WATER, ZONE_LODGE)
+
+# Food item types
+FOOD_TYPES = ("berry", "leaf")
 
 # Game states
 STATE_PLAYING = "playing"
 STATE_PAUSED = "paused"
 STATE_GAME_OVER = "game_over"
+GAME_STATES = (STATE_PLAYING, STATE_PAUSED, STATE_GAME_OVER)
 
 # Input keys
 MOVEMENT_KEYS = {
@@ -1,16 +1,37 @@
 """
 Game settings and configuration constants.
+
+The module-level constants are the defaults. Code that should run with
+different values in the same process takes a Settings object instead.
 """
 
-import pygame
+import math
+import os
+from dataclasses import dataclass, field, fields, replace
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
 
 # Screen constants
 SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
-FPS = 60
+FPS = 60  # Fixed simulation rate: game logic always runs at FPS steps per second
+MAX_RENDER_FPS = 144  # Cap on rendered frames per second; 0 for no cap
+MAX_FRAME_SKIP = 5  # Renders dropped per frame to catch up before the game slows
+AUDIO_ENABLED = False  # Initialize the mixer at startup; the game has no sound yet
 
 # Game world constants
 HOME_SCREEN_COORD = [4, 4]  # Starting position in 9x9 world grid
+WORLD_SIZE = 9  # The world is a WORLD_SIZE x WORLD_SIZE grid of screens
+MAX_RESIDENT_SCREENS = 6  # Fully loaded screens; the rest are kept serialized
+SCREEN_PRELOAD_MARGIN = 100  # Load a neighbour once the player is this close
+PREFETCH_LOOKAHEAD = 30  # Ticks of player movement to extrapolate for prefetch
+PREFETCH_WORKERS = 1  # Threads building screens in the background
 
 # Player constants
 PLAYER_SIZE = 20
@@ -23,6 +44,14 @@ LODGE_HEIGHT = 40
 DAM_HEIGHT = 10
 FOOD_SIZE = 8
 
+# HOME_SCREEN layout (top-left corners)
+LODGE_POSITION = (
+    SCREEN_WIDTH // 4 - LODGE_WIDTH // 2,
+    SCREEN_HEIGHT // 2 - LODGE_HEIGHT // 2,
+)
+PLAYER_START_POSITION = (SCREEN_WIDTH // 2 - PLAYER_SIZE // 2, SCREEN_HEIGHT // 2)
+WATER_DEPTH = 100  # Player is in water while its center is above this line
+
 # Food system constants
 INITIAL_FOOD = 120
 MAX_FOOD = 200
@@ -30,3 +59,197 @@ FOOD_DECREASE_INTERVAL = 4000  # 4 seconds in milliseconds
 FOOD_DECREASE_AMOUNT = 1
 FOOD_COLLECTION_AMOUNT = 5
 FOOD_SPAWN_INTERVAL = (10000, 15000)  # 10-15 seconds in milliseconds
+FOOD_GRID_CELL_SIZE = 32  # Spatial index cell size for food lookups
+
+# Navigation constants
+NAV_CELL_SIZE = 20  # Flow field cell size in pixels
+
+# Save game constants
+AUTOSAVE_INTERVAL = 30000  # 30 seconds in milliseconds
+MAX_DELTA_SAVES = 32  # Delta saves appended before writing a new snapshot
+
+# Profiler constants
+PROFILER_HISTORY = 120  # Frames kept in the rolling timing windows
+PROFILER_TRACE_LIMIT = 200000  # Spans kept for trace export
+PROFILER_OVERLAY_REFRESH = 15  # Frames between overlay redraws
+
+# Observation constants
+OBSERVATION_DOWNSAMPLE = 4  # Screen pixels per grayscale pixel along each axis
+OBSERVATION_STACK = 4  # Grayscale frames kept in a frame stack
+
+# Prefix of environment variables overriding Settings fields, and the
+# variable naming a TOML settings file
+ENV_PREFIX = "NEWGAME_"
+SETTINGS_FILE_ENV = "NEWGAME_SETTINGS"
+
+
+@dataclass(frozen=True)
+class Settings:
+    """Immutable game configuration, passed to the game and its objects.
+
+    Fields default to the constants above, so module-level values remain
+    the defaults while every game in a process can run with its own
+    Settings. Derived values (screen rects, spawn bounds, step length,
+    diagonal factor) are computed once when the object is created, as are
+    the lodge and player start positions unless they are given. Use ``replace()`` to derive a
+    variant and ``load()`` to read overrides from TOML and the environment.
+    """
+
+    screen_width: int = SCREEN_WIDTH
+    screen_height: int = SCREEN_HEIGHT
+    fps: int = FPS
+    max_render_fps: int = MAX_RENDER_FPS
+    max_frame_skip: int = MAX_FRAME_SKIP
+    audio_enabled: bool = AUDIO_ENABLED
+    home_screen_coord: tuple = tuple(HOME_SCREEN_COORD)
+    world_size: int = WORLD_SIZE
+    max_resident_screens: int = MAX_RESIDENT_SCREENS
+    screen_preload_margin: int = SCREEN_PRELOAD_MARGIN
+    prefetch_lookahead: int = PREFETCH_LOOKAHEAD
+    prefetch_workers: int = PREFETCH_WORKERS
+    player_size: int = PLAYER_SIZE
+    player_speed: float = PLAYER_SPEED
+    player_speed_land: float = PLAYER_SPEED_LAND
+    lodge_width: int = LODGE_WIDTH
+    lodge_height: int = LODGE_HEIGHT
+    dam_height: int = DAM_HEIGHT
+    food_size: int = FOOD_SIZE
+    lodge_position: tuple = None  # Derived from the screen size unless given
+    player_start_position: tuple = None  # Likewise, centred on the screen
+    water_depth: int = WATER_DEPTH
+    initial_food: int = INITIAL_FOOD
+    max_food: int = MAX_FOOD
+    food_decrease_interval: int = FOOD_DECREASE_INTERVAL
+    food_decrease_amount: int = FOOD_DECREASE_AMOUNT
+    food_collection_amount: int = FOOD_COLLECTION_AMOUNT
+    food_spawn_interval: tuple = FOOD_SPAWN_INTERVAL
+    food_grid_cell_size: int = FOOD_GRID_CELL_SIZE
+    autosave_interval: int = AUTOSAVE_INTERVAL
+    max_delta_saves: int = MAX_DELTA_SAVES
+    observation_downsample: int = OBSERVATION_DOWNSAMPLE
+    observation_stack: int = OBSERVATION_STACK
+
+    # Derived in __post_init__
+    screen_size: tuple = field(init=False, repr=False, compare=False)
+    step_seconds: float = field(init=False, repr=False, compare=False)
+    dam_rect: tuple = field(init=False, repr=False, compare=False)
+    lodge_rect: tuple = field(init=False, repr=False, compare=False)
+    water_rect: tuple = field(init=False, repr=False, compare=False)
+    spawn_bounds: tuple = field(init=False, repr=False, compare=False)
+    low_food: float = field(init=False, repr=False, compare=False)
+    diagonal_factor: float = field(init=False, repr=False, compare=False)
+    # Init fields that were left to __post_init__, and stay derived in copies
+    derived_fields: frozenset = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        width, height = self.screen_width, self.screen_height
+        positions = {
+            "lodge_position": (
+                width // 4 - self.lodge_width // 2,
+                height // 2 - self.lodge_height // 2,
+            ),
+            "player_start_position": (width // 2 - self.player_size // 2, height // 2),
+        }
+        derived = {
+            name: value
+            for name, value in positions.items()
+            if getattr(self, name) is None
+        }
+        derived["derived_fields"] = frozenset(derived)
+        for name, value in derived.items():
+            object.__setattr__(self, name, value)
+
+        derived = {
+            "screen_size": (width, height),
+            "step_seconds": 1.0 / self.fps,
+            "dam_rect": (0, 0, width, self.dam_height),
+            # The water band starts below the dam and reaches the zone line
+            "water_rect": (0, self.dam_height, width, self.water_depth),
+            # Allowed top-left corners for spawned food, as a half-open rect
+            "spawn_bounds": (
+                self.food_size,
+                self.dam_height + self.food_size,
+                width - 2 * self.food_size + 1,
+                height - self.dam_height - 2 * self.food_size + 1,
+            ),
+            # The HUD turns red at or below this amount
+            "low_food": self.max_food * 0.2,
+            # Scales diagonal steps to the speed of straight ones. Rounded
+            # to 0.707: replays depend on this exact value.
+            "diagonal_factor": round(math.sqrt(0.5), 3),
+            "lodge_rect": (*self.lodge_position, self.lodge_width, self.lodge_height),
+        }
+        for name, value in derived.items():
+            object.__setattr__(self, name, value)
+
+    def replace(self, **overrides):
+        """Return a copy with some fields changed and derived values redone."""
+        for name in self.derived_fields:
+            overrides.setdefault(name, None)
+        return replace(self, **overrides)
+
+    @classmethod
+    def from_mapping(cls, values, base=None):
+        """Return base (default: the defaults) with fields from a dict.
+
+        Values are converted to the field's type; strings such as
+        environment variables are parsed, e.g. "10000,15000" for a tuple.
+        """
+        base = base if base is not None else cls()
+        kinds = {item.name: item.type for item in fields(cls) if item.init}
+        overrides = {}
+        for name, value in values.items():
+            if name not in kinds:
+                raise ValueError(f"Unknown setting: {name}")
+            overrides[name] = _convert(kinds[name], value)
+        return base.replace(**overrides) if overrides else base
+
+    @classmethod
+    def from_toml(cls, path, base=None):
+        """Return settings overridden by the top-level keys of a TOML file."""
+        if tomllib is None:
+            raise ImportError("Reading TOML settings needs Python 3.11+ or tomli")
+        with open(path, "rb") as f:
+            return cls.from_mapping(tomllib.load(f), base)
+
+    @classmethod
+    def from_env(cls, environ=None, base=None):
+        """Return settings overridden by NEWGAME_<FIELD> environment variables."""
+        environ = os.environ if environ is None else environ
+        names = [item.name for item in fields(cls) if item.init]
+        values = {
+            name: environ[ENV_PREFIX + name.upper()]
+            for name in names
+            if ENV_PREFIX + name.upper() in environ
+        }
+        return cls.from_mapping(values, base)
+
+    @classmethod
+    def load(cls, path=None, environ=None):
+        """Return the defaults overridden by a TOML file, then the environment.
+
+        path defaults to the file named by NEWGAME_SETTINGS, if set.
+        """
+        environ = os.environ if environ is None else environ
+        path = path or environ.get(SETTINGS_FILE_ENV)
+        settings = cls.from_toml(path) if path else cls()
+        return cls.from_env(environ, settings)
+
+
+def _convert(kind, value):
+    """Convert a TOML or environment value to a Settings field type."""
+    if kind is bool and isinstance(value, str):
+        return value.strip().lower() in ("1", "true", "yes", "on")
+    if kind is tuple:
+        if isinstance(value, str):
+            value = value.split(",")
+        return tuple(int(item) for item in value)
+    if isinstance(value, str):
+        return kind(value)
+    if kind is int and value != int(value):
+        raise ValueError(f"Expected an integer, got {value!r}")
+    return kind(value)
+
+
+# Settings of games that are not given any
+DEFAULT_SETTINGS = Settings()
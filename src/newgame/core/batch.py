@@ -0,0 +1,310 @@
+"""
+Vectorized batch simulator for many independent Beaver Survival games.
+
+Every game's state lives in struct-of-arrays NumPy buffers, and one call to
+``BatchSimulator.step`` advances all games by a fixed timestep. Movement,
+dam/border collision, zones, food pickup and starvation follow exactly the
+same rules as ``Player.update`` and ``BeaverSurvivalGame.update``. Food
+spawning differs: it draws from another random stream, and rejects
+positions overlapping food where the scalar game skips whole grid cells.
+
+Requires NumPy (``pip install newgame[sim]``).
+"""
+
+import numpy as np
+from ..config.settings import DEFAULT_SETTINGS
+from ..config.constants import (
+    MOVEMENT_KEYS,
+    ZONE_LAND,
+    ZONE_WATER,
+    ZONE_LODGE,
+    FOOD_TYPES,
+)
+from ..utils.input import MOVEMENT_KEY_ORDER
+
+# Integer codes used in the zone and food type arrays
+ZONE_CODES = (ZONE_LAND, ZONE_WATER, ZONE_LODGE)
+LAND, WATER, LODGE = range(len(ZONE_CODES))
+
+# Positions drawn per spawn before giving up because food covers them
+SPAWN_ATTEMPTS = 50
+
+# Per-bit movement directions, in key mask order
+_KEY_BITS = np.arange(len(MOVEMENT_KEY_ORDER), dtype=np.uint8)
+_KEY_DX = np.array([MOVEMENT_KEYS[key][0] for key in MOVEMENT_KEY_ORDER])
+_KEY_DY = np.array([MOVEMENT_KEYS[key][1] for key in MOVEMENT_KEY_ORDER])
+
+
+def _round_coordinate(values):
+    """Round float coordinates the way pygame.Rect does (half away from zero)."""
+    return np.where(values >= 0, np.floor(values + 0.5), np.ceil(values - 0.5))
+
+
+def _default(value, default):
+    """Return value, or default if value is None."""
+    return default if value is None else value
+
+
+def _overlaps(x, y, w, h, rect):
+    """Vectorized pygame.Rect.colliderect against a single (x, y, w, h) rect."""
+    rx, ry, rw, rh = rect
+    return (x < rx + rw) & (rx < x + w) & (y < ry + rh) & (ry < y + h)
+
+
+class BatchSimulator:
+    """Steps N independent games at once using NumPy arrays.
+
+    Food items are stored in fixed-capacity (N, max_food_items) arrays with an
+    ``food_active`` mask; spawns that find no free slot are dropped. Games
+    follow the given Settings (default: DEFAULT_SETTINGS), and the balance
+    parameters can also be overridden one by one for tuning sweeps.
+    """
+
+    def __init__(
+        self,
+        num_games,
+        max_food_items=64,
+        seed=None,
+        fps=None,
+        initial_food=None,
+        food_decrease_interval=None,
+        food_decrease_amount=None,
+        food_collection_amount=None,
+        food_spawn_interval=None,
+        settings=None,
+    ):
+        self.settings = settings = settings or DEFAULT_SETTINGS
+        self.num_games = num_games
+        self.max_food_items = max_food_items
+        self.fps = _default(fps, settings.fps)
+        self.initial_food = _default(initial_food, settings.initial_food)
+        self.food_decrease_interval = _default(
+            food_decrease_interval, settings.food_decrease_interval
+        )
+        self.food_decrease_amount = _default(
+            food_decrease_amount, settings.food_decrease_amount
+        )
+        self.food_collection_amount = _default(
+            food_collection_amount, settings.food_collection_amount
+        )
+        self.food_spawn_interval = _default(
+            food_spawn_interval, settings.food_spawn_interval
+        )
+        self.rng = np.random.default_rng(seed)
+
+        self.width, self.height = settings.screen_size
+        self.player_size = settings.player_size
+        self.food_size = settings.food_size
+        self.lodge_rect = settings.lodge_rect
+        self.dam_rect = settings.dam_rect
+
+        # Per-game state
+        self.ticks = np.zeros(num_games, dtype=np.int64)
+        self.player_x = np.zeros(num_games, dtype=np.int32)
+        self.player_y = np.zeros(num_games, dtype=np.int32)
+        self.zone = np.zeros(num_games, dtype=np.int8)
+        self.food_amount = np.zeros(num_games, dtype=np.int32)
+        self.alive = np.zeros(num_games, dtype=bool)
+        self.last_food_decrease = np.zeros(num_games, dtype=np.int64)
+        self.last_spawn_time = np.zeros(num_games, dtype=np.int64)
+        self.spawn_interval = np.zeros(num_games, dtype=np.int64)
+
+        # Per-game food items
+        shape = (num_games, max_food_items)
+        self.food_x = np.zeros(shape, dtype=np.int32)
+        self.food_y = np.zeros(shape, dtype=np.int32)
+        self.food_type = np.zeros(shape, dtype=np.int8)
+        self.food_active = np.zeros(shape, dtype=bool)
+
+        self.reset()
+
+    def reset(self, games=None):
+        """Reset the selected games (all by default) to their initial state."""
+        if games is None:
+            games = slice(None)
+        count = len(self.ticks[games])
+
+        self.ticks[games] = 0
+        self.player_x[games], self.player_y[games] = self.settings.player_start_position
+        self.zone[games] = LAND
+        self.food_amount[games] = self.initial_food
+        self.alive[games] = True
+        self.last_food_decrease[games] = 0
+        self.last_spawn_time[games] = 0
+        self.spawn_interval[games] = self._random_spawn_intervals(count)
+        self.food_active[games] = False
+
+    def current_time(self):
+        """Return each game's simulated time in milliseconds."""
+        return self.ticks * 1000 // self.fps
+
+    def place_food(self, game, x, y, food_type="berry"):
+        """Place a food item in a game's first free slot.
+
+        Returns the slot index, or None if the game has no free slot.
+        """
+        free = np.flatnonzero(~self.food_active[game])
+        if len(free) == 0:
+            return None
+        slot = free[0]
+        self.food_x[game, slot] = x
+        self.food_y[game, slot] = y
+        self.food_type[game, slot] = FOOD_TYPES.index(food_type)
+        self.food_active[game, slot] = True
+        return slot
+
+    def step(self, key_masks=0):
+        """Advance every game by one fixed timestep.
+
+        key_masks is a scalar or an (N,) array of movement key masks as built
+        by utils.input.keys_to_mask. Games that are over do not change.
+        Returns an (N,) array with the number of food items each game
+        collected this tick. Finished games keep their final tick count, so
+        survival_time() reports when they ended.
+        """
+        key_masks = np.broadcast_to(
+            np.asarray(key_masks, dtype=np.uint8), (self.num_games,)
+        )
+        self.ticks += self.alive
+        now = self.current_time()
+
+        self._move_players(key_masks)
+        self._spawn_food(now)
+        collected = self._collect_food()
+        self._consume_food(now)
+        return collected
+
+    def _move_players(self, key_masks):
+        """Apply Player.update to every live game with a movement key held."""
+        moving = self.alive & (key_masks != 0)
+        if not moving.any():
+            return
+
+        bits = (key_masks[:, None] >> _KEY_BITS) & 1
+        dx = (bits @ _KEY_DX).astype(np.float64)
+        dy = (bits @ _KEY_DY).astype(np.float64)
+
+        # Normalize diagonal movement, then apply the zone speed
+        diagonal = (dx != 0) & (dy != 0)
+        settings = self.settings
+        dx[diagonal] *= settings.diagonal_factor
+        dy[diagonal] *= settings.diagonal_factor
+        speed = np.where(
+            self.zone == LAND, settings.player_speed_land, settings.player_speed
+        )
+        dx *= speed
+        dy *= speed
+
+        # Move horizontally, reverting games that hit a border or the dam
+        size = self.player_size
+        old_x = self.player_x
+        new_x = _round_coordinate(old_x + dx).astype(np.int32)
+        blocked = (
+            (new_x < 0)
+            | (new_x + size > self.width)
+            | _overlaps(new_x, self.player_y, size, size, self.dam_rect)
+        )
+        x = np.where(moving & ~blocked, new_x, old_x)
+
+        # Move vertically from the updated horizontal position
+        old_y = self.player_y
+        new_y = _round_coordinate(old_y + dy).astype(np.int32)
+        blocked = (
+            (new_y < 0)
+            | (new_y + size > self.height)
+            | _overlaps(x, new_y, size, size, self.dam_rect)
+        )
+        y = np.where(moving & ~blocked, new_y, old_y)
+
+        self.player_x[:] = x
+        self.player_y[:] = y
+
+        # Update zones of the games that moved
+        in_lodge = _overlaps(x, y, size, size, self.lodge_rect)
+        in_water = y + size // 2 < settings.water_depth
+        zone = np.where(in_lodge, LODGE, np.where(in_water, WATER, LAND))
+        self.zone[moving] = zone[moving]
+
+    def _spawn_food(self, now):
+        """Apply FoodManager.update/_spawn_food to every game that is due."""
+        due = np.flatnonzero(
+            self.alive & (now - self.last_spawn_time >= self.spawn_interval)
+        )
+        if len(due) == 0:
+            return
+
+        # Rejection sampling within the scalar game's bounds, evaluated for
+        # all attempts of all games at once
+        shape = (len(due), SPAWN_ATTEMPTS)
+        size = self.food_size
+        left, top, width, height = self.settings.spawn_bounds
+        xs = self.rng.integers(left, left + width - 1, shape, endpoint=True)
+        ys = self.rng.integers(top, top + height - 1, shape, endpoint=True)
+        valid = ~_overlaps(xs, ys, size, size, self.lodge_rect) & ~_overlaps(
+            xs, ys, size, size, self.dam_rect
+        )
+        existing = (self.food_x[due, None], self.food_y[due, None], size, size)
+        on_food = self.food_active[due, None] & _overlaps(
+            xs[..., None], ys[..., None], size, size, existing
+        )
+        valid &= ~on_food.any(axis=2)
+        attempt = valid.argmax(axis=1)
+        rows = np.arange(len(due))
+
+        # Drop spawns with no valid attempt or no free food slot
+        free = ~self.food_active[due]
+        slot = free.argmax(axis=1)
+        spawned = valid[rows, attempt] & free[rows, slot]
+
+        games, slot, attempt = due[spawned], slot[spawned], attempt[spawned]
+        self.food_x[games, slot] = xs[rows[spawned], attempt]
+        self.food_y[games, slot] = ys[rows[spawned], attempt]
+        self.food_type[games, slot] = self.rng.integers(
+            len(FOOD_TYPES), size=len(games)
+        )
+        self.food_active[games, slot] = True
+
+        self.last_spawn_time[due] = now[due]
+        self.spawn_interval[due] = self._random_spawn_intervals(len(due))
+
+    def _collect_food(self):
+        """Apply FoodManager.check_collection and the food storage increase."""
+        touching = self.food_active & _overlaps(
+            self.player_x[:, None],
+            self.player_y[:, None],
+            self.player_size,
+            self.player_size,
+            (self.food_x, self.food_y, self.food_size, self.food_size),
+        )
+        touching &= self.alive[:, None]
+        self.food_active &= ~touching
+
+        collected = touching.sum(axis=1)
+        self.food_amount[:] = np.minimum(
+            self.settings.max_food,
+            self.food_amount + collected * self.food_collection_amount,
+        )
+        return collected
+
+    def _consume_food(self, now):
+        """Apply the periodic food decrease and the starvation check."""
+        due = self.alive & (
+            now - self.last_food_decrease >= self.food_decrease_interval
+        )
+        self.food_amount[due] = np.maximum(
+            0, self.food_amount[due] - self.food_decrease_amount
+        )
+        self.last_food_decrease[due] = now[due]
+        self.alive &= ~(due & (self.food_amount <= 0))
+
+    def _random_spawn_intervals(self, count):
+        """Draw spawn intervals from the configured range (inclusive)."""
+        low, high = self.food_spawn_interval
+        return self.rng.integers(low, high, count, endpoint=True)
+
+    def survival_time(self):
+        """Return each game's survival time in whole seconds.
+
+        For games still running this is the time simulated so far.
+        """
+        return self.current_time() // 1000
@@ -0,0 +1,46 @@
+"""
+Time sources for the Beaver Survival Game.
+
+Game systems read the current time from a clock object instead of calling
+``pygame.time.get_ticks()`` directly, so the simulation can run either in
+real time or in deterministic fixed timesteps.
+"""
+
+import pygame
+from ..config.settings import DEFAULT_SETTINGS
+
+
+class WallClock:
+    """Clock backed by pygame's real-time millisecond counter."""
+
+    def get_ticks(self):
+        """Return milliseconds since pygame was initialized."""
+        return pygame.time.get_ticks()
+
+    def advance(self, ticks=1):
+        """Do nothing; wall-clock time moves on by itself."""
+
+
+class SimulationClock:
+    """Deterministic clock that only moves when explicitly advanced.
+
+    Each tick is one fixed timestep of ``1000 / fps`` milliseconds. Times are
+    derived from the tick count so they never accumulate rounding drift.
+    fps defaults to the default settings' rate; games pass their own.
+    """
+
+    def __init__(self, fps=None):
+        self.fps = fps or DEFAULT_SETTINGS.fps
+        self.ticks = 0
+
+    def advance(self, ticks=1):
+        """Advance the clock by a number of fixed timesteps."""
+        self.ticks += ticks
+
+    def get_ticks(self):
+        """Return the simulated time in milliseconds."""
+        return self.ticks * 1000 // self.fps
+
+    def reset(self):
+        """Rewind the clock to time zero."""
+        self.ticks = 0
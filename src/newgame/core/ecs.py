@@ -0,0 +1,468 @@
+"""
+Array-backed entity-component storage and bulk systems.
+
+Entities are integer ids. Every component type stores each of its fields in
+a typed ``array`` indexed by entity id, so all columns have one entry per
+entity slot and a system walks plain contiguous arrays instead of objects.
+Each entity also has a bitmask of the components it holds; ``query()``
+returns the ids matching a set of components and caches the result until
+an entity gains or loses a component.
+
+The systems below (``move``, ``update_zones``, ``find_contacts`` and
+``draw_sprites``) run over a whole query at once. The entity classes in
+``entities/`` are thin facades over one entity each, and run the same
+systems for it, so a shared Registry can update thousands of beavers with
+exactly the rules of ``Player.update``.
+"""
+
+from array import array
+import pygame
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional (pip install newgame[sim])
+    np = None
+from ..config.settings import DEFAULT_SETTINGS
+from ..config.constants import ZONE_TYPES, ZONE_LAND, ZONE_WATER, ZONE_LODGE
+from ..systems.sprites import atlas
+from ..utils.spatial import SpatialHashGrid
+
+# Zone codes stored in the zone component, indexes into ZONE_TYPES
+LAND = ZONE_TYPES.index(ZONE_LAND)
+WATER = ZONE_TYPES.index(ZONE_WATER)
+LODGE = ZONE_TYPES.index(ZONE_LODGE)
+
+# Entity count from which move() and update_zones() switch to NumPy, when
+# it is installed, working on zero-copy views of the component arrays
+VECTORIZE_THRESHOLD = 64
+
+# Component types and their fields' array typecodes. Components without
+# fields are tags that only take part in queries.
+COMPONENTS = {
+    # Top-left corner now and before the last move, for interpolation
+    "position": {"x": "i", "y": "i", "prev_x": "i", "prev_y": "i"},
+    "body": {"w": "h", "h": "h"},
+    # Requested heading in [-1, 1] per axis, set from input or AI
+    "heading": {"x": "d", "y": "d"},
+    # Movement requested by the last move(), before collisions
+    "velocity": {"dx": "d", "dy": "d"},
+    # Pixels per tick on land and in water or the lodge
+    "speed": {"land": "d", "water": "d"},
+    "zone": {"code": "b"},
+    # Index into Registry.sprite_names
+    "sprite": {"index": "h"},
+    # Kind of pickup, e.g. an index into FOOD_TYPES
+    "pickup": {"kind": "b"},
+    "collector": {},
+    "blocker": {},
+    "lodge": {},
+}
+
+
+class Component:
+    """Storage for one component type: one typed array per field."""
+
+    def __init__(self, name, bit, fields, capacity):
+        self.name = name
+        self.bit = bit
+        self.columns = {
+            field: array(typecode, [0]) * capacity for field, typecode in fields.items()
+        }
+
+    def __getitem__(self, field):
+        return self.columns[field]
+
+    def _grow(self):
+        for column in self.columns.values():
+            column.append(0)
+
+
+class Registry:
+    """Entities and their components, stored as parallel typed arrays.
+
+    Destroyed entity ids are recycled through ``free_ids``, like the slots
+    of FoodManager. ``masks`` holds each entity's component bits, with bit 0
+    marking a live entity.
+    """
+
+    ALIVE = 1
+
+    def __init__(self, components=COMPONENTS):
+        self.masks = array("Q")
+        self.free_ids = []
+        self.count = 0
+        self.components = {}
+        self.sprite_names = []
+        self._sprite_codes = {}
+        self._queries = {}
+        for name, fields in components.items():
+            self.register(name, fields)
+
+    def register(self, name, fields):
+        """Add a component type with a dict of field -> array typecode."""
+        if name in self.components:
+            raise ValueError(f"component {name!r} is already registered")
+        bit = 1 << (len(self.components) + 1)
+        self.components[name] = Component(name, bit, fields, len(self.masks))
+
+    def __getitem__(self, name):
+        return self.components[name]
+
+    def __len__(self):
+        return self.count
+
+    def create(self, **components):
+        """Create an entity with components given as dicts of field values.
+
+        Fields that are not given start at zero. Returns the entity id.
+        """
+        if self.free_ids:
+            entity = self.free_ids.pop()
+        else:
+            entity = len(self.masks)
+            self.masks.append(0)
+            for component in self.components.values():
+                component._grow()
+        self.masks[entity] = self.ALIVE
+        self.count += 1
+        for name, values in components.items():
+            self.add(entity, name, **values)
+        self._queries.clear()
+        return entity
+
+    def destroy(self, entity):
+        """Remove an entity and all its components, freeing its id."""
+        if not self.alive(entity):
+            raise ValueError(f"entity {entity} does not exist")
+        for component in self.components.values():
+            for column in component.columns.values():
+                column[entity] = 0
+        self.masks[entity] = 0
+        self.free_ids.append(entity)
+        self.count -= 1
+        self._queries.clear()
+
+    def alive(self, entity):
+        """Return whether an entity id refers to a live entity."""
+        return 0 <= entity < len(self.masks) and bool(self.masks[entity])
+
+    def add(self, entity, name, **values):
+        """Give an entity a component, setting the given field values."""
+        component = self.components[name]
+        columns = component.columns
+        for field, value in values.items():
+            columns[field][entity] = value
+        if not self.masks[entity] & component.bit:
+            self.masks[entity] |= component.bit
+            self._queries.clear()
+
+    def remove(self, entity, name):
+        """Take a component away from an entity."""
+        component = self.components[name]
+        if self.masks[entity] & component.bit:
+            self.masks[entity] &= ~component.bit
+            self._queries.clear()
+
+    def has(self, entity, name):
+        """Return whether an entity holds a component."""
+        return bool(self.masks[entity] & self.components[name].bit)
+
+    def query(self, *names):
+        """Return the ids of all entities holding every named component.
+
+        The result is an ascending array of ids, cached until the next
+        structural change; callers must not modify it.
+        """
+        mask = self.ALIVE
+        for name in names:
+            mask |= self.components[name].bit
+        result = self._queries.get(mask)
+        if result is None:
+            masks = self.masks
+            result = array(
+                "l",
+                [
+                    entity
+                    for entity in range(len(masks))
+                    if masks[entity] & mask == mask
+                ],
+            )
+            self._queries[mask] = result
+        return result
+
+    def rect(self, entity):
+        """Return an entity's position and body as a pygame.Rect."""
+        position = self.components["position"]
+        body = self.components["body"]
+        return pygame.Rect(
+            position["x"][entity],
+            position["y"][entity],
+            body["w"][entity],
+            body["h"][entity],
+        )
+
+    def rects(self, entities):
+        """Return the rects of several entities, e.g. a blocker query."""
+        return [self.rect(entity) for entity in entities]
+
+    def sprite_code(self, name):
+        """Return the sprite component index for an atlas sprite name."""
+        code = self._sprite_codes.get(name)
+        if code is None:
+            code = self._sprite_codes[name] = len(self.sprite_names)
+            self.sprite_names.append(name)
+        return code
+
+
+def _edges(rects):
+    """Return (left, top, right, bottom) of rects that can collide at all.
+
+    pygame never reports a collision with an empty rect, so those are
+    dropped, e.g. the NO_RECT stand-in of screens without a dam.
+    """
+    return [
+        (rect[0], rect[1], rect[0] + rect[2], rect[1] + rect[3])
+        for rect in rects
+        if rect[2] > 0 and rect[3] > 0
+    ]
+
+
+def _blocked(x, y, w, h, edges):
+    """Return whether the rect (x, y, w, h) overlaps any of the edges."""
+    right = x + w
+    bottom = y + h
+    for left, top, edge_right, edge_bottom in edges:
+        if x < edge_right and left < right and y < edge_bottom and top < bottom:
+            return True
+    return False
+
+
+def move(registry, entities, blockers=(), bounds=None):
+    """Move entities along their heading at their zone's speed.
+
+    Each axis is moved separately and undone if the body would leave the
+    (width, height) bounds (default: the default settings' screen size) or
+    overlap one of the blocker rects, exactly as Player.update does; new
+    coordinates are rounded like pygame.Rect rounds them. Sets velocity and
+    the previous position.
+    """
+    if bounds is None:
+        bounds = DEFAULT_SETTINGS.screen_size
+    if np is not None and len(entities) >= VECTORIZE_THRESHOLD:
+        _move_vectorized(registry, entities, _edges(blockers), bounds)
+        return
+
+    position = registry["position"]
+    xs, ys = position["x"], position["y"]
+    prev_xs, prev_ys = position["prev_x"], position["prev_y"]
+    body = registry["body"]
+    ws, hs = body["w"], body["h"]
+    heading = registry["heading"]
+    heading_xs, heading_ys = heading["x"], heading["y"]
+    velocity = registry["velocity"]
+    dxs, dys = velocity["dx"], velocity["dy"]
+    speed = registry["speed"]
+    land_speeds, water_speeds = speed["land"], speed["water"]
+    zones = registry["zone"]["code"]
+    width, height = bounds
+    edges = _edges(blockers)
+
+    for entity in entities:
+        x = prev_xs[entity] = xs[entity]
+        y = prev_ys[entity] = ys[entity]
+        speed = land_speeds[entity] if zones[entity] == LAND else water_speeds[entity]
+        dx = dxs[entity] = heading_xs[entity] * speed
+        dy = dys[entity] = heading_ys[entity] * speed
+        w = ws[entity]
+        h = hs[entity]
+
+        if dx:
+            new = x + dx
+            # Round half away from zero, as pygame.Rect does
+            new = int(new + 0.5) if new >= 0 else -int(0.5 - new)
+            if 0 <= new and new + w <= width:
+                if not edges or not _blocked(new, y, w, h, edges):
+                    x = xs[entity] = new
+
+        if dy:
+            new = y + dy
+            new = int(new + 0.5) if new >= 0 else -int(0.5 - new)
+            if 0 <= new and new + h <= height:
+                if not edges or not _blocked(x, new, w, h, edges):
+                    ys[entity] = new
+
+
+def update_zones(registry, entities, lodges=(), water_depth=None):
+    """Set the zone of entities: lodge, water above water_depth, or land.
+
+    water_depth defaults to that of the default settings.
+    """
+    if water_depth is None:
+        water_depth = DEFAULT_SETTINGS.water_depth
+    if np is not None and len(entities) >= VECTORIZE_THRESHOLD:
+        _update_zones_vectorized(registry, entities, _edges(lodges), water_depth)
+        return
+
+    position = registry["position"]
+    xs, ys = position["x"], position["y"]
+    body = registry["body"]
+    ws, hs = body["w"], body["h"]
+    zones = registry["zone"]["code"]
+    edges = _edges(lodges)
+
+    for entity in entities:
+        x = xs[entity]
+        y = ys[entity]
+        h = hs[entity]
+        if edges and _blocked(x, y, ws[entity], h, edges):
+            zones[entity] = LODGE
+        elif y + h // 2 < water_depth:
+            zones[entity] = WATER
+        else:
+            zones[entity] = LAND
+
+
+def _views(component, *fields):
+    """Return NumPy views sharing memory with a component's columns."""
+    return [np.asarray(component[field]) for field in fields]
+
+
+def _round_coordinate(values):
+    """Round float coordinates the way pygame.Rect does (half away from zero)."""
+    return np.where(values >= 0, np.floor(values + 0.5), np.ceil(values - 0.5))
+
+
+def _blocked_vectorized(x, y, w, h, edges):
+    """Vectorized _blocked() over arrays of rects."""
+    blocked = np.zeros(len(x), dtype=bool)
+    right = x + w
+    bottom = y + h
+    for left, top, edge_right, edge_bottom in edges:
+        blocked |= (
+            (x < edge_right) & (left < right) & (y < edge_bottom) & (top < bottom)
+        )
+    return blocked
+
+
+def _move_vectorized(registry, entities, edges, bounds):
+    """move() for many entities at once, with the same results."""
+    ids = np.asarray(entities)
+    xs, ys, prev_xs, prev_ys = _views(
+        registry["position"], "x", "y", "prev_x", "prev_y"
+    )
+    ws, hs = _views(registry["body"], "w", "h")
+    heading_xs, heading_ys = _views(registry["heading"], "x", "y")
+    dxs, dys = _views(registry["velocity"], "dx", "dy")
+    land_speeds, water_speeds = _views(registry["speed"], "land", "water")
+    (zones,) = _views(registry["zone"], "code")
+    width, height = bounds
+
+    x = xs[ids].astype(np.int64)
+    y = ys[ids].astype(np.int64)
+    w = ws[ids].astype(np.int64)
+    h = hs[ids].astype(np.int64)
+    prev_xs[ids] = x
+    prev_ys[ids] = y
+    speed = np.where(zones[ids] == LAND, land_speeds[ids], water_speeds[ids])
+    dx = heading_xs[ids] * speed
+    dy = heading_ys[ids] * speed
+    dxs[ids] = dx
+    dys[ids] = dy
+
+    new = _round_coordinate(x + dx).astype(np.int64)
+    ok = (new >= 0) & (new + w <= width) & ~_blocked_vectorized(new, y, w, h, edges)
+    x = np.where(ok, new, x)
+
+    new = _round_coordinate(y + dy).astype(np.int64)
+    ok = (new >= 0) & (new + h <= height) & ~_blocked_vectorized(x, new, w, h, edges)
+    y = np.where(ok, new, y)
+
+    xs[ids] = x
+    ys[ids] = y
+
+
+def _update_zones_vectorized(registry, entities, edges, water_depth):
+    """update_zones() for many entities at once, with the same results."""
+    ids = np.asarray(entities)
+    xs, ys = _views(registry["position"], "x", "y")
+    ws, hs = _views(registry["body"], "w", "h")
+    (zones,) = _views(registry["zone"], "code")
+
+    x = xs[ids].astype(np.int64)
+    y = ys[ids].astype(np.int64)
+    h = hs[ids].astype(np.int64)
+    in_lodge = _blocked_vectorized(x, y, ws[ids].astype(np.int64), h, edges)
+    zones[ids] = np.where(
+        in_lodge, LODGE, np.where(y + h // 2 < water_depth, WATER, LAND)
+    )
+
+
+def find_contacts(registry, collectors, pickups, cell_size=32):
+    """Return (collector, pickup) pairs of overlapping entities.
+
+    Pickups are indexed in a SpatialHashGrid, so each collector only tests
+    the pickups in nearby cells.
+    """
+    position = registry["position"]
+    xs, ys = position["x"], position["y"]
+    body = registry["body"]
+    ws, hs = body["w"], body["h"]
+
+    max_size = 1
+    grid = SpatialHashGrid(cell_size, 1)
+    for pickup in pickups:
+        grid.insert(pickup, xs[pickup], ys[pickup])
+        max_size = max(max_size, ws[pickup], hs[pickup])
+    grid.max_item_size = max_size
+
+    def hit_test(pickup, rect):
+        x = xs[pickup]
+        y = ys[pickup]
+        return (
+            x < rect.right
+            and rect.left < x + ws[pickup]
+            and y < rect.bottom
+            and rect.top < y + hs[pickup]
+        )
+
+    contacts = []
+    probe = pygame.Rect(0, 0, 0, 0)
+    for collector in collectors:
+        probe.update(xs[collector], ys[collector], ws[collector], hs[collector])
+        for pickup in grid.colliding(probe, hit_test):
+            if pickup != collector:
+                contacts.append((collector, pickup))
+    return contacts
+
+
+def draw_sprites(registry, screen, entities, alpha=1.0):
+    """Blit the atlas sprites of entities in one Surface.blits() call.
+
+    With alpha below 1, each entity is drawn that fraction of the way from
+    its previous position to its current one.
+    """
+    position = registry["position"]
+    xs, ys = position["x"], position["y"]
+    prev_xs, prev_ys = position["prev_x"], position["prev_y"]
+    sprites = registry["sprite"]["index"]
+    sheet = atlas.surface
+    regions = [atlas.regions[name] for name in registry.sprite_names]
+
+    if alpha >= 1:
+        blits = [
+            (sheet, (xs[entity], ys[entity]), regions[sprites[entity]])
+            for entity in entities
+        ]
+    else:
+        blits = [
+            (
+                sheet,
+                (
+                    prev_xs[entity] + round((xs[entity] - prev_xs[entity]) * alpha),
+                    prev_ys[entity] + round((ys[entity] - prev_ys[entity]) * alpha),
+                ),
+                regions[sprites[entity]],
+            )
+            for entity in entities
+        ]
+    screen.blits(blits, doreturn=False)
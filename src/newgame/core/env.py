@@ -0,0 +1,347 @@
+"""
+Gym-style environments around BeaverSurvivalGame for training agents.
+
+BeaverEnv plays one headless game. reset(seed) starts a new game and
+step(action) holds a movement key mask for one fixed timestep, returning
+(state, reward, done, info). The state is a compact vector described by
+STATE_FIELDS rather than pixels, and frames are only drawn when render()
+asks for one.
+
+VectorEnv steps many BeaverEnvs spread over worker processes. Actions,
+states, rewards and done flags live in one shared memory block and the
+pipes to the workers only carry short commands, so a step costs one round
+trip per worker however many environments it runs, and throughput grows
+with the number of cores instead of being tied to one window's frame rate.
+
+Requires NumPy (``pip install newgame[sim]``).
+"""
+
+import multiprocessing
+import os
+import random
+from multiprocessing import shared_memory
+import numpy as np
+from ..config.constants import ZONE_TYPES
+from ..config.settings import DEFAULT_SETTINGS
+from ..systems.observation import pixel_view
+from ..utils.input import MOVEMENT_MASK, mask_to_keys
+from .game import BeaverSurvivalGame
+
+# Entries of a state vector. Positions are the player's top-left corner,
+# zone indexes ZONE_TYPES, and food_dx/food_dy lead from the player's
+# centre to the centre of the nearest food on screen (0 when there is
+# none, which food_visible tells apart).
+STATE_FIELDS = (
+    "player_x",
+    "player_y",
+    "zone",
+    "food",
+    "food_dx",
+    "food_dy",
+    "food_visible",
+)
+
+# Default start method of VectorEnv workers. Forking copies a process with
+# whatever locks its other threads (a prefetcher, an agent's framework)
+# held at the time, and can deadlock the children, so workers start from a
+# fresh interpreter instead
+START_METHOD = (
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
+# keys_pressed dicts for every movement key mask, built once
+_MASK_KEYS = [mask_to_keys(mask) for mask in range(MOVEMENT_MASK + 1)]
+
+
+class BeaverEnv:
+    """A single headless game with a reset/step interface.
+
+    Actions are movement key masks, as in replays and BatchSimulator. The
+    reward is the change in the food store over the step, so collecting
+    food pays and every food decrease costs. An episode is done when the
+    beaver starves or, if max_steps is given, after that many steps; info
+    then holds ``truncated=True``.
+    """
+
+    def __init__(self, seed=None, settings=None, max_steps=None):
+        self.settings = settings or DEFAULT_SETTINGS
+        self.max_steps = max_steps
+        # Draws the seed of every game that reset() starts
+        self.seeds = random.Random(seed)
+        self.game = None
+        self.steps = 0
+
+    def reset(self, seed=None):
+        """Start a new game and return its state.
+
+        A seed reseeds the environment; without one the next game seed is
+        drawn from the environment's own stream.
+        """
+        if seed is not None:
+            self.seeds.seed(seed)
+        self.game = BeaverSurvivalGame(
+            headless=True, seed=self.seeds.getrandbits(32), settings=self.settings
+        )
+        self.steps = 0
+        return self.get_state()
+
+    def step(self, action):
+        """Hold the keys of a movement key mask for one timestep.
+
+        Returns (state, reward, done, info).
+        """
+        reward, done = self._advance(action)
+        info = {
+            "survival_time": self.game.game_state.get_survival_time(),
+            "truncated": done and not self.game.game_state.is_game_over(),
+        }
+        return self.get_state(), reward, done, info
+
+    def _advance(self, action):
+        """Step the game. Returns (reward, done)."""
+        action = int(action)
+        if not 0 <= action <= MOVEMENT_MASK:
+            raise ValueError(f"action must be a movement key mask, got {action}")
+        game = self.game
+        if game is None:
+            raise RuntimeError("reset() must be called before step()")
+        food_amount = game.food_amount
+        game.step(_MASK_KEYS[action])
+        self.steps += 1
+        done = game.game_state.is_game_over() or (
+            self.max_steps is not None and self.steps >= self.max_steps
+        )
+        return game.food_amount - food_amount, done
+
+    def get_state(self, out=None):
+        """Return the state vector, written into out if given."""
+        if out is None:
+            out = np.zeros(len(STATE_FIELDS), dtype=np.float32)
+        game = self.game
+        rect = game.player.rect
+        centre_x, centre_y = rect.center
+        foods = game.food_manager
+        half = foods.food_size // 2
+        nearest = (0, 0, 0, 0)
+        for slot in foods.live_slots():
+            dx = foods.food_x[slot] + half - centre_x
+            dy = foods.food_y[slot] + half - centre_y
+            distance = dx * dx + dy * dy
+            if not nearest[3] or distance < nearest[0]:
+                nearest = (distance, dx, dy, 1)
+        out[:] = (
+            rect.x,
+            rect.y,
+            ZONE_TYPES.index(game.player.current_zone),
+            game.food_amount,
+            *nearest[1:],
+        )
+        return out
+
+    def render(self):
+        """Draw the game and return a (height, width, 3) RGB array copy."""
+        with pixel_view(self.game.render_frame()) as pixels:
+            return pixels.copy()
+
+
+def _shared_arrays(buffer, num_envs):
+    """Lay out (states, rewards, dones, actions) arrays over a buffer."""
+    arrays = []
+    offset = 0
+    for shape, dtype in (
+        ((num_envs, len(STATE_FIELDS)), np.float32),
+        ((num_envs,), np.float32),
+        ((num_envs,), np.bool_),
+        ((num_envs,), np.uint8),
+    ):
+        array = np.ndarray(shape, dtype, buffer=buffer, offset=offset)
+        offset += array.nbytes
+        arrays.append(array)
+    return arrays
+
+
+def _shared_size(num_envs):
+    """Return the bytes of shared memory _shared_arrays lays out."""
+    return num_envs * (4 * len(STATE_FIELDS) + 4 + 1 + 1)
+
+
+def _run_worker(conn, memory_name, num_envs, start, seeds, settings, max_steps):
+    """Worker process: run envs start onwards on shared memory commands.
+
+    Finished episodes are reset right away, so the states of done
+    environments are the first states of their next episodes.
+    """
+    memory = shared_memory.SharedMemory(name=memory_name)
+    states, rewards, dones, actions = _shared_arrays(memory.buf, num_envs)
+    envs = [BeaverEnv(seed, settings, max_steps) for seed in seeds]
+    try:
+        while True:
+            command, argument = conn.recv()
+            if command == "close":
+                break
+            result = None
+            try:
+                if command == "step":
+                    for index, env in enumerate(envs, start):
+                        rewards[index], dones[index] = env._advance(actions[index])
+                        if dones[index]:
+                            env.reset()
+                        env.get_state(states[index])
+                elif command == "reset":
+                    for index, env in enumerate(envs, start):
+                        env.reset(argument[index - start] if argument else None)
+                        env.get_state(states[index])
+                    rewards[start : start + len(envs)] = 0
+                    dones[start : start + len(envs)] = False
+                elif command == "render":
+                    result = envs[argument].render()
+            except Exception as error:
+                result = error
+            conn.send(result)
+    finally:
+        del states, rewards, dones, actions
+        memory.close()
+        conn.close()
+
+
+class VectorEnv:
+    """num_envs BeaverEnvs stepped together in worker processes.
+
+    reset() and step() return arrays in shared memory with one row per
+    environment: states (num_envs, len(STATE_FIELDS)) float32, rewards
+    float32 and dones bool. They are overwritten in place by the next call,
+    so copy what you keep. Done environments are reset automatically and
+    their row of states already belongs to the next episode.
+
+    workers is the number of processes (default: all cores, at most one
+    per environment); context is a multiprocessing start method name,
+    START_METHOD by default.
+    """
+
+    def __init__(
+        self,
+        num_envs,
+        seed=None,
+        settings=None,
+        max_steps=None,
+        workers=None,
+        context=None,
+    ):
+        if num_envs < 1:
+            raise ValueError("num_envs must be at least 1")
+        self.num_envs = num_envs
+        self.seed = seed
+        workers = min(num_envs, workers or os.cpu_count())
+        self._memory = shared_memory.SharedMemory(
+            create=True, size=_shared_size(num_envs)
+        )
+        self.states, self.rewards, self.dones, self.actions = _shared_arrays(
+            self._memory.buf, num_envs
+        )
+
+        # Environment i runs in the worker whose range holds it
+        self._starts = [num_envs * worker // workers for worker in range(workers)]
+        self._stops = self._starts[1:] + [num_envs]
+        seeds = self._env_seeds(seed)
+        mp = multiprocessing.get_context(context or START_METHOD)
+        self._conns = []
+        self._processes = []
+        for start, stop in zip(self._starts, self._stops):
+            conn, child_conn = mp.Pipe()
+            process = mp.Process(
+                target=_run_worker,
+                args=(
+                    child_conn,
+                    self._memory.name,
+                    num_envs,
+                    start,
+                    seeds[start:stop],
+                    settings,
+                    max_steps,
+                ),
+                daemon=True,
+            )
+            process.start()
+            child_conn.close()
+            self._conns.append(conn)
+            self._processes.append(process)
+
+    def _env_seeds(self, seed):
+        """Return one environment seed per environment, derived from seed."""
+        return np.random.SeedSequence(seed).generate_state(self.num_envs).tolist()
+
+    def _call(self, commands):
+        """Send one command per worker and return their results."""
+        for conn, command in zip(self._conns, commands):
+            conn.send(command)
+        results = [conn.recv() for conn in self._conns]
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+        return results
+
+    def reset(self, seed=None):
+        """Start new games everywhere and return the states.
+
+        A seed reseeds every environment, as it does at construction.
+        """
+        if seed is None:
+            self._call([("reset", None)] * len(self._conns))
+        else:
+            seeds = self._env_seeds(seed)
+            self._call(
+                [
+                    ("reset", seeds[start:stop])
+                    for start, stop in zip(self._starts, self._stops)
+                ]
+            )
+        return self.states
+
+    def step(self, actions):
+        """Step every environment with its movement key mask.
+
+        Returns (states, rewards, dones).
+        """
+        self.actions[:] = actions
+        self._call([("step", None)] * len(self._conns))
+        return self.states, self.rewards, self.dones
+
+    def render(self, index):
+        """Return a (height, width, 3) RGB frame of one environment."""
+        if not 0 <= index < self.num_envs:
+            raise IndexError(f"no environment {index}")
+        worker = next(worker for worker, stop in enumerate(self._stops) if index < stop)
+        conn = self._conns[worker]
+        conn.send(("render", index - self._starts[worker]))
+        result = conn.recv()
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def close(self):
+        """Stop the workers and free the shared memory."""
+        if self._memory is None:
+            return
+        for conn in self._conns:
+            try:
+                conn.send(("close", None))
+            except OSError:
+                pass  # The worker is already gone
+            conn.close()
+        for process in self._processes:
+            process.join()
+        self.states = self.rewards = self.dones = self.actions = None
+        try:
+            self._memory.close()
+        except BufferError:
+            # Arrays returned to the caller still map the block; it is
+            # unmapped when they are freed
+            pass
+        self._memory.unlink()
+        self._memory = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
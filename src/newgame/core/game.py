@@ -3,72 +3,188 @@ Main game class for the Beaver Survival Game.
 """
 
 import pygame
+import random
 import sys
-from ..config.settings import (
-    SCREEN_WIDTH,
-    SCREEN_HEIGHT,
-    FPS,
-    INITIAL_FOOD,
-    MAX_FOOD,
-    FOOD_DECREASE_INTERVAL,
-    FOOD_DECREASE_AMOUNT,
-    FOOD_COLLECTION_AMOUNT,
-)
+import time
+from ..config.settings import DEFAULT_SETTINGS
 from ..config.constants import (
-    COLORS,
     STATE_PLAYING,
     STATE_PAUSED,
     STATE_GAME_OVER,
 )
+from .clock import SimulationClock
+from .ecs import Registry
 from .game_state import GameStateManager
+from .scheduler import Scheduler
 from ..entities.player import Player
-from ..entities.objects import Lodge, Dam
-from ..entities.food import FoodManager
+from ..utils.input import (
+    ACTION_PAUSE,
+    ACTION_RESTART,
+    ACTION_BITE,
+    keys_to_mask,
+)
+from .prefetch import ScreenPrefetcher
+from .world import Screen, WorldManager, enter_position
+from ..systems.profiler import FrameProfiler, ProfilerOverlay
+from ..systems.renderer import DirtyRectRenderer
 from ..systems.ui import UI
 
 
-class BeaverSurvivalGame:
-    """Main game class that manages the entire game."""
+def init_subsystems(audio=False):
+    """Initialize only the pygame modules the game uses.
+
+    pygame.init() also starts the mixer and joystick modules, which are
+    slow to open and unused; the display brings up events with it, and
+    fonts are initialized on first use.
+    """
+    pygame.display.init()
+    if audio:
+        pygame.mixer.init()
+
 
-    def __init__(self):
-        pygame.init()
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-        pygame.display.set_caption("Beaver Survival Game")
+class BeaverSurvivalGame:
+    """Main game class that manages the entire game.
+
+    settings is the Settings object the game and all its objects are built
+    with; games with different settings can run side by side.
+    """
+
+    def __init__(
+        self,
+        headless=False,
+        clock=None,
+        seed=None,
+        dirty_rects=False,
+        world=False,
+        prefetch=None,
+        recorder=None,
+        save_manager=None,
+        autopilot=None,
+        settings=None,
+    ):
+        self.settings = settings = settings or DEFAULT_SETTINGS
+        self.headless = headless
+        if headless:
+            # Render into an off-screen surface; no window is ever opened
+            self.screen = pygame.Surface(settings.screen_size)
+        else:
+            init_subsystems(settings.audio_enabled)
+            self.screen = pygame.display.set_mode(settings.screen_size)
+            pygame.display.set_caption("Beaver Survival Game")
         self.clock = pygame.time.Clock()
 
+        # Time source for all game logic: a fixed-timestep clock that only
+        # moves when step() is called, at fps steps per second of real time
+        # while running and as fast as possible headless
+        if clock is None:
+            clock = SimulationClock(settings.fps)
+        self.game_clock = clock
+        self.seed = seed
+        self.rng = random.Random(seed)
+
+        # Game time: the game clock minus every paused stretch. Timers and
+        # everything that measures game time run on it.
+        self.scheduler = Scheduler(clock)
+
+        # Optional Replay that receives the input of every step()
+        self.recorder = recorder
+
+        # Optional SaveManager used for autosaves while running
+        self.save_manager = save_manager
+
+        # Optional Autopilot that chooses the held keys of every step()
+        self.autopilot = autopilot
+
+        # Fixed-timestep loop state: real seconds not yet simulated, and how
+        # far the renderer is between the last two simulation steps
+        self.accumulator = 0.0
+        self.render_alpha = 1.0
+
+        # Frame profiler; off until the F3 overlay or a trace turns it on
+        self.profiler = FrameProfiler()
+        self.profiler_overlay = None
+
         # Game components
-        self.game_state = GameStateManager()
-        self.ui = UI()
+        self.game_state = GameStateManager(self.scheduler)
+        self.ui = UI(settings)
+
+        # Optional renderer that only redraws the regions that changed
+        self.renderer = DirtyRectRenderer() if dirty_rects else None
+
+        # Optional streaming world; without it the game is the home screen only
+        self.world = None
+        if world:
+            self.world = WorldManager(self.scheduler, self.rng, settings=settings)
+
+        # Build the screens the player is heading for on a worker thread.
+        # Interactive worlds prefetch by default; headless ones load inline.
+        if prefetch is None:
+            prefetch = not headless
+        self.prefetcher = None
+        if self.world is not None and prefetch:
+            self.prefetcher = ScreenPrefetcher(self.world)
 
         # Initialize game objects
+        self.current_screen = None
         self._init_game_objects()
 
         # Game variables
-        self.food_amount = INITIAL_FOOD
-        self.last_food_decrease = pygame.time.get_ticks()
+        self.food_amount = settings.initial_food
+        self.food_timer = self.scheduler.repeat(
+            settings.food_decrease_interval, self._consume_food
+        )
+        self.last_autosave = self.game_clock.get_ticks()
 
         # Input tracking
         self.keys_pressed = {}
+        self.frame_actions = 0  # Net ACTION_* input handled since the last step
 
     def _init_game_objects(self):
         """Initialize all game objects."""
-        # Create lodge in center-left area
-        lodge_x = SCREEN_WIDTH // 4 - 30
-        lodge_y = SCREEN_HEIGHT // 2 - 20
-        self.lodge = Lodge(lodge_x, lodge_y)
-
-        # Create dam along north border
-        self.dam = Dam()
+        # Moving entities share one registry so they can be updated in bulk
+        self.entities = Registry()
 
         # Create player starting position (center of screen)
-        player_x = SCREEN_WIDTH // 2 - 10
-        player_y = SCREEN_HEIGHT // 2
-        self.player = Player(player_x, player_y)
-
-        # Create food manager
-        self.food_manager = FoodManager(
-            self.lodge.get_collision_rect(), self.dam.get_collision_rect()
-        )
+        settings = self.settings
+        self.player = Player(*settings.player_start_position, self.entities, settings)
+
+        # The home screen holds the lodge, the dam and the first food
+        if self.world is not None:
+            screen = self.world.current
+        else:
+            screen = Screen(
+                settings.home_screen_coord, self.scheduler, self.rng, settings
+            )
+        self._set_screen(screen)
+
+    def _set_screen(self, screen):
+        """Make screen the one being played and drawn."""
+        if self.current_screen is not None:
+            self.current_screen.food_manager.on_change = None
+        self.current_screen = screen
+        self.lodge = screen.lodge
+        self.dam = screen.dam
+        self.background = screen.background
+        self.food_manager = screen.food_manager
+        if self.renderer is not None:
+            self.food_manager.on_change = self.renderer.mark_dirty
+            self.renderer.invalidate()
+
+    def _update_world(self):
+        """Cross to a neighbouring screen and prepare the ones coming up."""
+        rect = self.player.get_collision_rect()
+        direction = self.world.exit_direction(rect, self.player.velocity)
+        if direction is not None:
+            screen = self.world.enter(direction)
+            if screen is not None:
+                enter_position(rect, direction, self.settings.screen_size)
+                self.player.rect = rect
+                self.player.reset_interpolation()
+                self._set_screen(screen)
+        if self.prefetcher is not None:
+            self.prefetcher.update(self.player, self.screen)
+        else:
+            self.world.preload_near(rect, self.screen)
 
     def handle_events(self):
         """Handle all game events."""
@@ -76,21 +192,20 @@ class BeaverSurvivalGame:
             if event.type == pygame.QUIT:
                 return False
 
+            if event.type == pygame.WINDOWEXPOSED and self.renderer is not None:
+                self.renderer.invalidate()
+
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
-                    if self.game_state.is_playing():
-                        self.game_state.set_state(STATE_PAUSED)
-                    elif self.game_state.is_paused():
-                        self.game_state.set_state(STATE_PLAYING)
-
-                elif event.key == pygame.K_r and self.game_state.is_game_over():
-                    self._restart_game()
-
+                    self._handle_action(ACTION_PAUSE)
+                elif event.key == pygame.K_r:
+                    self._handle_action(ACTION_RESTART)
                 elif event.key == pygame.K_q and self.game_state.is_paused():
                     return False
-
-                elif event.key == pygame.K_SPACE and self.game_state.is_playing():
-                    self.player.bite()
+                elif event.key == pygame.K_SPACE:
+                    self._handle_action(ACTION_BITE)
+                elif event.key == pygame.K_F3:
+                    self.toggle_profiler_overlay()
 
         # Track pressed keys for continuous movement
         if self.game_state.is_playing():
@@ -108,97 +223,304 @@ class BeaverSurvivalGame:
 
         return True
 
+    def toggle_profiler_overlay(self):
+        """Show or hide the profiler overlay, profiling only while shown."""
+        if self.profiler_overlay is None:
+            self.profiler_overlay = ProfilerOverlay(self.profiler)
+            self.profiler.start()
+        else:
+            if self.renderer is not None:
+                self.renderer.invalidate()
+            self.profiler_overlay = None
+            if not self.profiler.tracing:
+                self.profiler.stop()
+
+    def _handle_action(self, action):
+        """Apply one key press and fold it into the input of the next step.
+
+        Presses that did nothing are dropped and pause presses toggle the
+        recorded bit, so replaying the net ACTION_* bits of a step has the
+        same effect as the presses themselves, however many there were.
+        """
+        applied = self.apply_actions(action)
+        if applied & ACTION_PAUSE:
+            self.frame_actions ^= ACTION_PAUSE
+        else:
+            self.frame_actions |= applied
+
+    def apply_actions(self, actions):
+        """Apply a bitmask of one-shot ACTION_* inputs.
+
+        Restart is applied first and pause last; presses between two steps
+        can only take effect in that order, so the net bits of a step replay
+        them faithfully. Returns the bits that took effect.
+        """
+        applied = 0
+        if actions & ACTION_RESTART and self.game_state.is_game_over():
+            self._restart_game()
+            applied |= ACTION_RESTART
+
+        if actions & ACTION_BITE and self.game_state.is_playing():
+            self.player.bite()
+            applied |= ACTION_BITE
+
+        if actions & ACTION_PAUSE:
+            if self.game_state.is_playing():
+                self.game_state.set_state(STATE_PAUSED)
+                applied |= ACTION_PAUSE
+            elif self.game_state.is_paused():
+                self.game_state.set_state(STATE_PLAYING)
+                applied |= ACTION_PAUSE
+        return applied
+
     def update(self):
         """Update game logic."""
         if not self.game_state.is_playing():
             return
 
+        profiler = self.profiler
+
         # Update player
-        self.player.update(
-            self.keys_pressed,
-            self.lodge.get_collision_rect(),
-            self.dam.get_collision_rect(),
-        )
+        with profiler.span("Player.update"):
+            self.player.update(
+                self.keys_pressed,
+                self.current_screen.lodge_rect,
+                self.current_screen.dam_rect,
+            )
+        if self.world is not None:
+            with profiler.span("WorldManager"):
+                self._update_world()
 
         # Update food spawning
-        self.food_manager.update()
+        with profiler.span("FoodManager.update"):
+            self.food_manager.update()
 
         # Check food collection
-        collected_food = self.food_manager.check_collection(
-            self.player.get_collision_rect()
+        with profiler.span("FoodManager.collect"):
+            collected = self.food_manager.collect(self.player.get_collision_rect())
+        settings = self.settings
+        if collected:
+            self.food_amount = min(
+                settings.max_food,
+                self.food_amount + collected * settings.food_collection_amount,
+            )
+
+        # Run due timers, such as the food decrease
+        self.scheduler.update()
+
+    def _consume_food(self):
+        """Timer callback: the beaver eats, and starves at zero food."""
+        decrease = self.settings.food_decrease_amount
+        self.food_amount = max(0, self.food_amount - decrease)
+        if self.food_amount <= 0:
+            self.game_state.set_state(STATE_GAME_OVER)
+
+    @property
+    def last_food_decrease(self):
+        """Game time of the last food decrease, or of the start of the game."""
+        return self.food_timer.due - self.food_timer.interval
+
+    @last_food_decrease.setter
+    def last_food_decrease(self, ticks):
+        interval = self.settings.food_decrease_interval
+        self.scheduler.cancel(self.food_timer)
+        self.food_timer = self.scheduler.repeat(
+            interval,
+            self._consume_food,
+            delay=ticks + interval - self.scheduler.get_ticks(),
         )
-        for food in collected_food:
-            self.food_amount = min(MAX_FOOD, self.food_amount + FOOD_COLLECTION_AMOUNT)
-
-        # Decrease food over time
-        current_time = pygame.time.get_ticks()
-        if current_time - self.last_food_decrease >= FOOD_DECREASE_INTERVAL:
-            self.food_amount = max(0, self.food_amount - FOOD_DECREASE_AMOUNT)
-            self.last_food_decrease = current_time
-
-            # Check game over condition
-            if self.food_amount <= 0:
-                self.game_state.set_state(STATE_GAME_OVER)
 
     def draw(self):
         """Draw everything on the screen."""
-        # Clear screen with green background (land)
-        self.screen.fill(COLORS["GREEN"])
-
-        # Draw water area (upper part of screen)
-        water_rect = pygame.Rect(0, 10, SCREEN_WIDTH, 100)
-        pygame.draw.rect(self.screen, COLORS["BLUE"], water_rect)
+        # Nothing moves while paused, so only interpolate a running game
+        alpha = self.render_alpha if self.game_state.is_playing() else 1.0
+        self.player.interpolate(alpha)
+
+        overlay = self.profiler_overlay
+        if self.renderer is not None:
+            if overlay is not None and overlay.rect is not None:
+                # Restore what the overlay covered before drawing it again
+                self.renderer.mark_dirty(overlay.rect)
+            rects = self.renderer.render(self)
+            if overlay is not None:
+                overlay_rect = overlay.draw(self.screen)
+                if rects is not None:
+                    rects.append(overlay_rect)
+        else:
+            self.draw_scene(self.screen)
+            if overlay is not None:
+                overlay.draw(self.screen)
+            rects = None
+
+        with self.profiler.span("present"):
+            self._present(rects)
+
+    def render_frame(self):
+        """Draw the current state into self.screen without presenting it.
+
+        For observers of the game, like agents and visual tests; the player
+        is drawn where the simulation has it. Returns the surface.
+        """
+        self.player.interpolate(1.0)
+        self.draw_scene(self.screen)
+        if self.renderer is not None:
+            self.renderer.invalidate()
+        return self.screen
+
+    def draw_background(self, screen, area=None):
+        """Draw the static scenery (land, water, dam and lodge).
+
+        Blits the cached background layer, optionally only the given area.
+        """
+        self.background.draw(screen, area)
+
+    def draw_scene(self, screen):
+        """Draw the complete frame. Returns the HUD rect, if the HUD is shown."""
+        self.draw_background(screen)
 
         # Draw game objects
-        self.dam.draw(self.screen)
-        self.lodge.draw(self.screen)
-        self.food_manager.draw(self.screen)
-        self.player.draw(self.screen)
+        with self.profiler.span("FoodManager.draw"):
+            self.food_manager.draw(screen)
+        self.player.draw(screen)
 
         # Draw UI based on game state
+        hud_rect = None
         if self.game_state.is_playing() or self.game_state.is_paused():
-            self.ui.draw_hud(self.screen, self.food_amount)
+            with self.profiler.span("UI.draw_hud"):
+                hud_rect = self.ui.draw_hud(screen, self.food_amount)
 
         if self.game_state.is_paused():
-            self.ui.draw_pause_menu(self.screen)
+            self.ui.draw_pause_menu(screen)
         elif self.game_state.is_game_over():
             survival_time = self.game_state.get_survival_time()
-            self.ui.draw_game_over_screen(self.screen, survival_time)
+            self.ui.draw_game_over_screen(screen, survival_time)
+
+        return hud_rect
 
-        pygame.display.flip()
+    def _present(self, rects=None):
+        """Push the frame to the display: all of it, or only the given rects."""
+        if self.headless:
+            return
+        if rects is None:
+            pygame.display.flip()
+        elif rects:
+            pygame.display.update(rects)
 
     def _restart_game(self):
         """Restart the game to initial state."""
         self.game_state.reset_game()
-        self.food_amount = INITIAL_FOOD
-        self.last_food_decrease = pygame.time.get_ticks()
+        self.food_amount = self.settings.initial_food
+        self.last_food_decrease = self.scheduler.get_ticks()
 
         # Reset player position
-        player_x = SCREEN_WIDTH // 2 - 10
-        player_y = SCREEN_HEIGHT // 2
-        self.player.reset_position(player_x, player_y)
+        self.player.reset_position(*self.settings.player_start_position)
 
-        # Clear all food items
-        self.food_manager.clear()
+        # Clear all food items, or the whole world, and return home
+        if self.world is not None:
+            self.world.reset()
+            self._set_screen(self.world.current)
+        else:
+            self.food_manager.clear()
 
         # Reset input
         self.keys_pressed = {}
 
+    def step(self, keys_pressed=None, actions=0):
+        """Advance a fixed-timestep game by one tick and update the simulation.
+
+        actions is a bitmask of ACTION_* inputs applied before the update.
+        Game time only follows the steps with a SimulationClock, which is the
+        default.
+        """
+        if actions:
+            self.apply_actions(actions)
+        if keys_pressed is not None:
+            self.keys_pressed = keys_pressed
+        if self.autopilot is not None and self.game_state.is_playing():
+            self.keys_pressed = self.autopilot.keys(self)
+        if self.recorder is not None:
+            self.recorder.record(
+                keys_to_mask(self.keys_pressed) | self.frame_actions | actions
+            )
+        self.frame_actions = 0
+        self.game_clock.advance()
+        self.update()
+
+    def run_headless(self, ticks, keys_pressed=None):
+        """Simulate up to a number of ticks without rendering.
+
+        Stops early if the game ends. Returns the number of ticks simulated.
+        """
+        profiler = self.profiler
+        for tick in range(ticks):
+            with profiler.span("update"):
+                self.step(keys_pressed)
+            profiler.end_frame()
+            if self.game_state.is_game_over():
+                return tick + 1
+        return ticks
+
+    def advance_frame(self, elapsed):
+        """Run the fixed steps owed for elapsed seconds of real time.
+
+        Time is added to an accumulator and simulated in whole steps of
+        1 / fps seconds, so the game runs at the same speed at any frame
+        rate. When rendering falls behind, up to max_frame_skip extra steps
+        are run per frame; any backlog beyond that is dropped and the game
+        slows down rather than spiralling. Sets render_alpha for the next
+        draw() and returns the number of steps run.
+        """
+        step_time = self.settings.step_seconds
+        self.accumulator += elapsed
+        steps = 0
+        while self.accumulator >= step_time:
+            if steps > self.settings.max_frame_skip:
+                self.accumulator = 0.0
+                break
+            self.step()
+            self.accumulator -= step_time
+            steps += 1
+        self.render_alpha = self.accumulator / step_time
+        return steps
+
+    def _autosave(self):
+        """Save the game if the autosave interval has passed."""
+        current_time = self.game_clock.get_ticks()
+        if current_time - self.last_autosave >= self.settings.autosave_interval:
+            self.save_manager.save(self)
+            self.last_autosave = current_time
+
     def run(self):
         """Main game loop."""
         running = True
+        profiler = self.profiler
+        last_time = time.perf_counter()
 
         while running:
             # Handle events
-            running = self.handle_events()
+            with profiler.span("handle_events"):
+                running = self.handle_events()
 
-            # Update game logic
-            self.update()
+            # Update game logic in fixed timesteps for the time that passed
+            now = time.perf_counter()
+            with profiler.span("update"):
+                self.advance_frame(now - last_time)
+            last_time = now
+
+            if self.save_manager is not None:
+                self._autosave()
 
             # Draw everything
-            self.draw()
+            with profiler.span("draw"):
+                self.draw()
 
             # Control frame rate
-            self.clock.tick(FPS)
-
+            with profiler.span("clock.tick"):
+                self.clock.tick(self.settings.max_render_fps)
+            profiler.end_frame()
+
+        if self.save_manager is not None:
+            self.save_manager.save(self)
+        if self.prefetcher is not None:
+            self.prefetcher.shutdown()
         pygame.quit()
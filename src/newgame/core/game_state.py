@@ -2,36 +2,47 @@
 Game state management for the Beaver Survival Game.
 """
 
-import pygame
 from ..config.constants import STATE_PLAYING, STATE_PAUSED, STATE_GAME_OVER
+from .scheduler import Scheduler
 
 
 class GameStateManager:
-    """Manages the current game state and transitions between states."""
+    """Manages the current game state and transitions between states.
 
-    def __init__(self):
+    Game time runs on a Scheduler that is paused whenever the game is not
+    being played, so paused and game over time never counts. A plain clock
+    is wrapped in a Scheduler of its own.
+    """
+
+    def __init__(self, clock=None):
+        if not isinstance(clock, Scheduler):
+            clock = Scheduler(clock)
+        self.clock = clock
         self.current_state = STATE_PLAYING
         self.previous_state = None
-        self.game_start_time = pygame.time.get_ticks()
-        self.pause_time = 0
-        self.total_pause_duration = 0
+        self.clock.resume()
+        self.game_start_time = self.clock.get_ticks()
 
     def set_state(self, new_state):
         """Change to a new game state."""
         if new_state != self.current_state:
             self.previous_state = self.current_state
             self.current_state = new_state
+            self._sync_clock()
+
+    def _sync_clock(self):
+        """Run game time only while playing."""
+        if self.current_state == STATE_PLAYING:
+            self.clock.resume()
+        else:
+            self.clock.pause()
 
-            # Handle state-specific logic
-            if new_state == STATE_PAUSED:
-                self.pause_time = pygame.time.get_ticks()
-            elif self.previous_state == STATE_PAUSED:
-                # Resuming from pause
-                if self.pause_time > 0:
-                    self.total_pause_duration += (
-                        pygame.time.get_ticks() - self.pause_time
-                    )
-                    self.pause_time = 0
+    def restore(self, current_state, previous_state, game_start_time):
+        """Restore a saved state, pausing game time to match."""
+        self.current_state = current_state
+        self.previous_state = previous_state
+        self.game_start_time = game_start_time
+        self._sync_clock()
 
     def is_playing(self):
         """Return True if the game is in playing state."""
@@ -47,24 +58,12 @@ class GameStateManager:
 
     def get_survival_time(self):
         """Get the total survival time in seconds."""
-        current_time = pygame.time.get_ticks()
-        if self.current_state == STATE_PAUSED:
-            # Don't count current pause time
-            total_time = (
-                self.pause_time - self.game_start_time - self.total_pause_duration
-            )
-        else:
-            # Count all time except pauses
-            total_time = current_time - self.game_start_time - self.total_pause_duration
-            if self.pause_time > 0:
-                total_time -= current_time - self.pause_time
-
+        total_time = self.clock.get_ticks() - self.game_start_time
         return max(0, total_time // 1000)  # Convert to seconds
 
     def reset_game(self):
         """Reset the game state for a new game."""
         self.current_state = STATE_PLAYING
         self.previous_state = None
-        self.game_start_time = pygame.time.get_ticks()
-        self.pause_time = 0
-        self.total_pause_duration = 0
+        self.clock.resume()
+        self.game_start_time = self.clock.get_ticks()
@@ -0,0 +1,115 @@
+"""
+Background prefetching of world screens.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import random
+from ..entities.food import food_sprites
+from .world import Screen
+
+# Pending builds kept at once; older predictions are dropped first
+MAX_PENDING = 4
+
+
+def _build_screen(coord, clock, rng, settings, start_time, data, target):
+    """Build a screen and rasterize its background. Runs on a worker thread."""
+    screen = Screen(coord, clock, rng, settings)
+    screen.food_manager.last_spawn_time = start_time
+    if data is not None:
+        screen.unpack(data)
+    if target is not None:
+        screen.background.get_surface(target)
+    return screen
+
+
+class ScreenPrefetcher:
+    """Builds the screens the player is heading for on a thread pool.
+
+    Each update extrapolates the player's rect by its velocity for
+    ``lookahead`` ticks (by default the settings' prefetch_lookahead), and every neighbouring screen it would cross into
+    is built off the main loop: layout, food restored from the world's
+    archive and the pre-rendered background. Finished screens are only
+    swapped in by the main thread, when WorldManager.load() asks for them;
+    if a build is still running at that point, load() waits for it instead
+    of starting over.
+
+    Everything a build reads from shared game state (the archived bytes,
+    the current time and an RNG seed) is captured on the main thread when
+    it is submitted, so the resulting screen does not depend on thread
+    timing. Food sprites for the world's food size are registered in the
+    shared atlas up front, so builds only ever read it.
+    """
+
+    def __init__(self, world, lookahead=None, max_workers=None):
+        settings = world.settings
+        if lookahead is None:
+            lookahead = settings.prefetch_lookahead
+        if max_workers is None:
+            max_workers = settings.prefetch_workers
+        self.world = world
+        self.lookahead = lookahead
+        food_sprites(settings.food_size)
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="prefetch"
+        )
+        self.pending = {}
+        world.prefetcher = self
+
+    def predict(self, player):
+        """Return the directions of the screens the player will reach soon."""
+        return self.world.exit_directions(player.predicted_rect(self.lookahead))
+
+    def update(self, player, target=None):
+        """Start building every predicted neighbour that is not loaded yet.
+
+        target is the display surface whose pixel format the prefetched
+        backgrounds should use.
+        """
+        world = self.world
+        for direction in self.predict(player):
+            coord = world.neighbor(world.current.coord, direction)
+            if coord is None or coord in world.screens or coord in self.pending:
+                continue
+            self.submit(coord, target)
+
+    def submit(self, coord, target=None):
+        """Schedule a screen build on the pool."""
+        world = self.world
+        rng = random.Random(world.rng.getrandbits(64)) if world.rng else None
+        self.pending[coord] = self.executor.submit(
+            _build_screen,
+            coord,
+            world.clock,
+            rng,
+            world.settings,
+            world.clock.get_ticks() if world.clock else 0,
+            world.archive.get(coord),
+            target,
+        )
+        while len(self.pending) > MAX_PENDING:
+            self.pending.pop(next(iter(self.pending))).cancel()
+
+    def take(self, coord):
+        """Return the prefetched screen for coord, or None if there is none.
+
+        Blocks until the build finishes if it is still running.
+        """
+        future = self.pending.pop(coord, None)
+        if future is None or future.cancelled():
+            return None
+        screen = future.result()
+        # From now on the screen draws from the game's shared RNG
+        if self.world.rng is not None:
+            screen.food_manager.rng = self.world.rng
+        return screen
+
+    def cancel(self):
+        """Drop all pending builds, e.g. when the world is reset."""
+        for future in self.pending.values():
+            future.cancel()
+        self.pending.clear()
+
+    def shutdown(self):
+        """Stop the worker threads."""
+        self.cancel()
+        self.executor.shutdown(wait=True)
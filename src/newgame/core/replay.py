@@ -0,0 +1,189 @@
+"""
+Input recording and deterministic replay for the Beaver Survival Game.
+
+A game driven by a SimulationClock and a seeded RNG is fully determined by
+its seed and the input of every tick, so a replay stores only those. Each
+tick's input is one 16-bit word: the movement key mask in the low byte and
+the ACTION_* bits above it (see utils.input).
+"""
+
+import struct
+from array import array
+from ..config.settings import DEFAULT_SETTINGS
+from ..utils.input import MOVEMENT_MASK, ACTION_MASK, mask_to_keys
+from .clock import SimulationClock
+from .game import BeaverSurvivalGame
+
+REPLAY_MAGIC = b"BQRP"
+REPLAY_VERSION = 1
+
+# Flags stored in the replay header
+FLAG_WORLD = 1
+FLAG_PREFETCH = 2
+
+# magic, version, flags, fps, seed, tick count, run count
+_HEADER = struct.Struct("<4sHHHqII")
+# One run of identical input words: the word and how many ticks it lasted
+_RUN = struct.Struct("<HI")
+
+
+class Replay:
+    """The seed, game options and per-tick input of one recorded game.
+
+    Pass a Replay as the game's ``recorder`` to fill it while playing. On
+    disk the inputs are run-length encoded: players hold keys for many
+    ticks in a row, so a long game shrinks to a few bytes per key change.
+    fps is the recorded game's settings.fps, by default the default rate.
+    """
+
+    def __init__(self, seed, fps=None, world=False, prefetch=False):
+        self.seed = seed
+        self.fps = fps or DEFAULT_SETTINGS.fps
+        self.world = world
+        self.prefetch = prefetch
+        self.inputs = array("H")
+
+    def record(self, word):
+        """Append the input word of one tick."""
+        self.inputs.append(word)
+
+    def __len__(self):
+        return len(self.inputs)
+
+    def runs(self):
+        """Return the inputs as a list of (word, length) runs."""
+        runs = []
+        for word in self.inputs:
+            if runs and runs[-1][0] == word:
+                runs[-1][1] += 1
+            else:
+                runs.append([word, 1])
+        return [tuple(run) for run in runs]
+
+    def to_bytes(self):
+        """Serialize the replay."""
+        flags = (FLAG_WORLD if self.world else 0) | (
+            FLAG_PREFETCH if self.prefetch else 0
+        )
+        runs = self.runs()
+        header = _HEADER.pack(
+            REPLAY_MAGIC,
+            REPLAY_VERSION,
+            flags,
+            self.fps,
+            self.seed,
+            len(self.inputs),
+            len(runs),
+        )
+        return header + b"".join(_RUN.pack(word, length) for word, length in runs)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Deserialize a replay produced by to_bytes()."""
+        if len(data) < _HEADER.size:
+            raise ValueError("replay data is truncated")
+        magic, version, flags, fps, seed, ticks, run_count = _HEADER.unpack_from(data)
+        if magic != REPLAY_MAGIC:
+            raise ValueError("not a replay file")
+        if version != REPLAY_VERSION:
+            raise ValueError(f"unsupported replay version {version}")
+        if len(data) != _HEADER.size + run_count * _RUN.size:
+            raise ValueError("replay data is truncated")
+
+        replay = cls(
+            seed,
+            fps=fps,
+            world=bool(flags & FLAG_WORLD),
+            prefetch=bool(flags & FLAG_PREFETCH),
+        )
+        for word, length in _RUN.iter_unpack(data[_HEADER.size :]):
+            replay.inputs.extend(array("H", [word]) * length)
+        if len(replay.inputs) != ticks:
+            raise ValueError("replay tick count does not match its inputs")
+        return replay
+
+    def save(self, path):
+        """Write the replay to a file."""
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        """Read a replay from a file."""
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+
+class ReplayPlayer:
+    """Re-simulates a replay headlessly, as fast as the CPU allows.
+
+    The game is stepped with the recorded input and nothing is drawn unless
+    render() is called, so fast-forwarding costs only the simulation.
+    Seeking forward continues from the current tick; seeking backward
+    restarts the game from the seed. Replays do not store settings; pass
+    the ones the game was recorded with.
+    """
+
+    def __init__(self, replay, settings=None):
+        self.replay = replay
+        self.settings = settings
+        self.game = None
+        self.restart()
+
+    def restart(self):
+        """Start over from tick zero."""
+        replay = self.replay
+        if self.game is not None:
+            self.close()
+        self.game = BeaverSurvivalGame(
+            headless=True,
+            clock=SimulationClock(replay.fps),
+            seed=replay.seed,
+            world=replay.world,
+            prefetch=replay.prefetch,
+            settings=self.settings,
+        )
+        self.tick = 0
+
+    def step(self):
+        """Simulate the next recorded tick. Returns False at the end."""
+        if self.tick >= len(self.replay):
+            return False
+        word = self.replay.inputs[self.tick]
+        self.game.step(mask_to_keys(word & MOVEMENT_MASK), word & ACTION_MASK)
+        self.tick += 1
+        return True
+
+    def seek(self, tick):
+        """Simulate up to (but not including) the given tick."""
+        tick = max(0, min(tick, len(self.replay)))
+        if tick < self.tick:
+            self.restart()
+        while self.tick < tick:
+            self.step()
+
+    def run(self):
+        """Simulate the rest of the replay and return the game."""
+        self.seek(len(self.replay))
+        return self.game
+
+    def render(self, tick=None):
+        """Draw the frame at tick (default: the current one) and return it.
+
+        The returned surface is the game's off-screen surface and is reused
+        by the next render.
+        """
+        if tick is not None:
+            self.seek(tick)
+        self.game.draw_scene(self.game.screen)
+        return self.game.screen
+
+    def frames(self, ticks):
+        """Yield (tick, surface) for each of the given ticks, in order."""
+        for tick in sorted(set(ticks)):
+            yield tick, self.render(tick)
+
+    def close(self):
+        """Stop any background threads of the replayed game."""
+        if self.game.prefetcher is not None:
+            self.game.prefetcher.shutdown()
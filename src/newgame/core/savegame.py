@@ -0,0 +1,272 @@
+"""
+Binary save games for the Beaver Survival Game.
+
+A save file starts with a magic and format version, followed by records.
+The first record is a full snapshot; each later record is a delta holding
+only the sections that differ from that snapshot, appended to the file.
+A record is a kind byte, the body length and a CRC32 of the body, and the
+body is a sequence of (4-byte tag, length, payload) sections:
+
+    GAME  clock ticks, save time, food amount, last food decrease
+    STAT  game state, previous state and game start time
+    PLYR  player position and zone
+    FOOD  the food and spawn timer of a single-screen game
+    WRLD  the current screen of a world game
+    SCxy  the food and spawn timer of world screen (x, y)
+
+Times are game times, which leave out paused stretches, stored together
+with the game time of the save and shifted on load if the game's clock has
+moved on since. Unchanged
+screens therefore serialize to identical bytes, so they are neither
+re-packed nor rewritten by later delta saves.
+"""
+
+import os
+import struct
+import zlib
+from ..config.constants import GAME_STATES, ZONE_TYPES
+from ..config.settings import DEFAULT_SETTINGS
+from ..entities.food import shift_packed_time
+from .clock import SimulationClock
+
+SAVE_MAGIC = b"BQSV"
+SAVE_VERSION = 2
+
+RECORD_FULL = 0
+RECORD_DELTA = 1
+
+_FILE_HEADER = struct.Struct("<4sH")
+_RECORD_HEADER = struct.Struct("<BII")
+_SECTION_HEADER = struct.Struct("<4sI")
+
+_GAME = struct.Struct("<qqiq")
+_STAT = struct.Struct("<bbq")
+_PLYR = struct.Struct("<hhb")
+_WRLD = struct.Struct("<bb")
+
+
+def _screen_tag(coord):
+    return b"SC" + bytes(coord)
+
+
+def _encode_record(kind, sections):
+    """Serialize a record from a dict of tag -> payload."""
+    body = b"".join(
+        _SECTION_HEADER.pack(tag, len(payload)) + payload
+        for tag, payload in sections.items()
+    )
+    return _RECORD_HEADER.pack(kind, len(body), zlib.crc32(body)) + body
+
+
+def _decode_sections(body):
+    """Parse a record body into a dict of tag -> payload."""
+    sections = {}
+    offset = 0
+    while offset < len(body):
+        tag, length = _SECTION_HEADER.unpack_from(body, offset)
+        offset += _SECTION_HEADER.size
+        sections[tag] = body[offset : offset + length]
+        offset += length
+    return sections
+
+
+def read_save(data):
+    """Return the sections of the latest state stored in save data.
+
+    A damaged record after the full snapshot, such as a delta cut short by
+    a crash, is ignored along with everything after it.
+    """
+    if len(data) < _FILE_HEADER.size:
+        raise ValueError("save data is truncated")
+    magic, version = _FILE_HEADER.unpack_from(data)
+    if magic != SAVE_MAGIC:
+        raise ValueError("not a save file")
+    if version != SAVE_VERSION:
+        raise ValueError(f"unsupported save version {version}")
+
+    offset = _FILE_HEADER.size
+    records = []
+    while offset + _RECORD_HEADER.size <= len(data):
+        kind, length, crc = _RECORD_HEADER.unpack_from(data, offset)
+        body = data[
+            offset + _RECORD_HEADER.size : offset + _RECORD_HEADER.size + length
+        ]
+        if len(body) != length or zlib.crc32(body) != crc:
+            break
+        records.append((kind, body))
+        offset += _RECORD_HEADER.size + length
+
+    if not records or records[0][0] != RECORD_FULL:
+        raise ValueError("save data has no intact snapshot")
+    base = _decode_sections(records[0][1])
+    sections = dict(base)
+    if len(records) > 1:
+        sections.update(_decode_sections(records[-1][1]))
+    return base, sections, len(records) - 1
+
+
+class SaveManager:
+    """Writes a game to a save file as a snapshot followed by deltas.
+
+    The first save, and every save once ``max_deltas`` deltas (by default
+    the settings' max_delta_saves) have piled up or a delta would be more
+    than half the size of a snapshot, rewrites the file with a full
+    snapshot. Other saves append one delta holding every
+    section that differs from the snapshot, so loading reads the snapshot
+    plus the last record only.
+
+    Packed screens are cached by FoodManager revision, and archived world
+    screens are already packed, so a save only serializes what changed.
+    """
+
+    def __init__(self, path, max_deltas=None, settings=None):
+        if max_deltas is None:
+            max_deltas = (settings or DEFAULT_SETTINGS).max_delta_saves
+        self.path = path
+        self.max_deltas = max_deltas
+        self.base = None
+        self.base_size = 0
+        self.deltas = 0
+        self._packed = {}
+
+    def _pack_food(self, tag, food_manager):
+        """Return food_manager.pack(), reusing it if nothing changed."""
+        key = (food_manager, food_manager.revision)
+        cached = self._packed.get(tag)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        data = food_manager.pack()
+        self._packed[tag] = (key, data)
+        return data
+
+    def collect(self, game):
+        """Return the game's state as a dict of tag -> payload."""
+        clock = game.game_clock
+        state = game.game_state
+        sections = {
+            b"GAME": _GAME.pack(
+                clock.ticks if isinstance(clock, SimulationClock) else -1,
+                game.scheduler.get_ticks(),
+                game.food_amount,
+                game.last_food_decrease,
+            ),
+            b"STAT": _STAT.pack(
+                GAME_STATES.index(state.current_state),
+                (
+                    GAME_STATES.index(state.previous_state)
+                    if state.previous_state is not None
+                    else -1
+                ),
+                state.game_start_time,
+            ),
+            b"PLYR": _PLYR.pack(
+                game.player.rect.x,
+                game.player.rect.y,
+                ZONE_TYPES.index(game.player.current_zone),
+            ),
+        }
+
+        world = game.world
+        if world is None:
+            sections[b"FOOD"] = self._pack_food(b"FOOD", game.food_manager)
+            return sections
+
+        sections[b"WRLD"] = _WRLD.pack(*world.current.coord)
+        for coord, data in world.archive.items():
+            tag = _screen_tag(coord)
+            sections[tag] = data
+            self._packed.pop(tag, None)
+        for coord, screen in world.screens.items():
+            tag = _screen_tag(coord)
+            sections[tag] = self._pack_food(tag, screen.food_manager)
+        return sections
+
+    def save(self, game, full=False):
+        """Save the game and return the number of bytes written."""
+        sections = self.collect(game)
+        base = self.base
+        if not full and base is not None and self.deltas < self.max_deltas:
+            if base.keys() <= sections.keys():
+                changed = {
+                    tag: payload
+                    for tag, payload in sections.items()
+                    if base.get(tag) != payload
+                }
+                record = _encode_record(RECORD_DELTA, changed)
+                if 2 * len(record) <= self.base_size:
+                    with open(self.path, "ab") as f:
+                        f.write(record)
+                    self.deltas += 1
+                    return len(record)
+
+        data = _FILE_HEADER.pack(SAVE_MAGIC, SAVE_VERSION) + _encode_record(
+            RECORD_FULL, sections
+        )
+        # Write beside the old file and swap, so a crash never loses both
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, self.path)
+        self.base = sections
+        self.base_size = len(data)
+        self.deltas = 0
+        return len(data)
+
+    def load(self, game):
+        """Restore the game from the save file."""
+        with open(self.path, "rb") as f:
+            data = f.read()
+        base, sections, deltas = read_save(data)
+        apply_sections(game, sections)
+
+        # Later saves append deltas to the snapshot that was just read
+        self.base = base
+        self.base_size = len(_encode_record(RECORD_FULL, base))
+        self.deltas = deltas
+        self._packed.clear()
+
+
+def apply_sections(game, sections):
+    """Restore a game from a dict of tag -> payload."""
+    world = game.world
+    if (b"WRLD" in sections) != (world is not None):
+        raise ValueError("save does not match the game's world setting")
+
+    clock = game.game_clock
+    ticks, saved_now, food_amount, last_food_decrease = _GAME.unpack(sections[b"GAME"])
+    if ticks >= 0 and isinstance(clock, SimulationClock):
+        clock.ticks = ticks
+    shift = game.scheduler.get_ticks() - saved_now
+
+    game.food_amount = food_amount
+    game.last_food_decrease = last_food_decrease + shift
+
+    state = game.game_state
+    current, previous, start = _STAT.unpack(sections[b"STAT"])
+    state.restore(
+        GAME_STATES[current],
+        GAME_STATES[previous] if previous >= 0 else None,
+        start + shift,
+    )
+
+    x, y, zone = _PLYR.unpack(sections[b"PLYR"])
+    game.player.reset_position(x, y)
+    game.player.current_zone = ZONE_TYPES[zone]
+    game.keys_pressed = {}
+
+    def food(data):
+        return shift_packed_time(data, shift) if shift else data
+
+    if world is None:
+        game.food_manager.unpack(food(sections[b"FOOD"]))
+        if game.renderer is not None:
+            game.renderer.invalidate()
+        return
+
+    archive = {
+        tuple(tag[2:]): food(payload)
+        for tag, payload in sections.items()
+        if tag.startswith(b"SC")
+    }
+    world.restore(_WRLD.unpack(sections[b"WRLD"]), archive)
+    game._set_screen(world.current)
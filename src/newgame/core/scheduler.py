@@ -0,0 +1,161 @@
+"""
+Timers on a game clock that stops while the game is paused.
+
+The Scheduler reads time from a source clock (a SimulationClock or
+WallClock) but leaves out every stretch spent paused, so game time simply
+stands still while the pause menu or the game over screen is shown. It is
+itself a clock: anything that calls ``get_ticks()`` on it, like
+FoodManager and GameStateManager, measures game time without doing any
+pause arithmetic of its own.
+
+Timers are kept in a binary heap ordered by due time. Scheduling is
+O(log n), cancelling is O(1) (cancelled timers are skipped when they come
+up, and the heap is compacted once most of it is dead), and ``update()``
+only looks at the front of the heap, so any number of pending timers cost
+nothing until they are due.
+"""
+
+import heapq
+import itertools
+from .clock import WallClock
+
+# Cancelled timers tolerated in the heap before it is compacted
+COMPACT_MIN = 64
+
+
+class Timer:
+    """A pending call made by a Scheduler.
+
+    ``due`` is the game time of the next call and ``interval`` the time
+    between calls of a repeating timer (None for one-shot timers).
+    ``active`` turns False once a one-shot timer fires or any timer is
+    cancelled.
+    """
+
+    __slots__ = ("due", "interval", "callback", "args", "active")
+
+    def __init__(self, due, interval, callback, args):
+        self.due = due
+        self.interval = interval
+        self.callback = callback
+        self.args = args
+        self.active = True
+
+    def __repr__(self):
+        return (
+            f"Timer(due={self.due}, interval={self.interval}, "
+            f"callback={self.callback!r}, active={self.active})"
+        )
+
+
+class Scheduler:
+    """Pause-aware game clock with one-shot and repeating timers.
+
+    Times are in milliseconds of game time. Timers fire from update(), in
+    order of due time and, for equal times, in the order they were
+    scheduled. A repeating timer keeps its phase: it is due again exactly
+    interval after it was due, and fires once per interval that passed.
+    """
+
+    def __init__(self, clock=None):
+        self.clock = clock if clock is not None else WallClock()
+        # Source time not counted as game time, and when the pause began
+        self.offset = 0
+        self.paused_at = None
+        self._heap = []
+        self._order = itertools.count()
+        self._cancelled = 0
+
+    def get_ticks(self):
+        """Return game time in milliseconds, excluding time spent paused."""
+        if self.paused_at is not None:
+            return self.paused_at - self.offset
+        return self.clock.get_ticks() - self.offset
+
+    @property
+    def paused(self):
+        return self.paused_at is not None
+
+    def pause(self):
+        """Stop game time, and with it every timer."""
+        if self.paused_at is None:
+            self.paused_at = self.clock.get_ticks()
+
+    def resume(self):
+        """Let game time run again from where it stopped."""
+        if self.paused_at is not None:
+            self.offset += self.clock.get_ticks() - self.paused_at
+            self.paused_at = None
+
+    def schedule(self, delay, callback, *args):
+        """Call callback(*args) once, delay milliseconds from now."""
+        return self._push(Timer(self.get_ticks() + delay, None, callback, args))
+
+    def repeat(self, interval, callback, *args, delay=None):
+        """Call callback(*args) every interval milliseconds.
+
+        The first call is after delay, which defaults to interval.
+        """
+        if interval <= 0:
+            raise ValueError("repeat interval must be positive")
+        if delay is None:
+            delay = interval
+        timer = Timer(self.get_ticks() + delay, interval, callback, args)
+        return self._push(timer)
+
+    def _push(self, timer):
+        heapq.heappush(self._heap, (timer.due, next(self._order), timer))
+        return timer
+
+    def cancel(self, timer):
+        """Stop a timer from firing. Cancelling an inactive timer does nothing."""
+        if not timer.active:
+            return
+        timer.active = False
+        self._cancelled += 1
+        heap = self._heap
+        if self._cancelled > COMPACT_MIN and 2 * self._cancelled > len(heap):
+            self._heap = [entry for entry in heap if entry[2].active]
+            heapq.heapify(self._heap)
+            self._cancelled = 0
+
+    def update(self):
+        """Fire every timer that is due. Returns the number of calls made.
+
+        Nothing fires while paused, including after a callback pauses.
+        """
+        now = self.get_ticks()
+        heap = self._heap
+        fired = 0
+        while heap and heap[0][0] <= now and self.paused_at is None:
+            due, _, timer = heapq.heappop(heap)
+            if not timer.active:
+                self._cancelled -= 1
+                continue
+            if timer.interval is None:
+                timer.active = False
+            else:
+                timer.due = due + timer.interval
+                self._push(timer)
+            timer.callback(*timer.args)
+            fired += 1
+        return fired
+
+    def next_due(self):
+        """Return the due time of the next active timer, or None."""
+        heap = self._heap
+        while heap and not heap[0][2].active:
+            heapq.heappop(heap)
+            self._cancelled -= 1
+        return heap[0][0] if heap else None
+
+    def clear(self):
+        """Cancel every pending timer."""
+        for _, _, timer in self._heap:
+            timer.active = False
+        self._heap.clear()
+        self._cancelled = 0
+
+    def __len__(self):
+        """Number of active timers."""
+        return len(self._heap) - self._cancelled
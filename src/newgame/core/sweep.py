@@ -0,0 +1,224 @@
+"""
+Monte Carlo balance sweeps over the food settings.
+
+A sweep plays many simulated games at every point of a parameter grid and
+reports how long the beaver survives. Games run in BatchSimulator chunks,
+driven by a scripted policy that walks to the nearest food, and the chunks
+are fanned out over a process pool. Every chunk draws from its own child
+of one SeedSequence, so the results only depend on the sweep's seed, not on
+the number of workers or the order chunks finish in.
+
+Requires NumPy (``pip install newgame[sim]``).
+"""
+
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+from ..config.settings import DEFAULT_SETTINGS
+from ..config.constants import MOVEMENT_KEYS
+from ..utils.input import MOVEMENT_KEY_ORDER
+from .batch import BatchSimulator
+
+# Balance parameters a sweep can vary, as BatchSimulator keyword arguments
+# (and Settings fields), with their default values
+PARAMETERS = {
+    name: getattr(DEFAULT_SETTINGS, name)
+    for name in (
+        "initial_food",
+        "food_decrease_interval",
+        "food_collection_amount",
+        "food_spawn_interval",
+    )
+}
+
+SWEEP_GAMES = 1000  # Games played per parameter point
+SWEEP_CHUNK = 500  # Games per pool task; bigger chunks vectorize better
+SWEEP_MAX_SECONDS = 1800  # Games still alive after this are cut off
+SWEEP_FOOD_SLOTS = 16  # Food items per game; the policy keeps the screen clear
+
+# Key mask bit for each single-axis direction, e.g. (0, -1) -> bit of K_w
+_DIRECTION_BITS = {}
+for _bit, _key in enumerate(MOVEMENT_KEY_ORDER):
+    _DIRECTION_BITS.setdefault(MOVEMENT_KEYS[_key], 1 << _bit)
+
+
+def seek_food(batch):
+    """Return key masks walking every game's beaver to its nearest food.
+
+    Food never spawns behind the lodge or dam, and nothing but the dam
+    blocks movement on the home screen, so a straight line always gets
+    there. Games without food on screen stand still.
+    """
+    # Offset from a player's top-left corner to where its centre meets a
+    # food item's centre
+    offset = (batch.player_size - batch.food_size) // 2
+    dx = batch.food_x - batch.player_x[:, None] - offset
+    dy = batch.food_y - batch.player_y[:, None] - offset
+    distance = np.where(
+        batch.food_active, np.abs(dx) + np.abs(dy), np.iinfo(np.int32).max
+    )
+    nearest = distance.argmin(axis=1)
+    games = np.arange(batch.num_games)
+    dx = dx[games, nearest]
+    dy = dy[games, nearest]
+
+    masks = (
+        np.where(dx > 0, _DIRECTION_BITS[(1, 0)], 0)
+        | np.where(dx < 0, _DIRECTION_BITS[(-1, 0)], 0)
+        | np.where(dy > 0, _DIRECTION_BITS[(0, 1)], 0)
+        | np.where(dy < 0, _DIRECTION_BITS[(0, -1)], 0)
+    )
+    masks[~batch.food_active.any(axis=1)] = 0
+    return masks.astype(np.uint8)
+
+
+def grid_points(grid, settings=None):
+    """Expand a {parameter: values} grid into a list of parameter dicts.
+
+    Parameters missing from the grid keep their value in settings (default:
+    DEFAULT_SETTINGS). Points are listed in itertools.product order of the
+    grid's values.
+    """
+    settings = settings or DEFAULT_SETTINGS
+    unknown = set(grid) - set(PARAMETERS)
+    if unknown:
+        raise ValueError(f"Unknown sweep parameters: {', '.join(sorted(unknown))}")
+    names = list(PARAMETERS)
+    values = [grid.get(name, (getattr(settings, name),)) for name in names]
+    return [dict(zip(names, point)) for point in itertools.product(*values)]
+
+
+def simulate(
+    params,
+    games,
+    seed=None,
+    max_seconds=SWEEP_MAX_SECONDS,
+    policy=seek_food,
+    settings=None,
+):
+    """Play games with the given balance parameters until all are over.
+
+    Everything else follows settings (default: DEFAULT_SETTINGS). Returns
+    (survival, censored): each game's survival time in seconds, and whether
+    it was still alive when max_seconds ran out.
+    """
+    batch = BatchSimulator(games, SWEEP_FOOD_SLOTS, seed, settings=settings, **params)
+    for _ in range(max_seconds * batch.fps):
+        if not batch.alive.any():
+            break
+        batch.step(policy(batch))
+    return batch.survival_time(), batch.alive.copy()
+
+
+def _run_chunk(point, start, params, games, seed, max_seconds, settings):
+    """Pool task: simulate one chunk of games of a parameter point."""
+    survival, censored = simulate(params, games, seed, max_seconds, settings=settings)
+    return point, start, survival, censored
+
+
+def run_sweep(
+    points,
+    games=SWEEP_GAMES,
+    seed=0,
+    max_seconds=SWEEP_MAX_SECONDS,
+    workers=None,
+    chunk=SWEEP_CHUNK,
+    settings=None,
+):
+    """Play games at every parameter point, yielding chunks as they finish.
+
+    Yields (point, start, survival, censored) tuples, where point indexes
+    points and start is the index of the chunk's first game in the point.
+    workers is the pool size (default: all cores); with workers=1 the games
+    run in this process, which is handy for tests and profiling. Games
+    follow settings apart from the swept parameters.
+    """
+    tasks = [
+        (point, start, params, min(chunk, games - start))
+        for point, params in enumerate(points)
+        for start in range(0, games, chunk)
+    ]
+    seeds = np.random.SeedSequence(seed).spawn(len(tasks))
+
+    if workers == 1:
+        for task, child in zip(tasks, seeds):
+            yield _run_chunk(*task, child, max_seconds, settings)
+        return
+
+    with ProcessPoolExecutor(workers or os.cpu_count()) as pool:
+        futures = [
+            pool.submit(_run_chunk, *task, child, max_seconds, settings)
+            for task, child in zip(tasks, seeds)
+        ]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+class SweepResults:
+    """Survival times collected from run_sweep, per parameter point.
+
+    Chunks can be added in any order; each point's games are kept in the
+    order they were started in, so saved results are reproducible.
+    """
+
+    def __init__(self, points, games=SWEEP_GAMES):
+        self.points = points
+        self.games = games
+        self.chunks = [{} for _ in points]
+
+    def add(self, point, start, survival, censored):
+        """Record a finished chunk. Returns whether the point is complete."""
+        self.chunks[point][start] = (survival, censored)
+        return self.played(point) >= self.games
+
+    def played(self, point):
+        """Return the number of games recorded for a point."""
+        return sum(len(survival) for survival, _ in self.chunks[point].values())
+
+    def games_of(self, point):
+        """Return (survival, censored) arrays of a point's recorded games."""
+        chunks = [self.chunks[point][start] for start in sorted(self.chunks[point])]
+        if not chunks:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=bool)
+        return tuple(np.concatenate(column) for column in zip(*chunks))
+
+    def summary(self, point):
+        """Return survival statistics of a point's games, in seconds."""
+        survival, censored = self.games_of(point)
+        p10, median, p90 = np.percentile(survival, (10, 50, 90))
+        return {
+            "games": len(survival),
+            "mean": float(survival.mean()),
+            "p10": float(p10),
+            "median": float(median),
+            "p90": float(p90),
+            "censored": float(censored.mean()),
+        }
+
+    def columns(self):
+        """Return the results as columns with one row per game.
+
+        Besides ``point``, ``survival`` and ``censored``, every row carries
+        its point's parameters; the spawn interval range is split into
+        ``food_spawn_interval_min`` and ``food_spawn_interval_max``.
+        """
+        games = [self.games_of(point) for point in range(len(self.points))]
+        counts = [len(survival) for survival, _ in games]
+        columns = {
+            "point": np.repeat(np.arange(len(self.points)), counts),
+            "survival": np.concatenate([survival for survival, _ in games]),
+            "censored": np.concatenate([censored for _, censored in games]),
+        }
+        for name in PARAMETERS:
+            values = np.array([params[name] for params in self.points])
+            if name == "food_spawn_interval":
+                columns[name + "_min"] = np.repeat(values[:, 0], counts)
+                columns[name + "_max"] = np.repeat(values[:, 1], counts)
+            else:
+                columns[name] = np.repeat(values, counts)
+        return columns
+
+    def save(self, path):
+        """Write the columns to a compressed .npz file."""
+        np.savez_compressed(path, **self.columns())
@@ -0,0 +1,240 @@
+"""
+World map and screen streaming for the Beaver Survival Game.
+"""
+
+from collections import OrderedDict
+import pygame
+from ..config.settings import DEFAULT_SETTINGS
+from ..entities.objects import Lodge, Dam
+from .ecs import Registry
+from ..entities.food import FoodManager
+from ..systems.background import BackgroundLayer
+
+# Screen-to-screen steps, as (dx, dy) in world coordinates
+NORTH = (0, -1)
+SOUTH = (0, 1)
+WEST = (-1, 0)
+EAST = (1, 0)
+
+# Stand-in collision rect for screens without a lodge or dam
+NO_RECT = pygame.Rect(0, 0, 0, 0)
+
+
+class Screen:
+    """Everything resident for one screen of the world.
+
+    The layout (lodge, dam and water) is fixed by the screen's coordinate,
+    so only the food and its spawn timer make up the screen's state.
+    """
+
+    def __init__(self, coord, clock=None, rng=None, settings=None):
+        self.coord = coord
+        self.settings = settings = settings or DEFAULT_SETTINGS
+
+        # The home screen holds the lodge and the dam along its north border
+        self.entities = Registry()
+        self.lodge = self.dam = None
+        if coord == settings.home_screen_coord:
+            self.lodge = Lodge(*settings.lodge_position, self.entities, settings)
+            self.dam = Dam(self.entities, settings)
+
+        # Static scenery, rendered once and reused every frame
+        water_rect = pygame.Rect(settings.water_rect)
+        objects = [obj for obj in (self.dam, self.lodge) if obj is not None]
+        self.background = BackgroundLayer(objects, water_rect)
+
+        self.food_manager = FoodManager(
+            self.lodge_rect, self.dam_rect, clock=clock, rng=rng, settings=settings
+        )
+
+    @property
+    def lodge_rect(self):
+        """The lodge's collision rect, or an empty rect if there is none."""
+        return self.lodge.get_collision_rect() if self.lodge else NO_RECT
+
+    @property
+    def dam_rect(self):
+        """The dam's collision rect, or an empty rect if there is none."""
+        return self.dam.get_collision_rect() if self.dam else NO_RECT
+
+    def pack(self):
+        """Serialize the screen's mutable state."""
+        return self.food_manager.pack()
+
+    def unpack(self, data):
+        """Restore state produced by pack()."""
+        self.food_manager.unpack(data)
+
+
+class WorldManager:
+    """Streams the screens of the world_size x world_size world.
+
+    Screens are built on first use and kept in an LRU of at most
+    ``max_resident`` fully loaded screens, by default the settings'
+    max_resident_screens. When a screen falls out of the
+    LRU its objects and cached background are dropped and only its packed
+    state is kept in ``archive``, a few bytes per food item, so memory stays
+    flat however much of the world has been visited. Revisiting a screen
+    rebuilds its layout and restores the packed state.
+    """
+
+    def __init__(self, clock=None, rng=None, max_resident=None, settings=None):
+        self.clock = clock
+        self.rng = rng
+        self.settings = settings = settings or DEFAULT_SETTINGS
+        self.width, self.height = settings.screen_size
+        if max_resident is None:
+            max_resident = settings.max_resident_screens
+        self.max_resident = max_resident
+        self.screens = OrderedDict()
+        self.archive = {}
+        # Optional ScreenPrefetcher that builds screens ahead of time
+        self.prefetcher = None
+        self.current = self.load(settings.home_screen_coord)
+
+    def in_bounds(self, coord):
+        """Check whether a coordinate lies inside the world."""
+        x, y = coord
+        size = self.settings.world_size
+        return 0 <= x < size and 0 <= y < size
+
+    def load(self, coord):
+        """Return the screen at coord, loading it if needed."""
+        screen = self.screens.get(coord)
+        if screen is not None:
+            self.screens.move_to_end(coord)
+            return screen
+
+        data = self.archive.pop(coord, None)
+        if self.prefetcher is not None:
+            screen = self.prefetcher.take(coord)
+        if screen is None:
+            screen = Screen(coord, self.clock, self.rng, self.settings)
+            if data is not None:
+                screen.unpack(data)
+        self.screens[coord] = screen
+        self._evict(coord)
+        return screen
+
+    def _evict(self, keep):
+        """Archive least recently used screens beyond the resident limit.
+
+        The current screen and the one at keep are never evicted.
+        """
+        for coord in list(self.screens):
+            if len(self.screens) <= self.max_resident:
+                return
+            if coord == keep or self.screens[coord] is self.current:
+                continue
+            self.archive[coord] = self.screens.pop(coord).pack()
+
+    def neighbor(self, coord, direction):
+        """Return the coordinate next to coord, or None if it can't be entered.
+
+        Screens outside the world are unreachable, and the dam blocks travel
+        across the north border of its screen.
+        """
+        target = (coord[0] + direction[0], coord[1] + direction[1])
+        if not self.in_bounds(target):
+            return None
+        home = self.settings.home_screen_coord
+        if (direction == NORTH and coord == home) or (
+            direction == SOUTH and target == home
+        ):
+            return None
+        return target
+
+    def enter(self, direction):
+        """Move to the neighbouring screen. Returns it, or None if blocked."""
+        target = self.neighbor(self.current.coord, direction)
+        if target is None:
+            return None
+        self.current = self.load(target)
+        # The screen just left may now be evicted
+        self._evict(target)
+        return self.current
+
+    def exit_direction(self, rect, velocity):
+        """Return the direction in which a rect pushes off the screen, if any.
+
+        velocity is the movement requested by the last update. Movement that
+        would leave the screen is undone rather than clamped, so a rect can
+        stop a few pixels short of an edge; it exits once its next step
+        would cross it.
+        """
+        vx, vy = velocity
+        if vx < 0 and rect.left + vx < 0:
+            return WEST
+        if vx > 0 and rect.right + vx > self.width:
+            return EAST
+        if vy < 0 and rect.top + vy < 0:
+            return NORTH
+        if vy > 0 and rect.bottom + vy > self.height:
+            return SOUTH
+        return None
+
+    def exit_directions(self, rect):
+        """Return the directions of every screen edge rect extends past."""
+        directions = []
+        if rect.left < 0:
+            directions.append(WEST)
+        if rect.right > self.width:
+            directions.append(EAST)
+        if rect.top < 0:
+            directions.append(NORTH)
+        if rect.bottom > self.height:
+            directions.append(SOUTH)
+        return directions
+
+    def nearby_directions(self, rect, margin=None):
+        """Return the directions of the screen edges within margin of rect.
+
+        margin defaults to the settings' screen_preload_margin.
+        """
+        if margin is None:
+            margin = self.settings.screen_preload_margin
+        return self.exit_directions(rect.inflate(2 * margin, 2 * margin))
+
+    def preload_near(self, rect, target=None):
+        """Load the neighbouring screens whose edge rect is close to.
+
+        When target is given, their backgrounds are also rendered in its
+        pixel format so crossing over costs no rasterization.
+        """
+        for direction in self.nearby_directions(rect):
+            coord = self.neighbor(self.current.coord, direction)
+            if coord is None:
+                continue
+            screen = self.load(coord)
+            if target is not None:
+                screen.background.get_surface(target)
+        # Loading neighbours must not push the current screen to the LRU end
+        self.screens.move_to_end(self.current.coord)
+
+    def reset(self):
+        """Forget every visited screen and start over at home."""
+        self.restore(self.settings.home_screen_coord, {})
+
+    def restore(self, coord, archive):
+        """Replace the world with archived screens and make coord current."""
+        if self.prefetcher is not None:
+            self.prefetcher.cancel()
+        self.screens.clear()
+        self.archive = dict(archive)
+        self.current = None
+        self.current = self.load(coord)
+
+
+def enter_position(rect, direction, size):
+    """Place rect on the edge opposite to the one it left through.
+
+    size is the (width, height) of the screen being entered.
+    """
+    if direction == WEST:
+        rect.right = size[0]
+    elif direction == EAST:
+        rect.left = 0
+    elif direction == NORTH:
+        rect.bottom = size[1]
+    elif direction == SOUTH:
+        rect.top = 0
@@ -4,95 +4,363 @@ Food system for the Beaver Survival Game.
 
 import pygame
 import random
-from ..config.settings import (
-    FOOD_SIZE,
-    FOOD_SPAWN_INTERVAL,
-    SCREEN_WIDTH,
-    SCREEN_HEIGHT,
-    DAM_HEIGHT,
-)
-from ..config.constants import COLORS
+import struct
+from array import array
+from ..config.settings import FOOD_SIZE, DEFAULT_SETTINGS
+from ..config.constants import COLORS, FOOD_TYPES
+from ..core.clock import WallClock
+from ..systems.sprites import atlas
+from ..utils.free_space import FreeSpaceSampler
+from ..utils.spatial import SpatialHashGrid
+
+
+def food_color(food_type):
+    """Return the fill color for a food type."""
+    return COLORS["RED"] if food_type == "berry" else COLORS["DARK_GREEN"]
+
+
+def _draw_food_sprite(food_type):
+    """Return an atlas draw function for a food type."""
+
+    def draw(surface, rect):
+        pygame.draw.ellipse(surface, food_color(food_type), rect)
+        # Add a small highlight
+        highlight_rect = pygame.Rect(rect.x + 1, rect.y + 1, rect.w - 2, rect.h - 2)
+        pygame.draw.ellipse(surface, COLORS["WHITE"], highlight_rect, 1)
+
+    return draw
+
+
+for _food_type in FOOD_TYPES:
+    atlas.register(_food_type, (FOOD_SIZE, FOOD_SIZE), _draw_food_sprite(_food_type))
+
+
+def food_sprite(food_type, size):
+    """Return the atlas name of a food type's sprite for a food size.
+
+    Sprites for sizes other than the default are registered on first use.
+    """
+    if size == FOOD_SIZE:
+        return food_type
+    name = f"{food_type}_{size}"
+    if name not in atlas.sprites:
+        atlas.register(name, (size, size), _draw_food_sprite(food_type))
+    return name
+
+
+def food_sprites(size):
+    """Return the atlas names of every food type's sprite for a food size.
+
+    Registering sprites changes the shared atlas, so code that builds food
+    managers off the main thread calls this on the main thread first.
+    """
+    return [food_sprite(name, size) for name in FOOD_TYPES]
+
+
+# Type code stored in FoodManager.food_type for an empty slot
+FREE_SLOT = -1
+
+# Header of FoodManager.pack(): last spawn time, spawn interval, item count
+_PACK_HEADER = struct.Struct("<qiI")
+
+
+def shift_packed_time(data, delta):
+    """Return FoodManager.pack() data with its spawn timer moved by delta ms."""
+    last_spawn_time, spawn_interval, count = _PACK_HEADER.unpack_from(data)
+    header = _PACK_HEADER.pack(last_spawn_time + delta, spawn_interval, count)
+    return header + data[_PACK_HEADER.size :]
 
 
 class FoodItem:
-    """A collectible food item."""
+    """A collectible food item.
+
+    FoodManager stores its items in compact arrays; FoodItem objects are
+    created on demand as snapshots of a slot (see FoodManager.get_item).
+    """
 
-    def __init__(self, x, y, food_type="berry"):
-        self.rect = pygame.Rect(x, y, FOOD_SIZE, FOOD_SIZE)
+    def __init__(self, x, y, food_type="berry", slot=None, size=FOOD_SIZE):
+        self.rect = pygame.Rect(x, y, size, size)
         self.food_type = food_type
-        self.color = COLORS["RED"] if food_type == "berry" else COLORS["DARK_GREEN"]
+        self.color = food_color(food_type)
+        self.slot = slot
+
+    def __eq__(self, other):
+        if not isinstance(other, FoodItem):
+            return NotImplemented
+        return self.rect == other.rect and self.food_type == other.food_type
 
     def draw(self, screen):
         """Draw the food item."""
-        pygame.draw.ellipse(screen, self.color, self.rect)
-        # Add a small highlight
-        highlight_rect = pygame.Rect(
-            self.rect.x + 1, self.rect.y + 1, FOOD_SIZE - 2, FOOD_SIZE - 2
-        )
-        pygame.draw.ellipse(screen, COLORS["WHITE"], highlight_rect, 1)
+        atlas.blit(screen, food_sprite(self.food_type, self.rect.w), self.rect)
 
     def get_collision_rect(self):
         """Get the collision rectangle."""
         return self.rect
 
 
+class FoodItemsView:
+    """Read-only view of a FoodManager's items as FoodItem snapshots."""
+
+    def __init__(self, manager):
+        self._manager = manager
+
+    def __len__(self):
+        return self._manager.count
+
+    def __iter__(self):
+        manager = self._manager
+        for slot in manager.live_slots():
+            yield manager.get_item(slot)
+
+
 class FoodManager:
-    """Manages food item spawning and collection."""
+    """Manages food item spawning and collection.
 
-    def __init__(self, lodge_rect, dam_rect):
-        self.food_items = []
+    Items live in struct-of-arrays storage: ``food_x``, ``food_y`` and
+    ``food_type`` (an index into FOOD_TYPES, or FREE_SLOT) are typed arrays
+    indexed by slot, and freed slots are recycled through ``free_slots``.
+    The spatial grid indexes slot numbers, so spawning and collecting
+    create no per-item objects.
+    """
+
+    def __init__(self, lodge_rect, dam_rect, clock=None, rng=None, settings=None):
+        self.settings = settings = settings or DEFAULT_SETTINGS
+        self.food_size = settings.food_size
+        self.sprites = food_sprites(self.food_size)
+        self.food_x = array("h")
+        self.food_y = array("h")
+        self.food_type = array("b")
+        self.free_slots = []
+        self.count = 0
+        # Bumped on every change to the items or spawn timer
+        self.revision = 0
+        # Spatial index over occupied slots; kept in sync by _store/_release
+        self.food_grid = SpatialHashGrid(settings.food_grid_cell_size, self.food_size)
+        self._hit_test = self._slot_collides
+        # Optional callback receiving the rect of every food item that
+        # appears or disappears, used by the dirty-rect renderer
+        self.on_change = None
         self.lodge_rect = lodge_rect
         self.dam_rect = dam_rect
-        self.last_spawn_time = pygame.time.get_ticks()
-        self.spawn_interval = random.randint(*FOOD_SPAWN_INTERVAL)
+        # Spawn positions clear of the lodge and dam; items are occupants,
+        # which exclude their grid cells without touching the free rects
+        self.free_space = FreeSpaceSampler(
+            settings.spawn_bounds, self.food_size, (lodge_rect, dam_rect)
+        )
+        # Spawns that found no free cell and were retried on a later update
+        self.failed_spawns = 0
+        # Fall back to real time and the global random module so standalone
+        # use behaves as before; the game injects its own clock and RNG.
+        self.clock = clock if clock is not None else WallClock()
+        self.rng = rng if rng is not None else random
+        self.last_spawn_time = self.clock.get_ticks()
+        self.spawn_interval = self.rng.randint(*settings.food_spawn_interval)
+
+    @property
+    def food_items(self):
+        """All food items on screen, as a sized iterable of FoodItems."""
+        return FoodItemsView(self)
 
     def update(self):
         """Update food spawning."""
-        current_time = pygame.time.get_ticks()
+        current_time = self.clock.get_ticks()
         if current_time - self.last_spawn_time >= self.spawn_interval:
-            self._spawn_food()
+            if not self._spawn_food():
+                # The screen is full; keep the spawn due until there is room
+                self.failed_spawns += 1
+                return
             self.last_spawn_time = current_time
-            self.spawn_interval = random.randint(*FOOD_SPAWN_INTERVAL)
+            self.spawn_interval = self.rng.randint(*self.settings.food_spawn_interval)
+            self.revision += 1
 
     def _spawn_food(self):
-        """Spawn a new food item in a valid location."""
-        max_attempts = 50
-        for _ in range(max_attempts):
-            x = random.randint(FOOD_SIZE, SCREEN_WIDTH - FOOD_SIZE)
-            y = random.randint(DAM_HEIGHT + FOOD_SIZE, SCREEN_HEIGHT - FOOD_SIZE)
+        """Spawn a new food item in a valid location.
+
+        Positions are drawn uniformly from the space clear of the lodge and
+        dam, in grid cells no food item could overlap. Returns False if no
+        such cell is left.
+        """
+        position = self.free_space.sample_unoccupied(self.rng)
+        if position is None:
+            return False
+
+        # Randomly choose food type
+        food_type = self.rng.choice(FOOD_TYPES)
+        self._store(*position, FOOD_TYPES.index(food_type))
+        return True
 
-            # Create temporary rect to check collision
-            temp_rect = pygame.Rect(x, y, FOOD_SIZE, FOOD_SIZE)
+    def set_obstacles(self, lodge_rect, dam_rect):
+        """Move the lodge and dam, updating the free spawn positions."""
+        self.free_space.remove_obstacle(self.lodge_rect)
+        self.free_space.remove_obstacle(self.dam_rect)
+        self.lodge_rect = lodge_rect
+        self.dam_rect = dam_rect
+        self.free_space.add_obstacle(lodge_rect)
+        self.free_space.add_obstacle(dam_rect)
 
-            # Check if position is valid (not overlapping lodge or dam)
-            if not temp_rect.colliderect(self.lodge_rect) and not temp_rect.colliderect(
-                self.dam_rect
-            ):
+    def _store(self, x, y, type_code):
+        """Put an item into a free slot (or a new one) and return the slot."""
+        if self.free_slots:
+            slot = self.free_slots.pop()
+            self.food_x[slot] = x
+            self.food_y[slot] = y
+            self.food_type[slot] = type_code
+        else:
+            slot = len(self.food_type)
+            self.food_x.append(x)
+            self.food_y.append(y)
+            self.food_type.append(type_code)
+        self.count += 1
+        self.revision += 1
+        self.food_grid.insert(slot, x, y)
+        size = self.food_size
+        self.free_space.add_occupant((x, y, size, size))
+        if self.on_change is not None:
+            self.on_change((x, y, size, size))
+        return slot
 
-                # Randomly choose food type
-                food_type = random.choice(["berry", "leaf"])
-                self.food_items.append(FoodItem(x, y, food_type))
-                break
+    def _release(self, slot):
+        """Free an occupied slot for reuse."""
+        x = self.food_x[slot]
+        y = self.food_y[slot]
+        self.food_grid.remove(slot, x, y)
+        size = self.food_size
+        self.free_space.remove_occupant((x, y, size, size))
+        self.food_type[slot] = FREE_SLOT
+        self.free_slots.append(slot)
+        self.count -= 1
+        self.revision += 1
+        if self.on_change is not None:
+            self.on_change((x, y, size, size))
 
-    def check_collection(self, player_rect):
-        """Check if player collected any food items and return collected items."""
-        collected = []
-        remaining = []
+    def _slot_collides(self, slot, rect):
+        """Hit test of a slot against a rect, used for spatial grid queries."""
+        x = self.food_x[slot]
+        y = self.food_y[slot]
+        size = self.food_size
+        return (
+            x < rect.right
+            and rect.left < x + size
+            and y < rect.bottom
+            and rect.top < y + size
+        )
+
+    def live_slots(self):
+        """Yield the slot numbers of all food items on screen."""
+        types = self.food_type
+        for slot in range(len(types)):
+            if types[slot] != FREE_SLOT:
+                yield slot
+
+    def get_item(self, slot):
+        """Return a FoodItem snapshot of an occupied slot."""
+        return FoodItem(
+            self.food_x[slot],
+            self.food_y[slot],
+            FOOD_TYPES[self.food_type[slot]],
+            slot,
+            self.food_size,
+        )
 
-        for food in self.food_items:
-            if player_rect.colliderect(food.get_collision_rect()):
-                collected.append(food)
-            else:
-                remaining.append(food)
+    def add_food(self, x, y, food_type="berry"):
+        """Place a food item at (x, y) and return it."""
+        return self.get_item(self._store(x, y, FOOD_TYPES.index(food_type)))
 
-        self.food_items = remaining
-        return collected
+    def remove_food(self, food):
+        """Remove a food item previously returned by this manager."""
+        slot = food.slot
+        if (
+            slot is None
+            or slot >= len(self.food_type)
+            or self.food_type[slot] == FREE_SLOT
+            or self.get_item(slot) != food
+        ):
+            raise ValueError("food item is not on screen")
+        self._release(slot)
+
+    def collect(self, player_rect):
+        """Remove all food touching the player and return how many there were.
+
+        Only food in grid cells near the player is tested.
+        """
+        collected = 0
+        grid = self.food_grid
+        while True:
+            slot = grid.first_colliding(player_rect, self._hit_test)
+            if slot is None:
+                return collected
+            self._release(slot)
+            collected += 1
+
+    def check_collection(self, player_rect):
+        """Check if player collected any food items and return collected items.
+
+        Returns an empty tuple when nothing was collected.
+        """
+        collected = self.food_grid.colliding(player_rect, self._hit_test)
+        if not collected:
+            return ()
+        items = [self.get_item(slot) for slot in collected]
+        for slot in collected:
+            self._release(slot)
+        return items
 
     def draw(self, screen):
         """Draw all food items."""
-        for food in self.food_items:
-            food.draw(screen)
+        self._draw_batch(screen, self.live_slots())
+
+    def draw_area(self, screen, area):
+        """Draw only the food items overlapping the given rect."""
+        self._draw_batch(screen, self.food_grid.colliding(area, self._hit_test))
+
+    def _draw_batch(self, screen, slots):
+        """Blit food sprites from the atlas in a single Surface.blits() call."""
+        sheet = atlas.surface
+        regions = [atlas.regions[name] for name in self.sprites]
+        xs, ys, types = self.food_x, self.food_y, self.food_type
+        screen.blits(
+            [(sheet, (xs[slot], ys[slot]), regions[types[slot]]) for slot in slots],
+            doreturn=False,
+        )
+
+    def pack(self):
+        """Serialize the spawn timer and live items into compact bytes.
+
+        Free slots are dropped, so the result holds 5 bytes per item plus a
+        small header.
+        """
+        slots = list(self.live_slots())
+        xs = array("h", (self.food_x[slot] for slot in slots))
+        ys = array("h", (self.food_y[slot] for slot in slots))
+        types = array("b", (self.food_type[slot] for slot in slots))
+        header = _PACK_HEADER.pack(
+            self.last_spawn_time, self.spawn_interval, len(slots)
+        )
+        return header + xs.tobytes() + ys.tobytes() + types.tobytes()
+
+    def unpack(self, data):
+        """Replace all food and the spawn timer with the contents of pack()."""
+        self.clear()
+        self.last_spawn_time, self.spawn_interval, count = _PACK_HEADER.unpack_from(
+            data
+        )
+        self.revision += 1
+        offset = _PACK_HEADER.size
+        xs = array("h", data[offset : offset + 2 * count])
+        offset += 2 * count
+        ys = array("h", data[offset : offset + 2 * count])
+        offset += 2 * count
+        types = array("b", data[offset : offset + count])
+        for x, y, type_code in zip(xs, ys, types):
+            self._store(x, y, type_code)
 
     def clear(self):
         """Clear all food items."""
-        self.food_items.clear()
+        del self.food_x[:]
+        del self.food_y[:]
+        del self.food_type[:]
+        self.free_slots.clear()
+        self.count = 0
+        self.revision += 1
+        self.food_grid.clear()
+        self.free_space.clear_occupants()
@@ -3,20 +3,40 @@ Game objects for the Beaver Survival Game (Lodge, Dam).
 """
 
 import pygame
-from ..config.settings import (
-    LODGE_WIDTH,
-    LODGE_HEIGHT,
-    DAM_HEIGHT,
-    SCREEN_WIDTH,
-)
+from ..config.settings import DEFAULT_SETTINGS
 from ..config.constants import COLORS
+from ..core.ecs import Registry
 
 
-class Lodge:
+class _StaticObject:
+    """Facade over a fixed entity with a position and body in a Registry."""
+
+    def __init__(self, rect, registry, tag):
+        self.registry = registry if registry is not None else Registry()
+        x, y, w, h = rect
+        self.entity = self.registry.create(
+            position={"x": x, "y": y, "prev_x": x, "prev_y": y},
+            body={"w": w, "h": h},
+            **{tag: {}},
+        )
+
+    @property
+    def rect(self):
+        """The object's rect, built from its components."""
+        return self.registry.rect(self.entity)
+
+    def get_collision_rect(self):
+        """Get the collision rectangle."""
+        return self.rect
+
+
+class Lodge(_StaticObject):
     """The beaver's lodge - a safe zone."""
 
-    def __init__(self, x, y):
-        self.rect = pygame.Rect(x, y, LODGE_WIDTH, LODGE_HEIGHT)
+    def __init__(self, x, y, registry=None, settings=None):
+        settings = settings or DEFAULT_SETTINGS
+        rect = (x, y, settings.lodge_width, settings.lodge_height)
+        super().__init__(rect, registry, "lodge")
         self.color = COLORS["GRAY"]
 
     def draw(self, screen):
@@ -25,28 +45,22 @@ class Lodge:
         # Add a simple outline
         pygame.draw.rect(screen, COLORS["BLACK"], self.rect, 2)
 
-    def get_collision_rect(self):
-        """Get the collision rectangle."""
-        return self.rect
-
 
-class Dam:
+class Dam(_StaticObject):
     """The dam along the north border - blocks access to the north."""
 
-    def __init__(self):
-        self.rect = pygame.Rect(0, 0, SCREEN_WIDTH, DAM_HEIGHT)
+    def __init__(self, registry=None, settings=None):
+        settings = settings or DEFAULT_SETTINGS
+        super().__init__(settings.dam_rect, registry, "blocker")
         self.color = COLORS["BLUE"]
 
     def draw(self, screen):
         """Draw the dam."""
         pygame.draw.rect(screen, self.color, self.rect)
         # Add gray accent to make it look more like a dam
+        rect = self.rect
         pygame.draw.rect(
             screen,
             COLORS["GRAY"],
-            pygame.Rect(0, DAM_HEIGHT // 2, SCREEN_WIDTH, DAM_HEIGHT // 2),
+            pygame.Rect(rect.x, rect.y + rect.h // 2, rect.w, rect.h // 2),
         )
-
-    def get_collision_rect(self):
-        """Get the collision rectangle."""
-        return self.rect
@@ -3,36 +3,138 @@ Player (beaver) character for the Beaver Survival Game.
 """
 
 import pygame
-from ..config.settings import (
-    PLAYER_SIZE,
-    PLAYER_SPEED,
-    PLAYER_SPEED_LAND,
-    SCREEN_WIDTH,
-    SCREEN_HEIGHT,
-)
+from ..config.settings import PLAYER_SIZE, DEFAULT_SETTINGS
 from ..config.constants import (
     COLORS,
     MOVEMENT_KEYS,
-    ZONE_LODGE,
+    ZONE_TYPES,
     ZONE_WATER,
     ZONE_LAND,
 )
+from ..core.ecs import LAND, Registry, move, update_zones
+from ..systems.sprites import atlas
 
 
-class Player:
-    """The beaver player character."""
+def _draw_beaver_sprite(in_water):
+    """Return an atlas draw function for the beaver."""
 
-    def __init__(self, x, y):
-        self.rect = pygame.Rect(x, y, PLAYER_SIZE, PLAYER_SIZE)
-        self.current_zone = ZONE_LAND
+    def draw(surface, rect):
+        # Draw the beaver as a brown rectangle
+        pygame.draw.rect(surface, COLORS["BROWN"], rect)
+
+        # If in water, show head above water (lighter brown circle)
+        if in_water:
+            head_rect = pygame.Rect(rect.centerx - 6, rect.centery - 6, 12, 12)
+            pygame.draw.ellipse(surface, COLORS["BROWN"], head_rect)
+
+    return draw
+
+
+atlas.register("beaver", (PLAYER_SIZE, PLAYER_SIZE), _draw_beaver_sprite(False))
+atlas.register("beaver_water", (PLAYER_SIZE, PLAYER_SIZE), _draw_beaver_sprite(True))
+
+
+def beaver_sprite(size, in_water=False):
+    """Return the atlas name of the beaver sprite for a player size.
+
+    Sprites for sizes other than the default are registered on first use.
+    """
+    name = "beaver_water" if in_water else "beaver"
+    if size != PLAYER_SIZE:
+        name = f"{name}_{size}"
+        if name not in atlas.sprites:
+            atlas.register(name, (size, size), _draw_beaver_sprite(in_water))
+    return name
+
+
+class Player:
+    """The beaver player character.
+
+    A facade over one entity of an ecs.Registry: position, zone and
+    velocity live in the registry's component arrays, and update() runs the
+    same movement and zone systems that move entities in bulk. Players
+    sharing a registry can also be updated together with ecs.move().
+    """
+
+    def __init__(self, x, y, registry=None, settings=None):
+        self.settings = settings = settings or DEFAULT_SETTINGS
+        self.size = size = settings.player_size
+        self.sprites = (beaver_sprite(size), beaver_sprite(size, in_water=True))
+        self.registry = registry if registry is not None else Registry()
+        # Sprite component indices of the land and water sprites
+        self.sprite_codes = tuple(map(self.registry.sprite_code, self.sprites))
+        self.entity = self.registry.create(
+            position={"x": x, "y": y, "prev_x": x, "prev_y": y},
+            body={"w": size, "h": size},
+            heading={},
+            velocity={},
+            speed={"land": settings.player_speed_land, "water": settings.player_speed},
+            zone={"code": LAND},
+            sprite={"index": self.sprite_codes[0]},
+            collector={},
+        )
         self.color = COLORS["BROWN"]
+        # Fraction of a step drawn between the previous and current position
+        self.alpha = 1.0
+
+    @property
+    def rect(self):
+        """The player's rect. A copy: assign to the property to move it."""
+        return self.registry.rect(self.entity)
+
+    @rect.setter
+    def rect(self, rect):
+        position = self.registry["position"]
+        position["x"][self.entity] = rect[0]
+        position["y"][self.entity] = rect[1]
+
+    @property
+    def previous_rect(self):
+        """The player's rect before the last update."""
+        position = self.registry["position"]
+        return pygame.Rect(
+            position["prev_x"][self.entity],
+            position["prev_y"][self.entity],
+            self.size,
+            self.size,
+        )
+
+    @property
+    def current_zone(self):
+        return ZONE_TYPES[self.registry["zone"]["code"][self.entity]]
+
+    @current_zone.setter
+    def current_zone(self, zone):
+        self.registry["zone"]["code"][self.entity] = ZONE_TYPES.index(zone)
+        self._update_sprite()
+
+    def _update_sprite(self):
+        """Point the sprite component at the sprite for the current zone."""
+        in_water = self.current_zone == ZONE_WATER
+        self.registry["sprite"]["index"][self.entity] = self.sprite_codes[in_water]
+
+    @property
+    def velocity(self):
+        """Requested movement of the last update, before collisions."""
+        velocity = self.registry["velocity"]
+        return (velocity["dx"][self.entity], velocity["dy"][self.entity])
+
+    @velocity.setter
+    def velocity(self, value):
+        velocity = self.registry["velocity"]
+        velocity["dx"][self.entity], velocity["dy"][self.entity] = value
 
     def update(self, keys_pressed, lodge_rect, dam_rect):
         """Update player position based on input and collisions."""
+        entity = self.entity
+        position = self.registry["position"]
+        position["prev_x"][entity] = position["x"][entity]
+        position["prev_y"][entity] = position["y"][entity]
         if not any(keys_pressed.values()):
+            self.velocity = (0, 0)
             return
 
-        # Calculate movement
+        # Calculate heading
         dx, dy = 0, 0
         for key, (key_dx, key_dy) in MOVEMENT_KEYS.items():
             if keys_pressed.get(key, False):
@@ -41,52 +143,58 @@ class Player:
 
         # Normalize diagonal movement
         if dx != 0 and dy != 0:
-            dx *= 0.707  # Approximately 1/sqrt(2)
-            dy *= 0.707
-
-        # Apply speed based on current zone
-        speed = PLAYER_SPEED_LAND if self.current_zone == ZONE_LAND else PLAYER_SPEED
-        dx *= speed
-        dy *= speed
-
-        # Store old position for collision detection
-        old_x, old_y = self.rect.x, self.rect.y
-
-        # Move horizontally
-        self.rect.x += dx
-        # Check horizontal collisions
-        if (
-            self.rect.left < 0
-            or self.rect.right > SCREEN_WIDTH
-            or self._check_dam_collision(dam_rect)
-        ):
-            self.rect.x = old_x
-
-        # Move vertically
-        self.rect.y += dy
-        # Check vertical collisions
-        if (
-            self.rect.top < 0
-            or self.rect.bottom > SCREEN_HEIGHT
-            or self._check_dam_collision(dam_rect)
-        ):
-            self.rect.y = old_y
-
-        # Update current zone
-        self._update_zone(lodge_rect)
-
-    def _check_dam_collision(self, dam_rect):
-        """Check if player collides with the dam."""
-        return self.rect.colliderect(dam_rect)
-
-    def _update_zone(self, lodge_rect):
-        """Update the current zone based on player position."""
-        if self.rect.colliderect(lodge_rect):
-            self.current_zone = ZONE_LODGE
-        elif self.rect.centery < 100:  # Upper part of screen is water
-            self.current_zone = ZONE_WATER
-        else:
-            self.current_zone = ZONE_LAND
+            dx *= self.settings.diagonal_factor
+            dy *= self.settings.diagonal_factor
+
+        heading = self.registry["heading"]
+        heading["x"][entity] = dx
+        heading["y"][entity] = dy
+
+        # Move at the current zone's speed, then update the zone
+        entities = (entity,)
+        settings = self.settings
+        move(self.registry, entities, (dam_rect,), settings.screen_size)
+        update_zones(self.registry, entities, (lodge_rect,), settings.water_depth)
+        self._update_sprite()
+
+    def predicted_rect(self, ticks):
+        """Return where the player would be after moving for ticks updates.
+
+        Extrapolates the last velocity and ignores collisions and borders.
+        """
+        dx, dy = self.velocity
+        return self.rect.move(round(dx * ticks), round(dy * ticks))
+
+    def interpolate(self, alpha):
+        """Draw the player alpha of the way from the previous position.
+
+        alpha is the fraction of a simulation step that has passed since the
+        last update, so rendering trails the simulation by at most one step
+        and moves smoothly at any frame rate. Returns draw_rect.
+        """
+        self.alpha = alpha
+        return self.draw_rect
+
+    @property
+    def draw_rect(self):
+        """Where the player is drawn, given the last interpolate() alpha."""
+        position = self.registry["position"]
+        entity = self.entity
+        x = position["x"][entity]
+        y = position["y"][entity]
+        alpha = self.alpha
+        if alpha < 1:
+            prev_x = position["prev_x"][entity]
+            prev_y = position["prev_y"][entity]
+            x = prev_x + round((x - prev_x) * alpha)
+            y = prev_y + round((y - prev_y) * alpha)
+        return pygame.Rect(x, y, self.size, self.size)
+
+    def reset_interpolation(self):
+        """Draw the current position from now on, e.g. after a teleport."""
+        position = self.registry["position"]
+        position["prev_x"][self.entity] = position["x"][self.entity]
+        position["prev_y"][self.entity] = position["y"][self.entity]
 
     def bite(self):
         """Perform bite action (basic implementation)."""
@@ -95,15 +203,8 @@ class Player:
 
     def draw(self, screen):
         """Draw the player on the screen."""
-        # Draw the beaver as a brown rectangle
-        pygame.draw.rect(screen, self.color, self.rect)
-
-        # If in water, show head above water (lighter brown circle)
-        if self.current_zone == ZONE_WATER:
-            head_rect = pygame.Rect(
-                self.rect.centerx - 6, self.rect.centery - 6, 12, 12
-            )
-            pygame.draw.ellipse(screen, COLORS["BROWN"], head_rect)
+        sprite = self.sprites[self.current_zone == ZONE_WATER]
+        atlas.blit(screen, sprite, self.draw_rect)
 
     def get_collision_rect(self):
         """Get the collision rectangle for the player."""
@@ -111,6 +212,7 @@ class Player:
 
     def reset_position(self, x, y):
         """Reset player to a new position."""
-        self.rect.x = x
-        self.rect.y = y
+        self.rect = (x, y)
         self.current_zone = ZONE_LAND
+        self.velocity = (0, 0)
+        self.reset_interpolation()
@@ -2,15 +2,261 @@
 Entry point for the Beaver Survival Game.
 """
 
+import argparse
+import os
+import random
 import sys
-from .core.game import BeaverSurvivalGame
+import time
+from .config.settings import Settings
 
+# pygame and the game modules are imported by the functions that use them,
+# so argument errors and --help come back without loading either
 
-def main():
-    """Entry point for the game."""
+
+def parse_args(argv=None):
+    """Parse command-line arguments.
+
+    Defaults come from the settings file and environment, read by
+    Settings.load(). The loaded settings, with the options that override
+    them applied, are returned as ``game_settings``.
+    """
+    # The settings file has to be known before the other defaults
+    preparser = argparse.ArgumentParser(add_help=False)
+    preparser.add_argument("--settings")
+    path = preparser.parse_known_args(argv)[0].settings
+
+    parser = argparse.ArgumentParser(
+        prog="newgame", description="A 2D top-down beaver survival game."
+    )
+    try:
+        settings = Settings.load(path)
+    except (OSError, ValueError, ImportError) as e:
+        parser.error(f"cannot load settings: {e}")
+    parser.add_argument(
+        "--headless",
+        action="store_true",
+        help="run the simulation without a window at maximum speed",
+    )
+    parser.add_argument(
+        "--ticks",
+        type=int,
+        default=settings.fps * 60,
+        help="number of fixed timesteps to simulate in headless mode",
+    )
+    parser.add_argument("--seed", type=int, default=None, help="random seed")
+    parser.add_argument(
+        "--settings",
+        metavar="PATH",
+        help="TOML file overriding game settings; NEWGAME_<SETTING> "
+        "environment variables override both",
+    )
+    parser.add_argument(
+        "--dirty-rects",
+        action="store_true",
+        help="only redraw the parts of the screen that changed",
+    )
+    parser.add_argument(
+        "--max-fps",
+        type=int,
+        default=settings.max_render_fps,
+        help="cap on rendered frames per second, 0 for none "
+        "(default: %(default)s); game speed does not depend on it",
+    )
+    parser.add_argument(
+        "--frame-skip",
+        type=int,
+        default=settings.max_frame_skip,
+        help="frames that may be dropped to keep game speed under load, "
+        "0 to always render (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--autopilot",
+        action="store_true",
+        help="let a bot play the beaver, walking to the nearest food",
+    )
+    parser.add_argument(
+        "--world",
+        action="store_true",
+        help="explore the 9x9 world instead of only the home screen",
+    )
+    parser.add_argument(
+        "--record",
+        metavar="PATH",
+        help="record the game's input to a replay file",
+    )
+    parser.add_argument(
+        "--save",
+        metavar="PATH",
+        help="resume from this save file if it exists, and autosave to it",
+    )
+    parser.add_argument(
+        "--trace",
+        metavar="PATH",
+        help="profile every frame and write a Chrome trace-event JSON file",
+    )
+    parser.add_argument(
+        "--replay",
+        metavar="PATH",
+        help="re-simulate a recorded replay headlessly and print a summary",
+    )
+    parser.add_argument(
+        "--render-ticks",
+        type=lambda value: [int(tick) for tick in value.split(",")],
+        default=[],
+        metavar="T1,T2,...",
+        help="with --replay, save screenshots of these ticks",
+    )
+    parser.add_argument(
+        "--render-dir",
+        default=".",
+        help="directory for --render-ticks screenshots",
+    )
+    args = parser.parse_args(argv)
+    if args.record and args.save:
+        # A replay re-simulates from its seed, so it cannot start from a save
+        parser.error("--record cannot be combined with --save")
+    args.game_settings = settings.replace(
+        max_render_fps=args.max_fps, max_frame_skip=args.frame_skip
+    )
+    return args
+
+
+def run_headless(ticks, seed=None, trace=None, autopilot=False, settings=None):
+    """Run a headless simulation and print a summary of the outcome."""
+    from .core.game import BeaverSurvivalGame
+    from .systems.navigation import Autopilot
+
+    game = BeaverSurvivalGame(
+        headless=True,
+        seed=seed,
+        autopilot=Autopilot() if autopilot else None,
+        settings=settings,
+    )
+    if trace:
+        game.profiler.start(tracing=True)
+
+    start = time.perf_counter()
+    simulated = game.run_headless(ticks)
+    elapsed = time.perf_counter() - start
+
+    game_seconds = game.game_clock.get_ticks() / 1000
+    print(f"Simulated {simulated} ticks ({game_seconds:.1f}s game time)")
+    print(f"  state: {game.game_state.current_state}")
+    print(f"  food: {game.food_amount}")
+    print(f"  food items on screen: {len(game.food_manager.food_items)}")
+    print(f"  survival time: {game.game_state.get_survival_time()}s")
+    if elapsed > 0:
+        print(f"  wall time: {elapsed:.3f}s ({game_seconds / elapsed:.0f}x real time)")
+    if trace:
+        game.profiler.export_chrome_trace(trace)
+        print(f"  trace: {trace}")
+    return game
+
+
+def run_replay(path, render_ticks=(), render_dir=".", settings=None):
+    """Fast-forward through a replay, saving screenshots at chosen ticks."""
+    import pygame
+    from .core.replay import Replay, ReplayPlayer
+
+    player = ReplayPlayer(Replay.load(path), settings)
+    start = time.perf_counter()
+    for tick, surface in player.frames(render_ticks):
+        filename = os.path.join(render_dir, f"replay_{tick:07d}.png")
+        pygame.image.save(surface, filename)
+        print(f"Saved tick {tick} to {filename}")
+    game = player.run()
+    elapsed = time.perf_counter() - start
+    player.close()
+
+    print(f"Replayed {player.tick} ticks in {elapsed:.3f}s")
+    print(f"  state: {game.game_state.current_state}")
+    print(f"  food: {game.food_amount}")
+    print(f"  survival time: {game.game_state.get_survival_time()}s")
+    return game
+
+
+def run_recorded(
+    path,
+    seed=None,
+    dirty_rects=False,
+    world=False,
+    autopilot=False,
+    trace=None,
+    settings=None,
+):
+    """Play the game on a fixed timestep while recording a replay."""
+    from .core.clock import SimulationClock
+    from .core.game import BeaverSurvivalGame
+    from .core.replay import Replay
+    from .systems.navigation import Autopilot
+
+    if seed is None:
+        seed = random.randrange(2**63)
+    settings = settings or Settings()
+    replay = Replay(seed, settings.fps, world=world, prefetch=world)
+    game = BeaverSurvivalGame(
+        clock=SimulationClock(settings.fps),
+        seed=seed,
+        dirty_rects=dirty_rects,
+        world=world,
+        prefetch=world,
+        recorder=replay,
+        autopilot=Autopilot() if autopilot else None,
+        settings=settings,
+    )
+    if trace:
+        game.profiler.start(tracing=True)
     try:
-        game = BeaverSurvivalGame()
         game.run()
+    finally:
+        replay.save(path)
+        print(f"Recorded {len(replay)} ticks (seed {seed}) to {path}")
+        if trace:
+            game.profiler.export_chrome_trace(trace)
+
+
+def main(argv=None):
+    """Entry point for the game."""
+    args = parse_args(argv)
+    settings = args.game_settings
+    try:
+        if args.replay:
+            run_replay(args.replay, args.render_ticks, args.render_dir, settings)
+        elif args.headless:
+            run_headless(args.ticks, args.seed, args.trace, args.autopilot, settings)
+        elif args.record:
+            run_recorded(
+                args.record,
+                args.seed,
+                args.dirty_rects,
+                args.world,
+                args.autopilot,
+                args.trace,
+                settings,
+            )
+        else:
+            from .core.game import BeaverSurvivalGame
+            from .core.savegame import SaveManager
+            from .systems.navigation import Autopilot
+
+            save_manager = None
+            if args.save:
+                save_manager = SaveManager(args.save, settings=settings)
+            game = BeaverSurvivalGame(
+                seed=args.seed,
+                dirty_rects=args.dirty_rects,
+                world=args.world,
+                save_manager=save_manager,
+                autopilot=Autopilot() if args.autopilot else None,
+                settings=settings,
+            )
+            if save_manager is not None and os.path.exists(args.save):
+                save_manager.load(game)
+            if args.trace:
+                game.profiler.start(tracing=True)
+            game.run()
+            if args.trace:
+                game.profiler.export_chrome_trace(args.trace)
     except Exception as e:
         print(f"Error running game: {e}")
         sys.exit(1)
@@ -0,0 +1,66 @@
+"""
+Pre-rendered static background layers.
+"""
+
+import pygame
+from ..config.constants import COLORS
+
+
+class BackgroundLayer:
+    """Static scenery for one screen, rasterized once into a cached surface.
+
+    The land fill, the water band and the static objects (anything with a
+    ``draw(screen)`` method, such as the dam and lodge) are drawn into a
+    surface matching the target's size and pixel format, so every frame
+    costs a single blit. The cache is rebuilt only when the target surface
+    changes size or format, or after invalidate() is called.
+    """
+
+    def __init__(self, objects, water_rect):
+        self.objects = objects
+        self.water_rect = water_rect
+        self.surface = None
+        self.builds = 0
+
+    def invalidate(self):
+        """Discard the cached surface so it is rebuilt on the next draw."""
+        self.surface = None
+
+    def get_surface(self, target):
+        """Return the cached layer, rebuilding it if target is incompatible."""
+        surface = self.surface
+        if (
+            surface is None
+            or surface.get_size() != target.get_size()
+            or surface.get_bitsize() != target.get_bitsize()
+        ):
+            surface = self.surface = self.render(target.get_size(), target)
+        return surface
+
+    def render(self, size, target=None):
+        """Rasterize the scenery into a new surface.
+
+        When given, the surface copies target's pixel format so blits onto
+        it need no conversion.
+        """
+        if target is not None:
+            surface = pygame.Surface(size, 0, target)
+        else:
+            surface = pygame.Surface(size)
+
+        # Green background (land) with water in the upper part of the screen
+        surface.fill(COLORS["GREEN"])
+        pygame.draw.rect(surface, COLORS["BLUE"], self.water_rect)
+
+        for obj in self.objects:
+            obj.draw(surface)
+
+        self.builds += 1
+        return surface
+
+    def draw(self, screen, area=None):
+        """Blit the layer onto the screen, optionally only one region of it."""
+        if area is None:
+            screen.blit(self.get_surface(screen), (0, 0))
+        else:
+            screen.blit(self.get_surface(screen), area, area)
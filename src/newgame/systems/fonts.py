@@ -0,0 +1,26 @@
+"""
+Lazily loaded, shared fonts.
+"""
+
+import pygame
+
+# Fonts already loaded, keyed on (name, size)
+_fonts = {}
+
+
+def get_font(size, name=None):
+    """Return the font of the given size, loading it on first use.
+
+    Fonts are cached for the life of the font module, so every UI and
+    overlay shares one Font object per (name, size) and nothing is loaded
+    until text is first drawn. The font module is initialized on demand,
+    and fonts loaded before a pygame.quit() are discarded.
+    """
+    if not pygame.font.get_init():
+        _fonts.clear()
+        pygame.font.init()
+    key = (name, size)
+    font = _fonts.get(key)
+    if font is None:
+        font = _fonts[key] = pygame.font.Font(name, size)
+    return font
@@ -0,0 +1,55 @@
+"""
+Menu composition layer for full-screen overlays.
+"""
+
+import pygame
+from ..config.constants import COLORS
+
+
+class ComposedMenu:
+    """A menu prepared for drawing: a list of blits plus named rects."""
+
+    def __init__(self, blits, rects=None):
+        self.blits = blits
+        self.rects = rects or {}
+
+    def draw(self, screen):
+        """Blit every prepared surface in one batch."""
+        screen.blits(self.blits, doreturn=False)
+
+
+class MenuComposer:
+    """Builds menu surfaces once per resolution and reuses them every frame.
+
+    The dimming overlay is shared by all menus of a resolution, and each
+    menu's static parts are composed by a build function the first time the
+    menu is shown at that resolution. Callers draw only the parts that
+    change (such as the survival-time counter) on top.
+    """
+
+    def __init__(self):
+        self.overlays = {}
+        self.menus = {}
+
+    def overlay(self, size):
+        """Return the 50% black dimming overlay for a screen size."""
+        overlay = self.overlays.get(size)
+        if overlay is None:
+            overlay = pygame.Surface(size)
+            overlay.set_alpha(128)
+            overlay.fill(COLORS["BLACK"])
+            self.overlays[size] = overlay
+        return overlay
+
+    def get(self, name, size, build):
+        """Return the composed menu, calling build(size) on first use."""
+        key = (name, size)
+        menu = self.menus.get(key)
+        if menu is None:
+            menu = self.menus[key] = build(size)
+        return menu
+
+    def clear(self):
+        """Drop all composed surfaces, e.g. after fonts or resolution change."""
+        self.overlays.clear()
+        self.menus.clear()
@@ -0,0 +1,350 @@
+"""
+Grid navigation: shared flow fields for NPCs and the autopilot beaver.
+
+A NavGrid divides the screen into square cells and marks the cells an
+agent cannot stand in because of the dam (and optionally the lodge). A
+FlowField holds the distance from every cell to the nearest of a set of
+targets, computed by breadth-first search; an agent anywhere on the screen
+finds its way by stepping to the neighbouring cell with the lowest
+distance. One field serves any number of agents heading for the same
+targets, so the cost does not grow with the number of chasers.
+
+Fields are cached by a Navigator and only recomputed when something they
+depend on changes: the grid's obstacles, or the cells their targets are
+in. Adding targets, such as newly spawned food, only relaxes the distances
+that got shorter instead of searching the whole grid again.
+"""
+
+from array import array
+from collections import deque
+import pygame
+from ..config.settings import NAV_CELL_SIZE, DEFAULT_SETTINGS
+from ..config.constants import MOVEMENT_KEYS
+
+# Distance of cells no target can be reached from
+UNREACHABLE = 0xFFFF
+
+# Neighbour offsets: orthogonal steps cost 1, diagonals are only used for
+# heading lookups and never cut a blocked corner
+_ORTHOGONAL = ((1, 0), (-1, 0), (0, 1), (0, -1))
+_DIAGONAL = ((1, 1), (1, -1), (-1, 1), (-1, -1))
+
+# First movement key for each direction, e.g. (0, -1) -> K_w
+_DIRECTION_KEYS = {}
+for _key, _direction in MOVEMENT_KEYS.items():
+    _DIRECTION_KEYS.setdefault(_direction, _key)
+
+
+class NavGrid:
+    """Walkable cells of a screen for agents of a given size.
+
+    A cell is blocked when an agent centred on it would overlap one of the
+    obstacle rects. ``revision`` is bumped whenever the obstacles change,
+    which invalidates every FlowField built on the grid. The grid covers
+    the settings' screen, and agent_size defaults to their player size.
+    """
+
+    def __init__(
+        self, obstacles=(), cell_size=NAV_CELL_SIZE, agent_size=None, settings=None
+    ):
+        settings = settings or DEFAULT_SETTINGS
+        width, height = settings.screen_size
+        self.cell_size = cell_size
+        self.agent_size = settings.player_size if agent_size is None else agent_size
+        self.cols = -(-width // cell_size)
+        self.rows = -(-height // cell_size)
+        self.blocked = bytearray(self.cols * self.rows)
+        self.obstacles = ()
+        self.revision = 0
+        self.set_obstacles(obstacles)
+
+    def set_obstacles(self, obstacles):
+        """Replace the obstacle rects. Returns whether anything changed."""
+        obstacles = tuple(
+            tuple(rect) for rect in obstacles if rect[2] > 0 and rect[3] > 0
+        )
+        if obstacles == self.obstacles:
+            return False
+        self.obstacles = obstacles
+
+        blocked = self.blocked
+        blocked[:] = bytes(len(blocked))
+        size = self.cell_size
+        for rect in obstacles:
+            # Cells whose centre lies within half an agent of the obstacle
+            area = pygame.Rect(rect).inflate(self.agent_size, self.agent_size)
+            for row in range(
+                max(0, area.top // size), min(self.rows, area.bottom // size + 1)
+            ):
+                centre_y = row * size + size // 2
+                if not area.top <= centre_y < area.bottom:
+                    continue
+                for col in range(
+                    max(0, area.left // size), min(self.cols, area.right // size + 1)
+                ):
+                    if area.left <= col * size + size // 2 < area.right:
+                        blocked[row * self.cols + col] = 1
+        self.revision += 1
+        return True
+
+    def cell_at(self, x, y):
+        """Return the index of the cell containing pixel (x, y), or None."""
+        col = int(x) // self.cell_size
+        row = int(y) // self.cell_size
+        if 0 <= col < self.cols and 0 <= row < self.rows:
+            return row * self.cols + col
+        return None
+
+    def centre(self, cell):
+        """Return the pixel centre of a cell."""
+        row, col = divmod(cell, self.cols)
+        half = self.cell_size // 2
+        return (col * self.cell_size + half, row * self.cell_size + half)
+
+
+class FlowField:
+    """Distances from every cell of a NavGrid to the nearest target.
+
+    Targets are pixel points; each one seeds the search from the cell it
+    lies in. ``recomputes`` and ``relaxes`` count full searches and
+    incremental updates, for tests and profiling.
+    """
+
+    def __init__(self, grid):
+        self.grid = grid
+        self.grid_revision = None
+        self.targets = frozenset()
+        self.points = {}
+        self.distances = array("H", [UNREACHABLE]) * (grid.cols * grid.rows)
+        self.recomputes = 0
+        self.relaxes = 0
+
+    def set_targets(self, points):
+        """Head for the given (x, y) points. Returns whether distances changed."""
+        grid = self.grid
+        cells = {}
+        for x, y in points:
+            cell = grid.cell_at(x, y)
+            if cell is not None:
+                cells.setdefault(cell, []).append((x, y))
+        self.points = cells
+        targets = frozenset(cells)
+
+        if self.grid_revision != grid.revision:
+            self._recompute(targets)
+        elif targets == self.targets:
+            return False
+        elif targets > self.targets:
+            # New targets can only shorten distances; relax from them alone
+            self._relax(targets - self.targets)
+            self.relaxes += 1
+        else:
+            self._recompute(targets)
+        self.targets = targets
+        return True
+
+    def _recompute(self, targets):
+        """Search the whole grid again from every target."""
+        distances = self.distances
+        distances[:] = array("H", [UNREACHABLE]) * len(distances)
+        self.grid_revision = self.grid.revision
+        self._relax(targets)
+        self.recomputes += 1
+
+    def _relax(self, sources):
+        """Breadth-first search from sources, lowering distances only."""
+        grid = self.grid
+        cols, rows = grid.cols, grid.rows
+        blocked = grid.blocked
+        distances = self.distances
+        queue = deque()
+        for cell in sources:
+            distances[cell] = 0
+            queue.append(cell)
+        while queue:
+            cell = queue.popleft()
+            next_distance = distances[cell] + 1
+            row, col = divmod(cell, cols)
+            for dx, dy in _ORTHOGONAL:
+                ncol = col + dx
+                nrow = row + dy
+                if 0 <= ncol < cols and 0 <= nrow < rows:
+                    neighbour = nrow * cols + ncol
+                    if not blocked[neighbour] and distances[neighbour] > next_distance:
+                        distances[neighbour] = next_distance
+                        queue.append(neighbour)
+
+    def distance(self, x, y):
+        """Return the distance in cells from pixel (x, y) to the nearest target."""
+        cell = self.grid.cell_at(x, y)
+        return UNREACHABLE if cell is None else self.distances[cell]
+
+    def heading(self, x, y):
+        """Return the (dx, dy) step, each -1, 0 or 1, toward the nearest target.
+
+        In a target's cell the heading points straight at the target.
+        Returns None when no target can be reached from (x, y).
+        """
+        grid = self.grid
+        cell = grid.cell_at(x, y)
+        if cell is None:
+            return None
+        distances = self.distances
+        here = distances[cell]
+        if here == 0:
+            tx, ty = min(
+                self.points.get(cell, ()),
+                key=lambda point: abs(point[0] - x) + abs(point[1] - y),
+                default=(x, y),
+            )
+            return (_sign(tx - x), _sign(ty - y))
+
+        cols, rows = grid.cols, grid.rows
+        blocked = grid.blocked
+        row, col = divmod(cell, cols)
+
+        def walkable(dx, dy):
+            ncol = col + dx
+            nrow = row + dy
+            return (
+                0 <= ncol < cols
+                and 0 <= nrow < rows
+                and not blocked[nrow * cols + ncol]
+            )
+
+        best = None
+        best_distance = here
+        for dx, dy in _ORTHOGONAL + _DIAGONAL:
+            if not walkable(dx, dy):
+                continue
+            if dx and dy and not (walkable(dx, 0) and walkable(0, dy)):
+                continue
+            distance = distances[(row + dy) * cols + col + dx]
+            if distance < best_distance:
+                best = (dx, dy)
+                best_distance = distance
+        return best
+
+
+def _sign(value):
+    """Return -1, 0 or 1, ignoring offsets of under a pixel."""
+    if value >= 1:
+        return 1
+    if value <= -1:
+        return -1
+    return 0
+
+
+class Navigator:
+    """Navigation grid of one screen and the flow fields cached on it.
+
+    Fields are created on first use and kept by name, so every agent that
+    asks for the same field shares it. The food field follows
+    FoodManager.revision and is only refreshed after food changed.
+    """
+
+    def __init__(
+        self, obstacles=(), cell_size=NAV_CELL_SIZE, agent_size=None, settings=None
+    ):
+        self.grid = NavGrid(obstacles, cell_size, agent_size, settings)
+        self.fields = {}
+        self._food_key = None
+
+    def set_obstacles(self, obstacles):
+        """Replace the obstacles, e.g. the dam after changing screens."""
+        return self.grid.set_obstacles(obstacles)
+
+    def field(self, name):
+        """Return the cached field called name, creating it if needed."""
+        field = self.fields.get(name)
+        if field is None:
+            field = self.fields[name] = FlowField(self.grid)
+        return field
+
+    def toward(self, name, points):
+        """Return field name, updated to head for the given points."""
+        field = self.field(name)
+        field.set_targets(points)
+        return field
+
+    def toward_rect(self, name, rect):
+        """Return field name, updated to head for the centre of rect."""
+        return self.toward(name, (pygame.Rect(rect).center,))
+
+    def toward_food(self, food_manager):
+        """Return the field leading to the nearest food of food_manager."""
+        field = self.field("food")
+        key = (food_manager, food_manager.revision, self.grid.revision)
+        if key != self._food_key:
+            half = food_manager.food_size // 2
+            xs, ys = food_manager.food_x, food_manager.food_y
+            field.set_targets(
+                [
+                    (xs[slot] + half, ys[slot] + half)
+                    for slot in food_manager.live_slots()
+                ]
+            )
+            self._food_key = key
+        return field
+
+
+def heading_to_keys(heading):
+    """Return a keys_pressed dict holding the keys for a heading."""
+    if not heading:
+        return {}
+    dx, dy = heading
+    keys = {}
+    if dx:
+        keys[_DIRECTION_KEYS[(dx, 0)]] = True
+    if dy:
+        keys[_DIRECTION_KEYS[(0, dy)]] = True
+    return keys
+
+
+def steer(registry, entities, field, settings=None):
+    """Point the heading component of entities along a flow field.
+
+    Any number of agents can follow the same field, e.g. predators chasing
+    the player. Agents that cannot reach a target stop. Diagonal steps are
+    scaled like the player's of the given settings.
+    """
+    diagonal_factor = (settings or DEFAULT_SETTINGS).diagonal_factor
+    position = registry["position"]
+    xs, ys = position["x"], position["y"]
+    body = registry["body"]
+    ws, hs = body["w"], body["h"]
+    heading = registry["heading"]
+    heading_xs, heading_ys = heading["x"], heading["y"]
+    for entity in entities:
+        step = field.heading(xs[entity] + ws[entity] // 2, ys[entity] + hs[entity] // 2)
+        dx, dy = step if step else (0, 0)
+        if dx and dy:
+            dx *= diagonal_factor  # Same diagonal speed as the player
+            dy *= diagonal_factor
+        heading_xs[entity] = dx
+        heading_ys[entity] = dy
+
+
+class Autopilot:
+    """Bot that plays the beaver by walking to the nearest food.
+
+    With no food on screen it heads for the lodge and waits there. Used by
+    ``--autopilot`` for soak tests; it sees only what a player would. Unless
+    one is given, the navigator is built for the first game's settings.
+    """
+
+    def __init__(self, navigator=None):
+        self.navigator = navigator
+
+    def keys(self, game):
+        """Return the keys_pressed dict for the game's next step."""
+        screen = game.current_screen
+        navigator = self.navigator
+        if navigator is None:
+            navigator = self.navigator = Navigator(settings=game.settings)
+        navigator.set_obstacles((screen.dam_rect,))
+        x, y = game.player.rect.center
+        heading = navigator.toward_food(game.food_manager).heading(x, y)
+        if heading is None and screen.lodge is not None:
+            heading = navigator.toward_rect("lodge", screen.lodge_rect).heading(x, y)
+        return heading_to_keys(heading)
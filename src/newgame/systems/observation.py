@@ -0,0 +1,127 @@
+"""
+Pixel observations of the Beaver Survival Game for agents and visual tests.
+
+Frames are read straight from the rendered surface through
+``pygame.surfarray.pixels3d``, a NumPy view of the surface's own memory,
+instead of being copied out with ``pygame.image.tostring``. Downsampled
+grayscale frames are written into surfaces and a ring of arrays
+allocated once, so observing a frame allocates no frame-sized buffers;
+only putting the stack in order with ``Observer.stacked()`` makes a
+copy. Everything works on off-screen surfaces, so headless games and the
+SDL dummy video driver are fine.
+
+A pixel view locks its surface, and pygame refuses to blit onto a locked
+surface, so views must be dropped before the game draws again. Observer
+does that itself; callers of pixel_view() use it as a context manager.
+
+Requires NumPy (``pip install newgame[sim]``).
+"""
+
+from contextlib import contextmanager
+import numpy as np
+import pygame
+
+# ITU-R BT.601 luma weights in 1/256ths; they sum to 256
+_LUMA_WEIGHTS = (77, 150, 29)
+
+
+@contextmanager
+def pixel_view(surface):
+    """Yield a (height, width, 3) RGB view of a surface's pixels.
+
+    No pixels are copied: writes to the view change the surface. The
+    surface stays locked, and cannot be drawn on, until the block ends and
+    no references to the view are left.
+    """
+    view = pygame.surfarray.pixels3d(surface)
+    try:
+        yield view.transpose(1, 0, 2)
+    finally:
+        del view
+
+
+class Observer:
+    """Downsampled grayscale frames and frame stacks of a game's screen.
+
+    Each frame is the screen smoothly scaled down by downsample along both
+    axes and converted to grayscale luma. ``frames`` holds the last stack
+    frames as a (stack, height, width) uint8 ring: every observe()
+    overwrites the oldest slot in place, at index ``head``, and moves head
+    on, so copy a frame to keep it. stacked() returns them oldest first.
+    downsample and stack default to the game settings' observation_*.
+    """
+
+    def __init__(self, game, downsample=None, stack=None):
+        settings = game.settings
+        if downsample is None:
+            downsample = settings.observation_downsample
+        if stack is None:
+            stack = settings.observation_stack
+        if downsample < 1 or stack < 1:
+            raise ValueError("downsample and stack must be at least 1")
+        self.game = game
+        self.downsample = downsample
+        screen_width, screen_height = game.screen.get_size()
+        width = screen_width // downsample
+        height = screen_height // downsample
+        self.size = (width, height)
+        self.frames = np.zeros((stack, height, width), dtype=np.uint8)
+        self.head = 0  # Slot of the oldest frame, overwritten next
+
+        # The scaled-down screen, and luma scratch buffers in surfarray's
+        # x-major order so they are filled without transposing
+        self._small = pygame.Surface(self.size, 0, game.screen)
+        self._luma = np.zeros((width, height), dtype=np.uint32)
+        self._channel = np.zeros((width, height), dtype=np.uint32)
+
+    @property
+    def frame(self):
+        """The latest grayscale frame, a view into frames."""
+        return self.frames[self.head - 1]
+
+    def stacked(self):
+        """Return a copy of the frame stack, oldest first."""
+        return np.roll(self.frames, -self.head, axis=0)
+
+    def grayscale(self, surface, out):
+        """Write a surface's downsampled grayscale image into out.
+
+        out is a (height, width) uint8 array of this observer's size.
+        """
+        small = pygame.transform.smoothscale(surface, self.size, self._small)
+        luma, channel = self._luma, self._channel
+        pixels = pygame.surfarray.pixels3d(small)
+        try:
+            np.multiply(pixels[..., 0], _LUMA_WEIGHTS[0], out=luma, dtype=np.uint32)
+            for index in (1, 2):
+                np.multiply(
+                    pixels[..., index],
+                    _LUMA_WEIGHTS[index],
+                    out=channel,
+                    dtype=np.uint32,
+                )
+                luma += channel
+        finally:
+            del pixels
+        luma >>= 8
+        np.copyto(out, luma.T, casting="unsafe")
+        return out
+
+    def observe(self):
+        """Render the game and write its frame over the oldest one.
+
+        Returns the new frame.
+        """
+        surface = self.game.render_frame()
+        frame = self.grayscale(surface, self.frames[self.head])
+        self.head = (self.head + 1) % len(self.frames)
+        return frame
+
+    def reset(self):
+        """Fill the whole stack with the current frame, as after a restart.
+
+        Returns the frame.
+        """
+        frame = self.observe()
+        self.frames[:] = frame
+        return frame
@@ -0,0 +1,248 @@
+"""
+Frame profiler and debug overlay.
+"""
+
+import json
+import time
+from collections import deque
+import pygame
+from ..config.constants import COLORS
+from ..config.settings import (
+    PROFILER_HISTORY,
+    PROFILER_TRACE_LIMIT,
+    PROFILER_OVERLAY_REFRESH,
+)
+from .fonts import get_font
+
+# Upper edges of the histogram buckets, in milliseconds; the last bucket
+# collects everything slower than one 30 FPS frame
+HISTOGRAM_EDGES_MS = (0.25, 0.5, 1, 2, 4, 8, 16.7, 33.3)
+
+# Name under which whole frames are recorded
+FRAME = "frame"
+
+
+class _Span:
+    """Context manager timing one named span for a FrameProfiler."""
+
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.profiler.record(self.name, self.start, time.perf_counter_ns())
+        return False
+
+
+class _NullSpan:
+    """Shared do-nothing span used while profiling is off."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class FrameProfiler:
+    """Times named spans of each frame with ``perf_counter_ns``.
+
+    Code under measurement is wrapped in ``with profiler.span(name):``.
+    While the profiler is disabled, span() returns a shared no-op context
+    manager, so instrumentation left in place costs almost nothing. Span
+    times are summed per frame, and end_frame() pushes each frame's totals
+    into rolling windows of the last ``history`` frames, from which stats()
+    and histogram() are computed. With ``tracing`` on, every span is also
+    kept (up to ``trace_limit`` of them) for Chrome trace-event export.
+    """
+
+    def __init__(self, history=PROFILER_HISTORY, trace_limit=PROFILER_TRACE_LIMIT):
+        self.enabled = False
+        self.tracing = False
+        self.history = history
+        self.spans = {}
+        self.windows = {}
+        self.frame_totals = {}
+        self.trace = deque(maxlen=trace_limit)
+        self.origin = time.perf_counter_ns()
+        self.frame_start = self.origin
+        self.frames = 0
+
+    def span(self, name):
+        """Return a context manager timing the enclosed code as name."""
+        if not self.enabled:
+            return _NULL_SPAN
+        span = self.spans.get(name)
+        if span is None:
+            span = self.spans[name] = _Span(self, name)
+        return span
+
+    def record(self, name, start, end):
+        """Add a finished span, with perf_counter_ns() start and end times."""
+        self.frame_totals[name] = self.frame_totals.get(name, 0) + end - start
+        if self.tracing:
+            self.trace.append((name, start, end - start))
+
+    def end_frame(self):
+        """Close the current frame and add its span totals to the windows."""
+        if not self.enabled:
+            return
+        now = time.perf_counter_ns()
+        totals = self.frame_totals
+        totals[FRAME] = now - self.frame_start
+        for name, total in totals.items():
+            window = self.windows.get(name)
+            if window is None:
+                window = self.windows[name] = deque(maxlen=self.history)
+            window.append(total)
+        # Spans that did not run this frame count as zero time
+        for name, window in self.windows.items():
+            if name not in totals:
+                window.append(0)
+        self.frame_totals = {}
+        self.frame_start = now
+        self.frames += 1
+
+    def start(self, tracing=False):
+        """Turn profiling on, optionally recording a trace."""
+        if not self.enabled:
+            self.frame_totals = {}
+            self.frame_start = time.perf_counter_ns()
+        self.enabled = True
+        self.tracing = self.tracing or tracing
+
+    def stop(self):
+        """Turn profiling and tracing off. Collected data is kept."""
+        self.enabled = False
+        self.tracing = False
+
+    def stats(self, name):
+        """Return (mean, p95, max) of a span's per-frame time in milliseconds."""
+        window = self.windows.get(name)
+        if not window:
+            return 0.0, 0.0, 0.0
+        ordered = sorted(window)
+        p95 = ordered[min(len(ordered) - 1, len(ordered) * 95 // 100)]
+        return (
+            sum(ordered) / len(ordered) / 1e6,
+            p95 / 1e6,
+            ordered[-1] / 1e6,
+        )
+
+    def histogram(self, name):
+        """Return per-frame time counts for the HISTOGRAM_EDGES_MS buckets."""
+        counts = [0] * (len(HISTOGRAM_EDGES_MS) + 1)
+        for total in self.windows.get(name, ()):
+            ms = total / 1e6
+            bucket = 0
+            while bucket < len(HISTOGRAM_EDGES_MS) and ms > HISTOGRAM_EDGES_MS[bucket]:
+                bucket += 1
+            counts[bucket] += 1
+        return counts
+
+    def names(self):
+        """Return the recorded span names, whole frames first."""
+        return sorted(self.windows, key=lambda name: (name != FRAME, name))
+
+    def chrome_trace(self):
+        """Return the trace as a Chrome trace-event dict (chrome://tracing)."""
+        origin = self.origin
+        events = [
+            {
+                "name": name,
+                "ph": "X",
+                "ts": (start - origin) / 1000,
+                "dur": duration / 1000,
+                "pid": 1,
+                "tid": 1,
+            }
+            for name, start, duration in self.trace
+        ]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export_chrome_trace(self, path):
+        """Write the trace as Chrome trace-event JSON."""
+        with open(path, "w") as f:
+            json.dump(self.chrome_trace(), f)
+
+
+class ProfilerOverlay:
+    """Debug overlay listing span timings and a frame-time histogram.
+
+    The panel is re-rendered every ``refresh`` frames and blitted as-is in
+    between, so the overlay itself adds little to the frames it measures.
+    """
+
+    def __init__(self, profiler, refresh=PROFILER_OVERLAY_REFRESH):
+        self.profiler = profiler
+        self.refresh = refresh
+        self.font = get_font(18)
+        self.surface = None
+        self.rendered_at = None
+        self.rect = None
+
+    def render(self):
+        """Render the overlay panel from the profiler's current windows."""
+        profiler = self.profiler
+        lines = [f"{'span':<22}{'avg':>7}{'p95':>7}{'max':>7}  ms"]
+        for name in profiler.names():
+            mean, p95, peak = profiler.stats(name)
+            lines.append(f"{name:<22}{mean:>7.2f}{p95:>7.2f}{peak:>7.2f}")
+        line_surfaces = [
+            self.font.render(line, True, COLORS["WHITE"]) for line in lines
+        ]
+
+        line_height = self.font.get_linesize()
+        counts = profiler.histogram(FRAME)
+        bar_area = 40
+        width = max(surface.get_width() for surface in line_surfaces) + 10
+        height = len(line_surfaces) * line_height + bar_area + 15
+
+        panel = pygame.Surface((width, height))
+        panel.fill(COLORS["BLACK"])
+        panel.set_alpha(200)
+        for index, surface in enumerate(line_surfaces):
+            panel.blit(surface, (5, 5 + index * line_height))
+
+        # One bar per histogram bucket, scaled to the fullest bucket
+        top = 10 + len(line_surfaces) * line_height
+        bar_width = (width - 10) // len(counts)
+        peak = max(counts) or 1
+        for index, count in enumerate(counts):
+            bar_height = bar_area * count // peak
+            color = COLORS["RED"] if index >= len(counts) - 2 else COLORS["GREEN"]
+            pygame.draw.rect(
+                panel,
+                color,
+                (
+                    5 + index * bar_width,
+                    top + bar_area - bar_height,
+                    bar_width - 2,
+                    bar_height,
+                ),
+            )
+
+        self.surface = panel
+        self.rendered_at = profiler.frames
+
+    def draw(self, screen):
+        """Draw the overlay in the top-right corner and return its rect."""
+        frames = self.profiler.frames
+        if self.surface is None or frames - self.rendered_at >= self.refresh:
+            self.render()
+        rect = self.surface.get_rect(topright=(screen.get_width() - 10, 10))
+        screen.blit(self.surface, rect)
+        self.rect = rect
+        return rect
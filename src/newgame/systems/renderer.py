@@ -0,0 +1,96 @@
+"""
+Dirty-rectangle rendering for the Beaver Survival Game.
+"""
+
+import pygame
+
+
+class DirtyRectRenderer:
+    """Redraws only the screen regions that changed since the last frame.
+
+    Changes are tracked for the player, the HUD and (through
+    FoodManager.on_change) food items appearing or disappearing. Each dirty
+    region is redrawn back to front with the screen clipped to it, and only
+    those regions are pushed with ``pygame.display.update``. Game state
+    changes such as pausing or game over fall back to one full redraw.
+    """
+
+    def __init__(self):
+        self.dirty = []
+        self.full_redraw = True
+        self.last_state = None
+        self.player_rect = None
+        self.player_zone = None
+        self.hud_rect = None
+        self.hud_food = None
+
+    def invalidate(self):
+        """Force a full redraw on the next frame."""
+        self.full_redraw = True
+
+    def mark_dirty(self, rect):
+        """Schedule a screen region to be redrawn on the next frame."""
+        self.dirty.append(pygame.Rect(rect))
+
+    def render(self, game):
+        """Draw the next frame for a game.
+
+        Returns None after a full redraw, otherwise the list of rects that
+        changed (empty when nothing did).
+        """
+        screen = game.screen
+        state = game.game_state.current_state
+        if self.full_redraw or state != self.last_state:
+            self.full_redraw = False
+            self.last_state = state
+            self.dirty.clear()
+            self._track(game, game.draw_scene(screen))
+            return None
+
+        if not game.game_state.is_playing():
+            # Nothing moves while paused or after game over, so only areas
+            # marked dirty (such as under the profiler overlay) are redrawn
+            updated = self.dirty
+            self.dirty = []
+            for area in updated:
+                screen.set_clip(area)
+                game.draw_scene(screen)
+            screen.set_clip(None)
+            return updated
+
+        player = game.player
+        player_rect = player.draw_rect
+        if player_rect != self.player_rect or player.current_zone != self.player_zone:
+            self.dirty.append(self.player_rect.union(player_rect))
+
+        hud_changed = game.food_amount != self.hud_food
+        if hud_changed and self.hud_rect is not None:
+            self.dirty.append(self.hud_rect)
+
+        updated = self.dirty
+        self.dirty = []
+        for area in updated:
+            screen.set_clip(area)
+            game.draw_background(screen, area)
+            game.food_manager.draw_area(screen, area)
+            if area.colliderect(player_rect):
+                player.draw(screen)
+            if self.hud_rect is not None and area.colliderect(self.hud_rect):
+                game.ui.draw_hud(screen, game.food_amount)
+        screen.set_clip(None)
+
+        hud_rect = self.hud_rect
+        if hud_changed:
+            # The HUD box is opaque, so drawing it covers its new rect fully
+            hud_rect = game.ui.draw_hud(screen, game.food_amount)
+            updated.append(hud_rect)
+
+        self._track(game, hud_rect)
+        return updated
+
+    def _track(self, game, hud_rect):
+        """Remember what was drawn so the next frame can detect changes."""
+        self.player_rect = game.player.draw_rect.copy()
+        self.player_zone = game.player.current_zone
+        self.hud_rect = hud_rect
+        self.hud_food = game.food_amount
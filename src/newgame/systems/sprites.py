@@ -0,0 +1,67 @@
+"""
+Sprite atlas for entity rendering.
+"""
+
+import pygame
+
+# Color used for transparent atlas pixels; never used by game art
+COLORKEY = (255, 0, 255)
+
+
+class SpriteAtlas:
+    """Pre-rendered sprites packed side by side into a single surface.
+
+    Sprites are registered with a size and a draw function that paints the
+    sprite into a rect on the atlas. The atlas surface is built lazily on
+    first use, after every entity module has registered its sprites, and is
+    then reused for all blits; ``regions`` maps sprite names to their source
+    rects for ``Surface.blits()`` batches.
+    """
+
+    def __init__(self):
+        self.sprites = {}
+        self.regions = {}
+        self._surface = None
+
+    def register(self, name, size, draw):
+        """Add a sprite drawn by draw(surface, rect)."""
+        self.sprites[name] = (size, draw)
+        self._surface = None
+
+    @property
+    def surface(self):
+        """The atlas surface, built on first access."""
+        if self._surface is None:
+            self._surface = self._build()
+        return self._surface
+
+    def _build(self):
+        """Pack and rasterize all registered sprites in a single row."""
+        width = sum(size[0] for size, _ in self.sprites.values())
+        height = max((size[1] for size, _ in self.sprites.values()), default=0)
+        surface = pygame.Surface((max(width, 1), max(height, 1)))
+        surface.fill(COLORKEY)
+
+        x = 0
+        for name, (size, draw) in self.sprites.items():
+            region = pygame.Rect((x, 0), size)
+            draw(surface, region)
+            self.regions[name] = region
+            x += size[0]
+
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert()
+        surface.set_colorkey(COLORKEY, pygame.RLEACCEL)
+        return surface
+
+    def blit(self, screen, name, dest):
+        """Draw a single sprite."""
+        screen.blit(self.surface, dest, self.regions[name])
+
+    def invalidate(self):
+        """Rebuild the atlas on next use, e.g. after the display changes."""
+        self._surface = None
+
+
+# Shared atlas for all entity sprites
+atlas = SpriteAtlas()
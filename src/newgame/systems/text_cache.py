@@ -0,0 +1,45 @@
+"""
+Cache for rendered text surfaces.
+"""
+
+from collections import OrderedDict
+
+
+class TextCache:
+    """LRU-bounded cache of rendered text surfaces.
+
+    Surfaces are keyed on (font, text, color, antialias), so static labels
+    and slowly changing values such as the food counter are rendered once
+    and then reused until they fall out of the cache.
+    """
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, color, antialias=True):
+        """Return the rendered surface for text, rendering it on a miss."""
+        key = (font, text, color, antialias)
+        surface = self.entries.get(key)
+        if surface is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self.entries[key] = surface
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return surface
+
+    def clear(self):
+        """Drop all cached surfaces and reset the counters."""
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
@@ -4,26 +4,48 @@ User interface elements for the Beaver Survival Game.
 
 import pygame
 from ..config.constants import COLORS
-from ..config.settings import SCREEN_WIDTH, SCREEN_HEIGHT, MAX_FOOD
+from ..config.settings import DEFAULT_SETTINGS
+from .fonts import get_font
+from .menus import ComposedMenu, MenuComposer
+from .text_cache import TextCache
 
 
 class UI:
     """Manages all UI elements including HUD and menus."""
 
-    def __init__(self):
-        pygame.font.init()
-        self.font = pygame.font.Font(None, 36)
-        self.small_font = pygame.font.Font(None, 24)
-        self.large_font = pygame.font.Font(None, 48)
+    def __init__(self, settings=None):
+        self.settings = settings or DEFAULT_SETTINGS
+        self.text_cache = TextCache()
+        self.menus = MenuComposer()
+
+    # Fonts are only loaded once something is drawn with them
+
+    @property
+    def font(self):
+        return get_font(36)
+
+    @property
+    def small_font(self):
+        return get_font(24)
+
+    @property
+    def large_font(self):
+        return get_font(48)
+
+    def render_text(self, font, text, color, antialias=True):
+        """Render text through the shared surface cache."""
+        return self.text_cache.render(font, text, color, antialias)
 
     def draw_hud(self, screen, food_amount):
-        """Draw the heads-up display."""
+        """Draw the heads-up display and return the rect it covers."""
         # Food supply display in upper-left
-        food_text = f"Food: {food_amount}/{MAX_FOOD}"
-        food_color = COLORS["RED"] if food_amount <= MAX_FOOD * 0.2 else COLORS["WHITE"]
+        settings = self.settings
+        food_text = f"Food: {food_amount}/{settings.max_food}"
+        food_color = (
+            COLORS["RED"] if food_amount <= settings.low_food else COLORS["WHITE"]
+        )
 
-        food_surface = self.font.render(food_text, True, food_color)
-        screen.blit(food_surface, (10, 10))
+        food_surface = self.render_text(self.font, food_text, food_color)
 
         # Optional: Add background for better readability
         text_rect = food_surface.get_rect()
@@ -33,78 +55,85 @@ class UI:
         pygame.draw.rect(screen, (0, 0, 0, 128), text_rect)
         screen.blit(food_surface, (10, 10))
 
+        return text_rect
+
     def draw_game_over_screen(self, screen, survival_time):
         """Draw the game over screen."""
-        # Create semi-transparent overlay
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-        overlay.set_alpha(128)
-        overlay.fill(COLORS["BLACK"])
-        screen.blit(overlay, (0, 0))
-
-        # Game Over text
-        game_over_text = self.large_font.render("Game Over", True, COLORS["WHITE"])
-        game_over_rect = game_over_text.get_rect(
-            center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 60)
-        )
-        screen.blit(game_over_text, game_over_rect)
+        menu = self.menus.get("game_over", screen.get_size(), self._build_game_over)
+        menu.draw(screen)
 
-        # Survival time
+        # Survival time is the only part that can change
+        width, height = screen.get_size()
         time_text = f"You survived: {survival_time} seconds"
-        time_surface = self.font.render(time_text, True, COLORS["WHITE"])
-        time_rect = time_surface.get_rect(
-            center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 10)
-        )
+        time_surface = self.render_text(self.font, time_text, COLORS["WHITE"])
+        time_rect = time_surface.get_rect(center=(width // 2, height // 2 - 10))
         screen.blit(time_surface, time_rect)
 
+    def _build_game_over(self, size):
+        """Compose the static parts of the game over screen."""
+        width, height = size
+
+        # Game Over text
+        game_over_text = self.render_text(self.large_font, "Game Over", COLORS["WHITE"])
+        game_over_rect = game_over_text.get_rect(center=(width // 2, height // 2 - 60))
+
         # Restart instruction
         restart_text = "Press R to restart"
-        restart_surface = self.font.render(restart_text, True, COLORS["YELLOW"])
-        restart_rect = restart_surface.get_rect(
-            center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 40)
+        restart_surface = self.render_text(self.font, restart_text, COLORS["YELLOW"])
+        restart_rect = restart_surface.get_rect(center=(width // 2, height // 2 + 40))
+
+        return ComposedMenu(
+            [
+                (self.menus.overlay(size), (0, 0)),
+                (game_over_text, game_over_rect),
+                (restart_surface, restart_rect),
+            ]
         )
-        screen.blit(restart_surface, restart_rect)
 
     def draw_pause_menu(self, screen):
         """Draw the pause menu."""
-        # Create semi-transparent overlay
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-        overlay.set_alpha(128)
-        overlay.fill(COLORS["BLACK"])
-        screen.blit(overlay, (0, 0))
+        menu = self.menus.get("pause", screen.get_size(), self._build_pause_menu)
+        menu.draw(screen)
+        return dict(menu.rects)
+
+    def _build_pause_menu(self, size):
+        """Compose the pause menu panel, including its labels."""
+        width, height = size
 
         # Menu background
         menu_width, menu_height = 300, 200
         menu_rect = pygame.Rect(
-            (SCREEN_WIDTH - menu_width) // 2,
-            (SCREEN_HEIGHT - menu_height) // 2,
+            (width - menu_width) // 2,
+            (height - menu_height) // 2,
             menu_width,
             menu_height,
         )
-        pygame.draw.rect(screen, COLORS["GRAY"], menu_rect)
-        pygame.draw.rect(screen, COLORS["WHITE"], menu_rect, 3)
+        panel = pygame.Surface(menu_rect.size)
+        panel.fill(COLORS["GRAY"])
+        pygame.draw.rect(panel, COLORS["WHITE"], panel.get_rect(), 3)
+
+        # Labels are positioned in screen space, then drawn onto the panel
+        offset = (-menu_rect.x, -menu_rect.y)
 
         # Pause title
-        pause_text = self.large_font.render("Paused", True, COLORS["WHITE"])
-        pause_rect = pause_text.get_rect(
-            center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 60)
-        )
-        screen.blit(pause_text, pause_rect)
+        pause_text = self.render_text(self.large_font, "Paused", COLORS["WHITE"])
+        pause_rect = pause_text.get_rect(center=(width // 2, height // 2 - 60))
+        panel.blit(pause_text, pause_rect.move(offset))
 
         # Resume button
-        resume_text = self.font.render("Resume (ESC)", True, COLORS["WHITE"])
-        resume_rect = resume_text.get_rect(
-            center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 10)
-        )
-        screen.blit(resume_text, resume_rect)
+        resume_text = self.render_text(self.font, "Resume (ESC)", COLORS["WHITE"])
+        resume_rect = resume_text.get_rect(center=(width // 2, height // 2 - 10))
+        panel.blit(resume_text, resume_rect.move(offset))
 
         # Quit instruction
-        quit_text = self.font.render("Quit (Q)", True, COLORS["WHITE"])
-        quit_rect = quit_text.get_rect(
-            center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 30)
-        )
-        screen.blit(quit_text, quit_rect)
+        quit_text = self.render_text(self.font, "Quit (Q)", COLORS["WHITE"])
+        quit_rect = quit_text.get_rect(center=(width // 2, height // 2 + 30))
+        panel.blit(quit_text, quit_rect.move(offset))
 
-        return {"resume": resume_rect, "quit": quit_rect}
+        return ComposedMenu(
+            [(self.menus.overlay(size), (0, 0)), (panel, menu_rect)],
+            {"resume": resume_rect, "quit": quit_rect},
+        )
 
     def draw_instructions(self, screen):
         """Draw basic control instructions (optional for MVP)."""
@@ -115,9 +144,11 @@ class UI:
             "R: Restart (when game over)",
         ]
 
-        y_offset = SCREEN_HEIGHT - len(instructions) * 25 - 10
+        y_offset = self.settings.screen_height - len(instructions) * 25 - 10
         for i, instruction in enumerate(instructions):
-            text_surface = self.small_font.render(instruction, True, COLORS["WHITE"])
+            text_surface = self.render_text(
+                self.small_font, instruction, COLORS["WHITE"]
+            )
             # Add background for readability
             text_rect = text_surface.get_rect()
             text_rect.x = 10
@@ -0,0 +1,341 @@
+"""
+Uniform sampling of free positions for spawning items.
+"""
+
+from array import array
+import pygame
+from .spatial import SpatialHashGrid
+
+# Position in FreeSpaceSampler._available of a cell that is not in it
+_UNAVAILABLE = -1
+
+
+def _overlaps(item, rect):
+    """Hit test between an indexed (x, y, w, h) obstacle and a rect."""
+    return rect.colliderect(item)
+
+
+def _subtract(rect, hole):
+    """Return the pieces of rect not covered by hole (at most four)."""
+    clip = rect.clip(hole)
+    if not clip.width or not clip.height:
+        return [rect]
+    pieces = []
+    if clip.top > rect.top:
+        pieces.append(pygame.Rect(rect.left, rect.top, rect.width, clip.top - rect.top))
+    if clip.bottom < rect.bottom:
+        pieces.append(
+            pygame.Rect(rect.left, clip.bottom, rect.width, rect.bottom - clip.bottom)
+        )
+    if clip.left > rect.left:
+        pieces.append(
+            pygame.Rect(rect.left, clip.top, clip.left - rect.left, clip.height)
+        )
+    if clip.right < rect.right:
+        pieces.append(
+            pygame.Rect(clip.right, clip.top, rect.right - clip.right, clip.height)
+        )
+    return pieces
+
+
+class FreeSpaceSampler:
+    """Samples uniformly among positions where an item fits without overlap.
+
+    Works in position space: ``bounds`` is the rect of allowed top-left
+    corners for a square item of ``item_size`` pixels. Each obstacle is
+    converted to the block of corners at which the item would overlap it,
+    and the remaining free space is kept as a list of disjoint rectangles.
+    A position is drawn in constant time by picking a rectangle weighted by
+    its area (Walker's alias method) and then a point inside it.
+
+    Adding an obstacle only splits the free rectangles it touches; removing
+    one gives back its block minus the obstacles still overlapping it. The
+    alias table is rebuilt lazily on the next sample after a change.
+
+    Blocked regions are counted in ``obstacles`` so identical ones can be
+    added more than once. Item-sized ones are indexed in a spatial grid, so
+    finding the obstacles that overlap a removed one costs time in the
+    number of nearby obstacles rather than all of them.
+
+    Changes cost time in the number of free rectangles and rebuild the
+    alias table, so the sampler suits static obstacles such as scenery.
+    Frequently changing items, such as already spawned food, are added as
+    occupants instead. Occupants work on a grid of ``cell_size`` squares of
+    positions (default: twice the item size): every cell holding a position at which an item would overlap
+    an occupant is excluded as a whole, so adding or removing one touches a
+    few cell counters. sample_unoccupied() picks among the cells left, so it
+    never returns a position overlapping an occupant and only fails when no
+    cell is left.
+    """
+
+    def __init__(self, bounds, item_size, obstacles=(), cell_size=None):
+        self.bounds = pygame.Rect(bounds)
+        self.item_size = item_size
+        # An occupant then excludes at most 2x2 cells, and the cell count
+        # (and so the cost of building them) stays small
+        self.cell_size = cell_size = cell_size or 2 * item_size
+        self.cols = max(0, -(-self.bounds.width // cell_size))
+        self.rows = max(0, -(-self.bounds.height // cell_size))
+        # Occupants blocking each cell, kept across obstacle changes
+        self.occupants = array("H", bytes(2 * self.cols * self.rows))
+        self.obstacles = {}
+        # Blocked regions up to twice the item size go in the grid
+        self.small_size = 2 * item_size
+        self.small_obstacles = SpatialHashGrid(self.small_size, self.small_size)
+        self.large_obstacles = []
+        self.free_rects = [self.bounds.copy()] if self._has_area(self.bounds) else []
+        self._table = None
+        self._cells = None
+        for obstacle in obstacles:
+            self.add_obstacle(obstacle)
+
+    @staticmethod
+    def _has_area(rect):
+        return rect.width > 0 and rect.height > 0
+
+    def _blocked_positions(self, rect):
+        """Return the corners at which an item would overlap rect, or None."""
+        rect = pygame.Rect(rect)
+        if not self._has_area(rect):
+            return None  # Empty rects never collide
+        size = self.item_size
+        return pygame.Rect(
+            rect.left - size + 1,
+            rect.top - size + 1,
+            rect.width + size - 1,
+            rect.height + size - 1,
+        )
+
+    def add_obstacle(self, rect):
+        """Exclude every position where an item would overlap rect."""
+        blocked = self._blocked_positions(rect)
+        if blocked is None:
+            return
+        key = tuple(blocked)
+        count = self.obstacles.get(key, 0)
+        self.obstacles[key] = count + 1
+        if count:
+            return  # Already carved out
+
+        if self._is_small(blocked):
+            self.small_obstacles.insert(key, blocked.x, blocked.y)
+        else:
+            self.large_obstacles.append(key)
+        self._carve(blocked)
+
+    def _is_small(self, blocked):
+        return blocked.width <= self.small_size and blocked.height <= self.small_size
+
+    def _overlapping(self, rect):
+        """Return the blocked regions overlapping rect."""
+        hits = list(self.small_obstacles.colliding(rect, _overlaps))
+        hits.extend(key for key in self.large_obstacles if rect.colliderect(key))
+        return hits
+
+    def _carve(self, blocked):
+        """Split every free rectangle overlapping a blocked region."""
+        free = self.free_rects
+        hits = blocked.collidelistall(free)
+        if not hits:
+            return
+        pieces = []
+        # Swap-remove from the back so pending indices stay valid
+        for index in reversed(hits):
+            pieces.extend(_subtract(free[index], blocked))
+            free[index] = free[-1]
+            free.pop()
+        free.extend(pieces)
+        self._table = None
+        self._cells = None
+
+    def remove_obstacle(self, rect):
+        """Undo a previous add_obstacle(rect)."""
+        blocked = self._blocked_positions(rect)
+        if blocked is None:
+            return
+        key = tuple(blocked)
+        count = self.obstacles.pop(key)
+        if count > 1:
+            self.obstacles[key] = count - 1
+            return  # Still blocked by its duplicate
+
+        if self._is_small(blocked):
+            self.small_obstacles.remove(key, blocked.x, blocked.y)
+        else:
+            self.large_obstacles.remove(key)
+
+        pieces = [blocked.clip(self.bounds)]
+        for other in self._overlapping(blocked):
+            pieces = [part for piece in pieces for part in _subtract(piece, other)]
+            if not pieces:
+                break
+        self.free_rects.extend(piece for piece in pieces if self._has_area(piece))
+        self._table = None
+        self._cells = None
+
+        # Repeated add/remove cycles fragment the free space; start over
+        # once the fragments clearly outnumber the obstacles
+        if len(self.free_rects) > 8 * (len(self.obstacles) + 8):
+            self.rebuild()
+
+    def rebuild(self):
+        """Recompute the free rectangles from the bounds and all obstacles."""
+        self.free_rects = [self.bounds.copy()] if self._has_area(self.bounds) else []
+        for key in self.obstacles:
+            self._carve(pygame.Rect(key))
+        self._table = None
+        self._cells = None
+
+    def _cell_range(self, rect):
+        """Return the (col, row) ranges of the cells overlapping a position rect."""
+        left = rect.left - self.bounds.left
+        top = rect.top - self.bounds.top
+        size = self.cell_size
+        cols = range(
+            max(0, left // size), min(self.cols, (left + rect.width - 1) // size + 1)
+        )
+        rows = range(
+            max(0, top // size), min(self.rows, (top + rect.height - 1) // size + 1)
+        )
+        return cols, rows
+
+    def _build_cells(self):
+        """Split the free rectangles by cell and list the unoccupied cells."""
+        count = self.cols * self.rows
+        pieces = [[] for _ in range(count)]
+        size = self.cell_size
+        left, top = self.bounds.topleft
+        for rect in self.free_rects:
+            cols, rows = self._cell_range(rect)
+            for row in rows:
+                for col in cols:
+                    cell = pygame.Rect(left + col * size, top + row * size, size, size)
+                    pieces[row * self.cols + col].append(rect.clip(cell))
+        areas = [sum(piece.width * piece.height for piece in cell) for cell in pieces]
+
+        self._positions = array("i", [_UNAVAILABLE]) * count
+        self._available = array("i")
+        self._cells = (pieces, areas)
+        for cell in range(count):
+            self._make_available(cell)
+
+    def _make_available(self, cell):
+        """Add a cell to the sampled cells if it has free, unoccupied space."""
+        if self._cells[1][cell] and not self.occupants[cell]:
+            self._positions[cell] = len(self._available)
+            self._available.append(cell)
+
+    def _make_unavailable(self, cell):
+        """Swap-remove a cell from the sampled cells."""
+        available = self._available
+        index = self._positions[cell]
+        if index == _UNAVAILABLE:
+            return
+        last = available.pop()
+        if last != cell:
+            available[index] = last
+            self._positions[last] = index
+        self._positions[cell] = _UNAVAILABLE
+
+    def add_occupant(self, rect):
+        """Exclude the cells where an item could overlap rect."""
+        blocked = self._blocked_positions(rect)
+        if blocked is None:
+            return
+        cols, rows = self._cell_range(blocked)
+        occupants = self.occupants
+        for row in rows:
+            for col in cols:
+                cell = row * self.cols + col
+                occupants[cell] += 1
+                if occupants[cell] == 1 and self._cells is not None:
+                    self._make_unavailable(cell)
+
+    def remove_occupant(self, rect):
+        """Undo a previous add_occupant(rect)."""
+        blocked = self._blocked_positions(rect)
+        if blocked is None:
+            return
+        cols, rows = self._cell_range(blocked)
+        occupants = self.occupants
+        for row in rows:
+            for col in cols:
+                cell = row * self.cols + col
+                occupants[cell] -= 1
+                if not occupants[cell] and self._cells is not None:
+                    self._make_available(cell)
+
+    def clear_occupants(self):
+        """Remove every occupant."""
+        self.occupants = array("H", bytes(2 * self.cols * self.rows))
+        self._cells = None
+
+    def sample_unoccupied(self, rng):
+        """Return a uniformly random free (x, y) in a cell without occupants.
+
+        Returns None if every cell with free space is occupied. A cell is
+        drawn in constant time and kept with probability proportional to its
+        free area, so the position is uniform over the unoccupied cells.
+        """
+        if self._cells is None:
+            self._build_cells()
+        available = self._available
+        if not available:
+            return None
+        pieces, areas = self._cells
+        full = self.cell_size * self.cell_size
+        while True:
+            cell = available[rng.randrange(len(available))]
+            area = areas[cell]
+            if area == full or rng.randrange(full) < area:
+                break
+
+        # Most cells hold a single piece; otherwise pick one by area
+        offset = rng.randrange(area)
+        for rect in pieces[cell]:
+            offset -= rect.width * rect.height
+            if offset < 0:
+                break
+        return rect.x + rng.randrange(rect.width), rect.y + rng.randrange(rect.height)
+
+    def free_area(self):
+        """Return the number of free positions."""
+        return sum(rect.width * rect.height for rect in self.free_rects)
+
+    def _build_table(self):
+        """Build the alias table for area-weighted rectangle selection."""
+        rects = list(self.free_rects)
+        count = len(rects)
+        total = sum(rect.width * rect.height for rect in rects)
+        prob = [rect.width * rect.height * count / total for rect in rects]
+        alias = list(range(count))
+
+        small = [i for i, p in enumerate(prob) if p < 1]
+        large = [i for i, p in enumerate(prob) if p >= 1]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            alias[less] = more
+            prob[more] += prob[less] - 1
+            (small if prob[more] < 1 else large).append(more)
+        for index in small + large:
+            prob[index] = 1.0
+
+        self._table = (rects, prob, alias)
+
+    def sample(self, rng):
+        """Return a uniformly random free (x, y), or None if there is none.
+
+        rng is a random.Random instance or the random module.
+        """
+        if not self.free_rects:
+            return None
+        if self._table is None:
+            self._build_table()
+        rects, prob, alias = self._table
+
+        u = rng.random() * len(rects)
+        index = int(u)
+        if u - index >= prob[index]:
+            index = alias[index]
+        rect = rects[index]
+        return rect.x + rng.randrange(rect.width), rect.y + rng.randrange(rect.height)
@@ -0,0 +1,29 @@
+"""
+Compact encodings for player input.
+"""
+
+from ..config.constants import MOVEMENT_KEYS
+
+# Bit i of a key mask corresponds to MOVEMENT_KEY_ORDER[i]
+MOVEMENT_KEY_ORDER = tuple(MOVEMENT_KEYS)
+MOVEMENT_MASK = (1 << len(MOVEMENT_KEY_ORDER)) - 1
+
+# One-shot actions triggered by a key press, stored above the movement bits
+ACTION_PAUSE = 1 << 8  # Escape: toggle the pause menu
+ACTION_RESTART = 1 << 9  # R: restart after game over
+ACTION_BITE = 1 << 10  # Space: bite
+ACTION_MASK = ACTION_PAUSE | ACTION_RESTART | ACTION_BITE
+
+
+def keys_to_mask(keys_pressed):
+    """Pack a keys_pressed dict into an 8-bit movement key mask."""
+    mask = 0
+    for bit, key in enumerate(MOVEMENT_KEY_ORDER):
+        if keys_pressed.get(key, False):
+            mask |= 1 << bit
+    return mask
+
+
+def mask_to_keys(mask):
+    """Unpack a movement key mask into a keys_pressed dict."""
+    return {key: bool(mask >> bit & 1) for bit, key in enumerate(MOVEMENT_KEY_ORDER)}
@@ -0,0 +1,93 @@
+"""
+Spatial indexing utilities.
+"""
+
+
+class SpatialHashGrid:
+    """Uniform grid index for small, axis-aligned items.
+
+    Each item is stored in the single cell containing its top-left corner.
+    Queries widen the searched cell range by ``max_item_size`` so items that
+    start in a neighbouring cell but reach into the query rect are found.
+    """
+
+    def __init__(self, cell_size, max_item_size):
+        self.cell_size = cell_size
+        self.max_item_size = max_item_size
+        self.cells = {}
+        self.count = 0
+
+    def insert(self, item, x, y):
+        """Add an item whose top-left corner is at (x, y)."""
+        key = (x // self.cell_size, y // self.cell_size)
+        cell = self.cells.get(key)
+        if cell is None:
+            cell = self.cells[key] = []
+        cell.append(item)
+        self.count += 1
+
+    def remove(self, item, x, y):
+        """Remove an item previously inserted at (x, y)."""
+        key = (x // self.cell_size, y // self.cell_size)
+        cell = self.cells[key]
+        cell.remove(item)
+        if not cell:
+            del self.cells[key]
+        self.count -= 1
+
+    def colliding(self, rect, hit_test):
+        """Return the items near rect for which hit_test(item, rect) is true.
+
+        Only the cells that can hold an overlapping item are visited. When
+        nothing matches, a shared empty tuple is returned so the common
+        no-hit case does not allocate a result list.
+        """
+        size = self.cell_size
+        x0 = (rect.left - self.max_item_size + 1) // size
+        x1 = (rect.right - 1) // size
+        y0 = (rect.top - self.max_item_size + 1) // size
+        y1 = (rect.bottom - 1) // size
+
+        cells = self.cells
+        hits = None
+        for cy in range(y0, y1 + 1):
+            for cx in range(x0, x1 + 1):
+                cell = cells.get((cx, cy))
+                if cell is None:
+                    continue
+                for item in cell:
+                    if hit_test(item, rect):
+                        if hits is None:
+                            hits = []
+                        hits.append(item)
+        return hits if hits is not None else ()
+
+    def first_colliding(self, rect, hit_test):
+        """Return one item near rect for which hit_test is true, or None.
+
+        Stops at the first match and never builds a result list.
+        """
+        size = self.cell_size
+        x0 = (rect.left - self.max_item_size + 1) // size
+        x1 = (rect.right - 1) // size
+        y0 = (rect.top - self.max_item_size + 1) // size
+        y1 = (rect.bottom - 1) // size
+
+        cells = self.cells
+        for cy in range(y0, y1 + 1):
+            for cx in range(x0, x1 + 1):
+                cell = cells.get((cx, cy))
+                if cell is None:
+                    continue
+                for item in cell:
+                    if hit_test(item, rect):
+                        return item
+        return None
+
+    def clear(self):
+        """Remove all items."""
+        self.cells.clear()
+        self.count = 0
+
+    def __len__(self):
+        return self.count
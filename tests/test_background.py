@@ -0,0 +1,56 @@
+"""
+Tests for the cached background layer.
+"""
+
+import pygame
+from newgame.config.constants import COLORS
+from newgame.config.settings import SCREEN_WIDTH, SCREEN_HEIGHT
+from newgame.entities.objects import Lodge, Dam
+from newgame.systems.background import BackgroundLayer
+
+
+class TestBackgroundLayer:
+    """Test background layer caching."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.lodge = Lodge(100, 200)
+        self.dam = Dam()
+        self.water_rect = pygame.Rect(0, 10, SCREEN_WIDTH, 100)
+        self.layer = BackgroundLayer([self.dam, self.lodge], self.water_rect)
+        self.screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+
+    def test_matches_direct_drawing(self):
+        """Test the cached layer looks like drawing the scenery directly."""
+        expected = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        expected.fill(COLORS["GREEN"])
+        pygame.draw.rect(expected, COLORS["BLUE"], self.water_rect)
+        self.dam.draw(expected)
+        self.lodge.draw(expected)
+
+        self.layer.draw(self.screen)
+        assert pygame.image.tobytes(self.screen, "RGB") == pygame.image.tobytes(
+            expected, "RGB"
+        )
+
+    def test_rendered_once(self):
+        """Test repeated draws reuse the cached surface."""
+        for _ in range(10):
+            self.layer.draw(self.screen)
+        assert self.layer.builds == 1
+
+    def test_area_draw(self):
+        """Test drawing a single region leaves the rest untouched."""
+        self.screen.fill(COLORS["BLACK"])
+        self.layer.draw(self.screen, pygame.Rect(0, 300, 10, 10))
+        assert self.screen.get_at((5, 305))[:3] == COLORS["GREEN"]
+        assert self.screen.get_at((50, 305))[:3] == COLORS["BLACK"]
+
+    def test_invalidated_by_screen_change(self):
+        """Test a differently sized screen or invalidate() rebuilds the layer."""
+        self.layer.draw(self.screen)
+        self.layer.draw(pygame.Surface((400, 300)))
+        assert self.layer.builds == 2
+        self.layer.invalidate()
+        self.layer.draw(self.screen)
+        assert self.layer.builds == 3
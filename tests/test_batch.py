@@ -0,0 +1,113 @@
+"""
+Tests for the vectorized batch simulator.
+"""
+
+import random
+import pytest
+from newgame.core.game import BeaverSurvivalGame
+from newgame.config.constants import ZONE_LAND
+from newgame.config.settings import (
+    FPS,
+    INITIAL_FOOD,
+    FOOD_DECREASE_INTERVAL,
+    FOOD_SIZE,
+    PLAYER_START_POSITION,
+    DEFAULT_SETTINGS,
+)
+from newgame.utils.input import keys_to_mask, mask_to_keys
+
+np = pytest.importorskip("numpy")
+from newgame.core.batch import BatchSimulator, ZONE_CODES  # noqa: E402
+
+NEVER = 10**9
+
+
+def test_key_mask_round_trip():
+    """Test key masks encode and decode every movement key combination."""
+    for mask in range(256):
+        assert keys_to_mask(mask_to_keys(mask)) == mask
+
+
+class TestBatchSimulator:
+    """Test the batch simulator against the scalar game rules."""
+
+    def test_initial_state(self):
+        """Test all games start like a fresh BeaverSurvivalGame."""
+        batch = BatchSimulator(4, seed=0)
+        assert (batch.player_x == PLAYER_START_POSITION[0]).all()
+        assert (batch.player_y == PLAYER_START_POSITION[1]).all()
+        assert (batch.food_amount == INITIAL_FOOD).all()
+        assert batch.alive.all()
+        assert ZONE_CODES[batch.zone[0]] == ZONE_LAND
+
+    def test_starvation(self):
+        """Test idle games starve at the same tick as the scalar game."""
+        batch = BatchSimulator(3, seed=0)
+        batch.spawn_interval[:] = NEVER
+        while batch.alive.any():
+            batch.step()
+        expected = INITIAL_FOOD * FOOD_DECREASE_INTERVAL * FPS // 1000
+        assert (batch.ticks == expected).all()
+        assert (batch.food_amount == 0).all()
+
+    def test_spawn_avoids_obstacles(self):
+        """Test spawned food never overlaps the lodge or dam."""
+        batch = BatchSimulator(200, max_food_items=8, seed=3)
+        for _ in range(FPS * 60):
+            batch.step()
+        lx, ly, lw, lh = batch.lodge_rect
+        xs = batch.food_x[batch.food_active]
+        ys = batch.food_y[batch.food_active]
+        assert len(xs) > 0
+        overlaps_lodge = (
+            (xs < lx + lw)
+            & (lx < xs + FOOD_SIZE)
+            & (ys < ly + lh)
+            & (ly < ys + FOOD_SIZE)
+        )
+        assert not overlaps_lodge.any()
+        assert (ys >= batch.dam_rect[3]).all()
+
+    @pytest.mark.parametrize(
+        "settings",
+        [
+            None,
+            DEFAULT_SETTINGS.replace(
+                screen_width=640, screen_height=480, player_size=16, food_size=10
+            ),
+        ],
+    )
+    def test_matches_scalar_game(self, settings):
+        """Test random input produces identical state in both engines."""
+        num_games = 6
+        rng = random.Random(1234)
+        batch = BatchSimulator(num_games, seed=0, settings=settings)
+        batch.spawn_interval[:] = NEVER
+        width, height = batch.settings.screen_size
+        games = []
+        for i in range(num_games):
+            game = BeaverSurvivalGame(headless=True, seed=i, settings=settings)
+            game.food_manager.spawn_interval = NEVER
+            for _ in range(40):
+                x, y = rng.randint(8, width - 20), rng.randint(18, height - 20)
+                food_type = rng.choice(["berry", "leaf"])
+                game.food_manager.add_food(x, y, food_type)
+                batch.place_food(i, x, y, food_type)
+            games.append(game)
+
+        masks = [0] * num_games
+        for _ in range(FPS * 60):
+            # Hold each key combination for a random number of ticks
+            for i in range(num_games):
+                if rng.random() < 0.05:
+                    masks[i] = rng.randrange(256)
+            batch.step(np.array(masks))
+            for i, game in enumerate(games):
+                game.step(mask_to_keys(masks[i]))
+
+            for i, game in enumerate(games):
+                assert batch.player_x[i] == game.player.rect.x
+                assert batch.player_y[i] == game.player.rect.y
+                assert ZONE_CODES[batch.zone[i]] == game.player.current_zone
+                assert batch.food_amount[i] == game.food_amount
+                assert batch.food_active[i].sum() == len(game.food_manager.food_items)
@@ -0,0 +1,224 @@
+"""
+Tests for the entity-component registry and its bulk systems.
+"""
+
+import random
+import pygame
+import pytest
+from newgame.config.settings import PLAYER_SIZE, PLAYER_SPEED, PLAYER_SPEED_LAND
+from newgame.core import ecs
+from newgame.core.ecs import Registry
+from newgame.entities.objects import Dam, Lodge
+from newgame.entities.player import Player
+from newgame.utils.input import mask_to_keys
+
+
+def beaver(registry, x, y, heading=(0, 0)):
+    """Create a moving beaver entity."""
+    return registry.create(
+        position={"x": x, "y": y, "prev_x": x, "prev_y": y},
+        body={"w": PLAYER_SIZE, "h": PLAYER_SIZE},
+        heading={"x": heading[0], "y": heading[1]},
+        velocity={},
+        speed={"land": PLAYER_SPEED_LAND, "water": PLAYER_SPEED},
+        zone={"code": ecs.LAND},
+        sprite={"index": registry.sprite_code("beaver")},
+    )
+
+
+class TestRegistry:
+    """Test entity storage and queries."""
+
+    def test_components_stored_in_columns(self):
+        """Test field values land in the component arrays."""
+        registry = Registry()
+        entity = beaver(registry, 10, 20)
+        assert registry["position"]["x"][entity] == 10
+        assert registry["position"]["y"][entity] == 20
+        assert registry.rect(entity) == pygame.Rect(10, 20, PLAYER_SIZE, PLAYER_SIZE)
+
+    def test_destroyed_ids_are_recycled(self):
+        """Test a destroyed entity's id and columns are reused and zeroed."""
+        registry = Registry()
+        first = beaver(registry, 10, 20)
+        beaver(registry, 30, 40)
+        registry.destroy(first)
+        assert not registry.alive(first)
+        assert len(registry) == 1
+        reused = registry.create(position={"y": 5})
+        assert reused == first
+        assert registry["position"]["x"][reused] == 0
+        assert not registry.has(reused, "body")
+        with pytest.raises(ValueError):
+            registry.destroy(99)
+
+    def test_query(self):
+        """Test queries match entities holding every named component."""
+        registry = Registry()
+        moving = beaver(registry, 0, 0)
+        wall = registry.create(position={}, body={}, blocker={})
+        assert list(registry.query("position", "body")) == [moving, wall]
+        assert list(registry.query("blocker")) == [wall]
+        assert list(registry.query("velocity", "blocker")) == []
+
+    def test_query_cache(self):
+        """Test query results are cached until the structure changes."""
+        registry = Registry()
+        entity = beaver(registry, 0, 0)
+        result = registry.query("velocity")
+        assert registry.query("velocity") is result
+        registry["position"]["x"][entity] = 50
+        assert registry.query("velocity") is result
+        registry.remove(entity, "velocity")
+        assert list(registry.query("velocity")) == []
+        registry.add(entity, "velocity", dx=1.0)
+        assert list(registry.query("velocity")) == [entity]
+
+    def test_duplicate_component(self):
+        """Test a component type cannot be registered twice."""
+        with pytest.raises(ValueError):
+            Registry().register("position", {"x": "i"})
+
+
+class TestSystems:
+    """Test the bulk systems."""
+
+    def test_move_matches_player(self):
+        """Test bulk movement follows exactly the rules of Player.update."""
+        registry = Registry()
+        dam = Dam(registry)
+        lodge = Lodge(170, 280, registry)
+        rng = random.Random(3)
+        players = [Player(rng.randrange(700), rng.randrange(500)) for _ in range(20)]
+        entities = [beaver(registry, *player.rect.topleft) for player in players]
+        blockers = registry.rects(registry.query("blocker"))
+        lodges = registry.rects(registry.query("lodge"))
+        heading = registry["heading"]
+        held = [{}] * len(players)
+
+        for tick in range(300):
+            for index, (player, entity) in enumerate(zip(players, entities)):
+                if tick % 20 == 0:
+                    held[index] = mask_to_keys(rng.randrange(256))
+                player.update(held[index], lodge.rect, dam.rect)
+                # Same heading for the bulk entity as the player computed
+                if any(held[index].values()):
+                    player_heading = player.registry["heading"]
+                    heading["x"][entity] = player_heading["x"][player.entity]
+                    heading["y"][entity] = player_heading["y"][player.entity]
+                else:
+                    heading["x"][entity] = heading["y"][entity] = 0
+            ecs.move(registry, entities, blockers)
+            ecs.update_zones(registry, entities, lodges)
+
+            for player, entity in zip(players, entities):
+                assert registry.rect(entity) == player.rect
+
+    def test_vectorized_matches_scalar(self, monkeypatch):
+        """Test the NumPy path moves many entities exactly like the loop."""
+        pytest.importorskip("numpy")
+        rng = random.Random(5)
+        registries = [Registry(), Registry()]
+        for registry in registries:
+            Dam(registry)
+            Lodge(170, 280, registry)
+        for _ in range(ecs.VECTORIZE_THRESHOLD * 4):
+            x, y = rng.randrange(780), rng.randrange(580)
+            heading = (rng.choice((-1, 0, 0.707, 1)), rng.choice((-1, 0, 0.707, 1)))
+            for registry in registries:
+                beaver(registry, x, y, heading)
+
+        def run(registry):
+            moving = registry.query("velocity")
+            blockers = registry.rects(registry.query("blocker"))
+            lodges = registry.rects(registry.query("lodge"))
+            for _ in range(200):
+                ecs.move(registry, moving, blockers)
+                ecs.update_zones(registry, moving, lodges)
+
+        run(registries[0])
+        monkeypatch.setattr(ecs, "np", None)
+        run(registries[1])
+        for component in ("position", "velocity", "zone"):
+            vectorized, scalar = (registry[component] for registry in registries)
+            assert vectorized.columns == scalar.columns
+
+    def test_blockers_stop_movement(self):
+        """Test an entity cannot move into a blocker or out of bounds."""
+        registry = Registry()
+        Dam(registry)
+        up = beaver(registry, 100, 12, heading=(0, -1))
+        left = beaver(registry, 4, 300, heading=(-1, 0))
+        blockers = registry.rects(registry.query("blocker"))
+        for _ in range(10):
+            ecs.move(registry, (up, left), blockers)
+        assert registry["position"]["y"][up] == 10
+        assert registry["position"]["x"][left] == 0
+        assert registry["velocity"]["dx"][left] == -PLAYER_SPEED_LAND
+
+    def test_zones(self):
+        """Test zones follow the lodge and the water line."""
+        registry = Registry()
+        lodge = Lodge(200, 300, registry)
+        in_lodge = beaver(registry, 210, 310)
+        swimming = beaver(registry, 400, 20)
+        walking = beaver(registry, 400, 400)
+        ecs.update_zones(
+            registry, registry.query("velocity"), registry.rects([lodge.entity])
+        )
+        zones = registry["zone"]["code"]
+        assert zones[in_lodge] == ecs.LODGE
+        assert zones[swimming] == ecs.WATER
+        assert zones[walking] == ecs.LAND
+
+    def test_find_contacts(self):
+        """Test collectors find the pickups they overlap."""
+        registry = Registry()
+        collector = beaver(registry, 100, 100)
+        registry.add(collector, "collector")
+        pickups = [
+            registry.create(
+                position={"x": x, "y": 105}, body={"w": 8, "h": 8}, pickup={}
+            )
+            for x in (95, 110, 130, 500)
+        ]
+        contacts = ecs.find_contacts(
+            registry, registry.query("collector"), registry.query("pickup")
+        )
+        assert sorted(contacts) == [(collector, pickups[0]), (collector, pickups[1])]
+
+    def test_draw_sprites(self):
+        """Test sprites are drawn at interpolated positions."""
+        registry = Registry()
+        entity = beaver(registry, 100, 100, heading=(1, 0))
+        ecs.move(registry, (entity,), ())
+        screen = pygame.Surface((800, 600))
+        ecs.draw_sprites(registry, screen, (entity,), alpha=0)
+        assert screen.get_at((100, 110)) != (0, 0, 0)
+        screen.fill((0, 0, 0))
+        ecs.draw_sprites(registry, screen, (entity,))
+        assert screen.get_at((100, 110)) == (0, 0, 0)
+        assert screen.get_at((100 + PLAYER_SPEED_LAND, 110)) != (0, 0, 0)
+
+
+class TestFacades:
+    """Test the entity classes stored in a shared registry."""
+
+    def test_player_in_shared_registry(self):
+        """Test a player is one entity of the registry it was given."""
+        registry = Registry()
+        player = Player(100, 200, registry)
+        other = Player(300, 200, registry)
+        assert list(registry.query("collector")) == [player.entity, other.entity]
+        player.rect = (150, 250)
+        assert registry["position"]["x"][player.entity] == 150
+        assert other.rect.topleft == (300, 200)
+
+    def test_lodge_and_dam(self):
+        """Test the lodge and dam are tagged for the zone and movement systems."""
+        registry = Registry()
+        lodge = Lodge(170, 280, registry)
+        dam = Dam(registry)
+        assert list(registry.query("lodge")) == [lodge.entity]
+        assert list(registry.query("blocker")) == [dam.entity]
+        assert lodge.get_collision_rect() == pygame.Rect(170, 280, 60, 40)
@@ -0,0 +1,118 @@
+"""
+Tests for the gym-style environments.
+"""
+
+import random
+import pygame
+import pytest
+from newgame.config.settings import (
+    FPS,
+    FOOD_COLLECTION_AMOUNT,
+    FOOD_DECREASE_INTERVAL,
+    INITIAL_FOOD,
+    PLAYER_START_POSITION,
+)
+
+np = pytest.importorskip("numpy")
+from newgame.core.env import STATE_FIELDS, BeaverEnv, VectorEnv  # noqa: E402
+from newgame.utils.input import MOVEMENT_KEY_ORDER  # noqa: E402
+
+# Key mask holding only D (move right)
+RIGHT = 1 << MOVEMENT_KEY_ORDER.index(pygame.K_d)
+
+
+def play(env, steps, seed=0):
+    """Step an env with random actions, returning every state."""
+    rng = random.Random(seed)
+    return [env.step(rng.randrange(256))[0] for _ in range(steps)]
+
+
+class TestBeaverEnv:
+    """Test resets, rewards and states of a single environment."""
+
+    def test_seeded_reset_replays(self):
+        """Test the same seed gives the same episode."""
+        env = BeaverEnv()
+        env.reset(seed=7)
+        first = play(env, 300)
+        env.reset(seed=7)
+        assert all((a == b).all() for a, b in zip(first, play(env, 300)))
+
+    def test_state_and_rewards(self):
+        """Test the state vector and food rewards."""
+        env = BeaverEnv(seed=1)
+        state = env.reset()
+        assert state.shape == (len(STATE_FIELDS),)
+        assert tuple(state[:2]) == PLAYER_START_POSITION
+        assert state[3] == INITIAL_FOOD
+
+        env.game.food_manager.clear()
+        x, y = PLAYER_START_POSITION
+        env.game.food_manager.add_food(x + 60, y + 6)
+        state = env.get_state()
+        assert tuple(state[4:]) == (54, 0, 1)
+
+        rewards = [env.step(RIGHT)[1] for _ in range(30)]
+        assert FOOD_COLLECTION_AMOUNT in rewards
+        assert env.get_state()[6] == 0
+
+        interval = FOOD_DECREASE_INTERVAL * FPS // 1000
+        rewards = [env.step(0)[1] for _ in range(interval)]
+        assert sorted(rewards) == [-1] + [0] * (interval - 1)
+
+    def test_done(self):
+        """Test episodes end on starvation or after max_steps."""
+        env = BeaverEnv(seed=2, max_steps=10)
+        env.reset()
+        results = [env.step(0) for _ in range(10)]
+        assert [done for _, _, done, _ in results] == [False] * 9 + [True]
+        assert results[-1][3]["truncated"]
+
+        env = BeaverEnv(seed=2)
+        env.reset()
+        env.game.food_amount = 1
+        _, reward, done, info = env.step(0)
+        while not done:
+            _, reward, done, info = env.step(0)
+        assert reward == -1
+        assert not info["truncated"]
+
+    def test_errors_and_render(self):
+        """Test bad use raises and frames are only drawn on request."""
+        env = BeaverEnv(seed=3)
+        with pytest.raises(RuntimeError):
+            env.step(0)
+        env.reset()
+        with pytest.raises(ValueError):
+            env.step(256)
+        assert env.render().shape == (600, 800, 3)
+
+
+class TestVectorEnv:
+    """Test environments stepped in worker processes."""
+
+    def test_independent_of_workers(self):
+        """Test the results only depend on the seed, not the worker count."""
+
+        def run(workers):
+            rng = np.random.default_rng(0)
+            with VectorEnv(5, seed=4, workers=workers) as envs:
+                steps = [envs.reset().copy()]
+                for _ in range(200):
+                    states, rewards, dones = envs.step(rng.integers(0, 256, 5))
+                    steps.append(np.concatenate([states.ravel(), rewards, dones]))
+                return steps
+
+        assert all((a == b).all() for a, b in zip(run(1), run(2)))
+
+    def test_autoreset_and_render(self):
+        """Test done environments start their next episode right away."""
+        with VectorEnv(3, seed=5, max_steps=20, workers=2) as envs:
+            first = envs.reset().copy()
+            for _ in range(20):
+                states, rewards, dones = envs.step([RIGHT] * 3)
+            assert dones.all()
+            assert (states[:, :2] == PLAYER_START_POSITION).all()
+            assert (states[:, 3] == INITIAL_FOOD).all()
+            assert envs.render(2).shape == (600, 800, 3)
+            assert (envs.reset(seed=5) == first).all()
@@ -2,8 +2,10 @@
 Tests for game objects.
 """
 
+import random
 import pytest
 import pygame
+from newgame.core.clock import SimulationClock
 from newgame.entities.objects import Lodge, Dam
 from newgame.entities.food import FoodItem, FoodManager
 from newgame.config.settings import (
@@ -11,6 +13,7 @@ from newgame.config.settings import (
     LODGE_HEIGHT,
     DAM_HEIGHT,
     SCREEN_WIDTH,
+    SCREEN_HEIGHT,
     FOOD_SIZE,
 )
 
@@ -56,3 +59,112 @@ class TestGameObjects:
         assert len(food_manager.food_items) == 0
         assert food_manager.lodge_rect == lodge_rect
         assert food_manager.dam_rect == dam_rect
+
+    def test_food_collection(self):
+        """Test food under the player is collected and removed."""
+        food_manager = FoodManager(pygame.Rect(0, 0, 0, 0), pygame.Rect(0, 0, 0, 0))
+        near = food_manager.add_food(105, 105)
+        far = food_manager.add_food(400, 400)
+
+        collected = food_manager.check_collection(pygame.Rect(100, 100, 20, 20))
+        assert collected == [near]
+        assert list(food_manager.food_items) == [far]
+        assert len(food_manager.food_grid) == 1
+
+    def test_food_collection_nothing_collected(self):
+        """Test a miss returns an empty result without touching the items."""
+        food_manager = FoodManager(pygame.Rect(0, 0, 0, 0), pygame.Rect(0, 0, 0, 0))
+        for i in range(1000):
+            food_manager.add_food(200 + (i % 40) * 10, 200 + (i // 40) * 10)
+
+        assert food_manager.check_collection(pygame.Rect(10, 10, 20, 20)) == ()
+        assert food_manager.collect(pygame.Rect(10, 10, 20, 20)) == 0
+        assert len(food_manager.food_items) == 1000
+
+    def test_collect_counts_items(self):
+        """Test collect() removes touching food and returns the count."""
+        food_manager = FoodManager(pygame.Rect(0, 0, 0, 0), pygame.Rect(0, 0, 0, 0))
+        food_manager.add_food(100, 100)
+        food_manager.add_food(110, 110, "leaf")
+        food_manager.add_food(300, 300)
+        assert food_manager.collect(pygame.Rect(100, 100, 20, 20)) == 2
+        assert len(food_manager.food_items) == 1
+
+    def test_food_slots_are_reused(self):
+        """Test collected slots are recycled instead of growing storage."""
+        food_manager = FoodManager(pygame.Rect(0, 0, 0, 0), pygame.Rect(0, 0, 0, 0))
+        for i in range(10):
+            food_manager.add_food(i * 20, 100)
+        food_manager.collect(pygame.Rect(0, 100, 60, 8))
+        for i in range(3):
+            food_manager.add_food(i * 20, 300, "leaf")
+
+        assert len(food_manager.food_type) == 10
+        assert len(food_manager.food_items) == 10
+        assert not food_manager.free_slots
+        assert sorted(f.food_type for f in food_manager.food_items).count("leaf") == 3
+
+    def test_remove_food(self):
+        """Test removing an item, and rejecting stale or unknown items."""
+        food_manager = FoodManager(pygame.Rect(0, 0, 0, 0), pygame.Rect(0, 0, 0, 0))
+        food = food_manager.add_food(50, 50)
+        food_manager.remove_food(food)
+        assert len(food_manager.food_items) == 0
+        with pytest.raises(ValueError):
+            food_manager.remove_food(food)
+        with pytest.raises(ValueError):
+            food_manager.remove_food(FoodItem(50, 50))
+
+    def test_spawned_food_does_not_overlap(self):
+        """Test spawned food avoids the lodge, dam and other food."""
+        lodge_rect = pygame.Rect(100, 150, LODGE_WIDTH, LODGE_HEIGHT)
+        dam_rect = pygame.Rect(0, 0, SCREEN_WIDTH, DAM_HEIGHT)
+        food_manager = FoodManager(lodge_rect, dam_rect, rng=random.Random(0))
+        for _ in range(500):
+            assert food_manager._spawn_food()
+
+        rects = [food.rect for food in food_manager.food_items]
+        assert len(rects) == 500
+        for i, rect in enumerate(rects):
+            assert not rect.colliderect(lodge_rect)
+            assert not rect.colliderect(dam_rect)
+            assert rect.collidelist(rects[i + 1 :]) == -1
+
+    def test_full_screen_retries_spawn(self):
+        """Test a spawn with no room is counted and retried, not skipped."""
+        clock = SimulationClock()
+        food_manager = FoodManager(
+            pygame.Rect(100, 150, LODGE_WIDTH, LODGE_HEIGHT),
+            pygame.Rect(0, 0, SCREEN_WIDTH, DAM_HEIGHT),
+            clock=clock,
+            rng=random.Random(2),
+        )
+        while food_manager._spawn_food():
+            pass
+        count = len(food_manager.food_items)
+        last_spawn_time = food_manager.last_spawn_time
+        clock.advance(food_manager.spawn_interval)
+        for _ in range(3):
+            food_manager.update()
+        assert food_manager.failed_spawns == 3
+        assert food_manager.last_spawn_time == last_spawn_time
+        assert len(food_manager.food_items) == count
+
+        food_manager.remove_food(next(iter(food_manager.food_items)))
+        food_manager.update()
+        assert food_manager.failed_spawns == 3
+        assert food_manager.last_spawn_time == clock.get_ticks()
+        assert len(food_manager.food_items) == count
+
+    def test_food_leaves_spawn_space_alone(self):
+        """Test items are rejected at spawn time, not carved from free space."""
+        food_manager = FoodManager(
+            pygame.Rect(100, 150, LODGE_WIDTH, LODGE_HEIGHT),
+            pygame.Rect(0, 0, SCREEN_WIDTH, DAM_HEIGHT),
+            rng=random.Random(1),
+        )
+        free_rects = list(food_manager.free_space.free_rects)
+        for _ in range(50):
+            food_manager._spawn_food()
+        food_manager.collect(pygame.Rect(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT))
+        assert food_manager.free_space.free_rects == free_rects
@@ -0,0 +1,166 @@
+"""
+Tests for the headless fixed-timestep simulation mode.
+"""
+
+import pygame
+import pytest
+from newgame.core.clock import SimulationClock
+from newgame.core.game import BeaverSurvivalGame
+from newgame.core.game_state import GameStateManager
+from newgame.config.settings import (
+    FPS,
+    INITIAL_FOOD,
+    FOOD_DECREASE_INTERVAL,
+    FOOD_SPAWN_INTERVAL,
+    DEFAULT_SETTINGS,
+)
+from newgame.main import parse_args
+
+
+class TestSimulationClock:
+    """Test the deterministic simulation clock."""
+
+    def test_starts_at_zero(self):
+        """Test a new clock reports time zero."""
+        assert SimulationClock().get_ticks() == 0
+
+    def test_advance(self):
+        """Test advancing one second worth of ticks."""
+        clock = SimulationClock()
+        clock.advance(FPS)
+        assert clock.get_ticks() == 1000
+
+    def test_no_drift(self):
+        """Test time is derived from the tick count without drift."""
+        clock = SimulationClock(fps=60)
+        for _ in range(60 * 3600):
+            clock.advance()
+        assert clock.get_ticks() == 3600 * 1000
+
+
+class TestHeadlessGame:
+    """Test running the game without a display."""
+
+    def test_no_window_opened(self):
+        """Test headless games render into an off-screen surface."""
+        game = BeaverSurvivalGame(headless=True)
+        assert isinstance(game.game_clock, SimulationClock)
+        assert game.screen is not pygame.display.get_surface()
+
+    def test_food_decreases_with_simulated_time(self):
+        """Test food storage drains according to simulated time."""
+        game = BeaverSurvivalGame(headless=True, seed=1)
+        ticks_per_decrease = FOOD_DECREASE_INTERVAL * FPS // 1000
+        game.run_headless(ticks_per_decrease * 10)
+        assert game.food_amount == INITIAL_FOOD - 10
+
+    def test_food_spawns_with_simulated_time(self):
+        """Test food spawns without any wall-clock time passing."""
+        game = BeaverSurvivalGame(headless=True, seed=1)
+        game.run_headless(FOOD_SPAWN_INTERVAL[1] * FPS // 1000 + 1)
+        assert len(game.food_manager.food_items) >= 1
+
+    def test_runs_until_game_over(self):
+        """Test an idle beaver eventually starves and the run stops early."""
+        game = BeaverSurvivalGame(headless=True, seed=1)
+        limit = (INITIAL_FOOD + 1) * FOOD_DECREASE_INTERVAL * FPS // 1000
+        simulated = game.run_headless(limit)
+        assert game.game_state.is_game_over()
+        assert simulated <= limit
+        assert game.game_state.get_survival_time() == simulated // FPS
+
+    def test_seed_is_deterministic(self):
+        """Test two games with the same seed spawn identical food."""
+        positions = []
+        for _ in range(2):
+            game = BeaverSurvivalGame(headless=True, seed=42)
+            game.run_headless(FPS * 120)
+            positions.append(
+                [
+                    (f.rect.x, f.rect.y, f.food_type)
+                    for f in game.food_manager.food_items
+                ]
+            )
+        assert positions[0] == positions[1]
+        assert positions[0]
+
+    def test_movement(self):
+        """Test stepping with held keys moves the player."""
+        game = BeaverSurvivalGame(headless=True)
+        start_x = game.player.rect.x
+        game.step({pygame.K_d: True})
+        assert game.player.rect.x > start_x
+
+
+class TestFixedTimestepLoop:
+    """Test the accumulator-based loop used by run()."""
+
+    @pytest.mark.parametrize("render_hz", [30, 60, 144])
+    def test_speed_independent_of_frame_rate(self, render_hz):
+        """Test two seconds of play simulate the same at any frame rate."""
+        game = BeaverSurvivalGame(headless=True, seed=1)
+        game.keys_pressed = {pygame.K_d: True}
+        for _ in range(render_hz * 2):
+            game.advance_frame(1 / render_hz)
+        assert abs(game.game_clock.ticks - FPS * 2) <= 1
+        assert 0 <= game.render_alpha < 1
+
+    def test_fractional_frames_interpolate(self):
+        """Test frames shorter than a step draw between two positions."""
+        game = BeaverSurvivalGame(headless=True, seed=1)
+        game.keys_pressed = {pygame.K_d: True}
+        game.advance_frame(1 / FPS)
+        assert game.advance_frame(0.5 / FPS) == 0
+        game.draw()
+        player = game.player
+        assert player.previous_rect.x < player.draw_rect.x < player.rect.x
+
+    def test_frame_skip_limit(self):
+        """Test a long stall runs a bounded number of steps, then slows."""
+        settings = DEFAULT_SETTINGS.replace(max_frame_skip=3)
+        game = BeaverSurvivalGame(headless=True, settings=settings)
+        assert game.advance_frame(10.0) == 4
+        assert game.accumulator == 0.0
+        assert game.advance_frame(1 / FPS) == 1
+
+    def test_no_frame_skip(self):
+        """Test frame skipping can be turned off."""
+        settings = DEFAULT_SETTINGS.replace(max_frame_skip=0)
+        game = BeaverSurvivalGame(headless=True, settings=settings)
+        assert game.advance_frame(3 / FPS) == 1
+
+
+def test_game_state_uses_injected_clock():
+    """Test survival time is measured on the injected clock."""
+    clock = SimulationClock()
+    game_state = GameStateManager(clock)
+    clock.advance(FPS * 5)
+    assert game_state.get_survival_time() == 5
+
+
+def test_parse_headless_args():
+    """Test the headless command-line options."""
+    args = parse_args(["--headless", "--ticks", "100", "--seed", "7"])
+    assert args.headless
+    assert args.ticks == 100
+    assert args.seed == 7
+
+
+def test_parse_args_defaults_from_settings(monkeypatch):
+    """Test option defaults come from the loaded settings and override them."""
+    monkeypatch.setenv("NEWGAME_FPS", "30")
+    monkeypatch.setenv("NEWGAME_MAX_RENDER_FPS", "75")
+    args = parse_args(["--headless", "--frame-skip", "2"])
+    assert args.ticks == 30 * 60
+    assert args.max_fps == 75
+    assert args.game_settings.fps == 30
+    assert args.game_settings.max_render_fps == 75
+    assert args.game_settings.max_frame_skip == 2
+
+
+def test_record_rejects_save():
+    """Test a recording cannot resume from a save file."""
+    with pytest.raises(SystemExit):
+        parse_args(["--record", "game.bqr", "--save", "game.bqs"])
+    args = parse_args(["--record", "game.bqr", "--autopilot", "--trace", "t.json"])
+    assert args.autopilot and args.trace == "t.json"
@@ -0,0 +1,193 @@
+"""
+Tests for navigation grids, flow fields and the autopilot.
+"""
+
+import pygame
+from newgame.config.settings import FPS, NAV_CELL_SIZE
+from newgame.core import ecs
+from newgame.core.game import BeaverSurvivalGame
+from newgame.core.replay import Replay, ReplayPlayer
+from newgame.entities.objects import Dam
+from newgame.entities.player import Player
+from newgame.systems.navigation import (
+    Autopilot,
+    FlowField,
+    NavGrid,
+    Navigator,
+    UNREACHABLE,
+    heading_to_keys,
+    steer,
+)
+
+CELL = NAV_CELL_SIZE
+
+
+def centre(col, row):
+    """Return the pixel centre of a grid cell."""
+    return (col * CELL + CELL // 2, row * CELL + CELL // 2)
+
+
+class TestNavGrid:
+    """Test walkable cells derived from obstacle rects."""
+
+    def test_dam_blocks_top_row(self):
+        """Test cells an agent would overlap the dam from are blocked."""
+        grid = NavGrid([Dam().rect])
+        assert grid.blocked[grid.cell_at(*centre(5, 0))]
+        assert not grid.blocked[grid.cell_at(*centre(5, 1))]
+
+    def test_obstacles_change_revision(self):
+        """Test only a real change of obstacles bumps the revision."""
+        grid = NavGrid([(100, 100, 40, 40)])
+        revision = grid.revision
+        assert not grid.set_obstacles([pygame.Rect(100, 100, 40, 40)])
+        assert grid.revision == revision
+        assert grid.set_obstacles([(300, 300, 40, 40)])
+        assert grid.revision == revision + 1
+        assert not grid.blocked[grid.cell_at(110, 110)]
+
+    def test_empty_rects_ignored(self):
+        """Test empty stand-in rects block nothing."""
+        grid = NavGrid([(0, 0, 0, 0)])
+        assert not any(grid.blocked)
+
+
+class TestFlowField:
+    """Test distance fields and their caching."""
+
+    def test_distances(self):
+        """Test distances count orthogonal steps to the nearest target."""
+        field = FlowField(NavGrid())
+        field.set_targets([centre(2, 2), centre(10, 2)])
+        assert field.distance(*centre(2, 2)) == 0
+        assert field.distance(*centre(5, 4)) == 5
+        assert field.distance(*centre(9, 3)) == 2
+
+    def test_heading_goes_around_walls(self):
+        """Test following the field leads around an obstacle to the target."""
+        wall = (10 * CELL, 0, CELL, 20 * CELL)
+        field = FlowField(NavGrid([wall], agent_size=0))
+        field.set_targets([centre(15, 2)])
+        col, row = 5, 2
+        for _ in range(100):
+            if field.distance(*centre(col, row)) == 0:
+                break
+            dx, dy = field.heading(*centre(col, row))
+            col += dx
+            row += dy
+        assert (col, row) == (15, 2)
+        # The detour goes below the wall
+        assert field.distance(*centre(5, 2)) > 10
+
+    def test_unreachable(self):
+        """Test there is no heading where no target can be reached."""
+        box = [(0, 100, 220, 20), (0, 300, 220, 20), (200, 100, 20, 220)]
+        field = FlowField(NavGrid(box, agent_size=0))
+        field.set_targets([(50, 200)])
+        assert field.distance(500, 500) == UNREACHABLE
+        assert field.heading(500, 500) is None
+
+    def test_cached_until_targets_change(self):
+        """Test unchanged target cells are not searched again."""
+        field = FlowField(NavGrid())
+        field.set_targets([(100, 100)])
+        assert not field.set_targets([(105, 105)])
+        assert field.recomputes == 1
+
+    def test_added_targets_relax_incrementally(self):
+        """Test adding targets updates the field without a full search."""
+        grid = NavGrid([Dam().rect])
+        field = FlowField(grid)
+        field.set_targets([(100, 100)])
+        field.set_targets([(100, 100), (600, 400)])
+        assert field.recomputes == 1
+        assert field.relaxes == 1
+
+        fresh = FlowField(grid)
+        fresh.set_targets([(100, 100), (600, 400)])
+        assert field.distances == fresh.distances
+
+    def test_removed_targets_and_obstacles_recompute(self):
+        """Test removing targets or moving obstacles searches again."""
+        grid = NavGrid()
+        field = FlowField(grid)
+        field.set_targets([(100, 100), (600, 400)])
+        field.set_targets([(600, 400)])
+        assert field.recomputes == 2
+        assert field.distance(100, 100) > 0
+        grid.set_obstacles([(300, 300, 40, 40)])
+        field.set_targets([(600, 400)])
+        assert field.recomputes == 3
+
+
+class TestNavigator:
+    """Test shared fields and steering."""
+
+    def test_fields_are_shared(self):
+        """Test many agents follow one field that is searched once."""
+        navigator = Navigator([Dam().rect])
+        registry = ecs.Registry()
+        players = [Player(x, 500, registry) for x in range(20, 780, 40)]
+        field = navigator.toward_rect("player", (400, 200, 20, 20))
+        agents = registry.query("heading")
+        for _ in range(FPS * 10):
+            steer(registry, agents, navigator.toward_rect("player", (400, 200, 20, 20)))
+            ecs.move(registry, agents)
+        assert field.recomputes == 1
+        for player in players:
+            x, y = player.rect.center
+            assert abs(x - 410) < CELL and abs(y - 210) < CELL
+
+    def test_food_field_follows_revision(self):
+        """Test the food field is only refreshed when food changes."""
+        game = BeaverSurvivalGame(headless=True, seed=1)
+        navigator = Navigator()
+        game.food_manager.add_food(100, 400)
+        field = navigator.toward_food(game.food_manager)
+        assert field.distance(104, 404) == 0
+        navigator.toward_food(game.food_manager)
+        assert field.recomputes == 1
+        game.food_manager.add_food(600, 400)
+        navigator.toward_food(game.food_manager)
+        assert field.relaxes == 1
+
+    def test_heading_to_keys(self):
+        """Test headings map to movement keys."""
+        assert heading_to_keys(None) == {}
+        assert heading_to_keys((0, 0)) == {}
+        assert heading_to_keys((1, -1)) == {pygame.K_d: True, pygame.K_w: True}
+
+
+class TestAutopilot:
+    """Test the food-seeking bot."""
+
+    def test_collects_food(self):
+        """Test the bot walks to food and picks it up."""
+        game = BeaverSurvivalGame(headless=True, seed=1, autopilot=Autopilot())
+        game.food_manager.add_food(100, 500)
+        game.food_manager.add_food(700, 150)
+        food = game.food_amount
+        game.run_headless(FPS * 20)
+        assert len(game.food_manager.food_items) == 0
+        assert game.food_amount > food
+
+    def test_outlives_idle_beaver(self):
+        """Test the bot survives where an idle beaver starves."""
+        ticks = FPS * 60 * 10
+        idle = BeaverSurvivalGame(headless=True, seed=2)
+        idle.run_headless(ticks)
+        bot = BeaverSurvivalGame(headless=True, seed=2, autopilot=Autopilot())
+        bot.run_headless(ticks)
+        assert idle.game_state.is_game_over()
+        assert bot.game_state.is_playing()
+
+    def test_autopilot_replays(self):
+        """Test a recorded autopilot game replays without the bot."""
+        replay = Replay(3)
+        game = BeaverSurvivalGame(
+            headless=True, seed=3, recorder=replay, autopilot=Autopilot()
+        )
+        game.run_headless(FPS * 60)
+        replayed = ReplayPlayer(replay).run()
+        assert replayed.player.rect == game.player.rect
+        assert replayed.food_amount == game.food_amount
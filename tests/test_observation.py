@@ -0,0 +1,83 @@
+"""
+Tests for pixel observations.
+"""
+
+import pygame
+import pytest
+
+np = pytest.importorskip("numpy")
+from newgame.core.game import BeaverSurvivalGame  # noqa: E402
+from newgame.systems.observation import Observer, pixel_view  # noqa: E402
+
+
+class TestPixelView:
+    """Test zero-copy views of a surface."""
+
+    def test_view_shares_pixels(self):
+        """Test the view reads and writes the surface itself."""
+        surface = pygame.Surface((40, 30))
+        surface.fill((10, 20, 30))
+        with pixel_view(surface) as pixels:
+            assert pixels.shape == (30, 40, 3)
+            assert tuple(pixels[29, 39]) == (10, 20, 30)
+            pixels[5, 7] = (200, 100, 50)
+            del pixels
+        assert tuple(surface.get_at((7, 5)))[:3] == (200, 100, 50)
+        # The surface is unlocked again and can be drawn on
+        surface.blit(pygame.Surface((10, 10)), (0, 0))
+
+
+class TestObserver:
+    """Test downsampled grayscale frames and frame stacks."""
+
+    def test_grayscale(self):
+        """Test a flat colour becomes its luma at the downsampled size."""
+        game = BeaverSurvivalGame(headless=True, seed=1)
+        observer = Observer(game, downsample=8, stack=1)
+        assert observer.frames.shape == (1, 75, 100)
+        game.screen.fill((255, 0, 0))
+        observer.grayscale(game.screen, observer.frame)
+        assert (observer.frame == 76).all()
+        game.screen.fill((255, 255, 255))
+        observer.grayscale(game.screen, observer.frame)
+        assert (observer.frame == 255).all()
+
+    def test_frame_stack(self):
+        """Test frames are written into one ring and stacked oldest first."""
+        game = BeaverSurvivalGame(headless=True, seed=1)
+        observer = Observer(game, stack=3)
+        first = observer.reset().copy()
+        frames = observer.frames
+        assert (frames == first).all()
+
+        game.run_headless(30, {pygame.K_d: True})
+        second = observer.observe()
+        assert observer.frames is frames
+        assert np.shares_memory(second, frames)
+        assert (second != first).any()
+        stack = observer.stacked()
+        assert (stack[1] == first).all()
+        assert (stack[2] == second).all()
+
+        game.run_headless(30, {pygame.K_d: True})
+        third = observer.observe()
+        game.run_headless(30, {pygame.K_d: True})
+        observer.observe()
+        stack = observer.stacked()
+        assert (stack[0] == second).all()
+        assert (stack[1] == third).all()
+        assert (stack[2] == observer.frame).all()
+        assert stack.dtype == np.uint8
+
+    def test_dummy_video_driver(self, monkeypatch):
+        """Test a windowed game can be observed under the dummy driver."""
+        monkeypatch.setenv("SDL_VIDEODRIVER", "dummy")
+        pygame.display.quit()
+        try:
+            game = BeaverSurvivalGame(seed=1)
+            observer = Observer(game, stack=2)
+            observer.reset()
+            assert observer.frame.shape == (150, 200)
+            assert observer.frame.any()
+        finally:
+            pygame.display.quit()
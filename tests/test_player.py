@@ -6,6 +6,8 @@ import pytest
 import pygame
 from newgame.entities.player import Player
 from newgame.config.settings import SCREEN_WIDTH, SCREEN_HEIGHT, PLAYER_SIZE
+from newgame.config.constants import ZONE_WATER
+from newgame.core.ecs import draw_sprites
 
 
 class TestPlayer:
@@ -32,6 +34,33 @@ class TestPlayer:
         assert self.player.rect.x == 200
         assert self.player.rect.y == 200
 
+    def test_interpolation(self):
+        """Test the player is drawn between its last two positions."""
+        self.player.update({pygame.K_d: True}, self.lodge_rect, self.dam_rect)
+        moved = self.player.rect.x - 100
+        assert moved > 0
+        assert self.player.interpolate(0).x == 100
+        assert self.player.interpolate(0.5).x == 100 + round(moved * 0.5)
+        assert self.player.interpolate(1) == self.player.rect
+        self.player.reset_interpolation()
+        assert self.player.interpolate(0) == self.player.rect
+
+    def test_sprite_follows_zone(self):
+        """Test the ECS sprite system draws the water sprite in water."""
+        while self.player.current_zone != ZONE_WATER:
+            self.player.update({pygame.K_w: True}, self.lodge_rect, self.dam_rect)
+        expected = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.player.draw(expected)
+        drawn = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        draw_sprites(self.player.registry, drawn, (self.player.entity,))
+        assert pygame.image.tobytes(drawn, "RGB") == pygame.image.tobytes(
+            expected, "RGB"
+        )
+        self.player.reset_position(200, 200)
+        assert self.player.registry["sprite"]["index"][self.player.entity] == (
+            self.player.sprite_codes[0]
+        )
+
     def test_collision_rect(self):
         """Test collision rectangle is correct."""
         collision_rect = self.player.get_collision_rect()
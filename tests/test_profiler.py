@@ -0,0 +1,151 @@
+"""
+Tests for the frame profiler.
+"""
+
+import json
+import pygame
+from newgame.core.game import BeaverSurvivalGame
+from newgame.utils.input import ACTION_PAUSE
+from newgame.systems.profiler import (
+    FrameProfiler,
+    ProfilerOverlay,
+    FRAME,
+    HISTOGRAM_EDGES_MS,
+)
+
+
+class TestFrameProfiler:
+    """Test span timing and aggregation."""
+
+    def test_disabled_records_nothing(self):
+        """Test spans are no-ops until profiling starts."""
+        profiler = FrameProfiler()
+        with profiler.span("work"):
+            pass
+        profiler.end_frame()
+        assert profiler.windows == {}
+        assert profiler.frames == 0
+
+    def test_spans_summed_per_frame(self):
+        """Test repeated spans in one frame add up."""
+        profiler = FrameProfiler()
+        profiler.start()
+        profiler.record("work", 0, 1_000_000)
+        profiler.record("work", 5_000_000, 6_000_000)
+        profiler.end_frame()
+        assert profiler.windows["work"][-1] == 2_000_000
+        assert FRAME in profiler.windows
+
+    def test_missing_span_counts_zero(self):
+        """Test a span that did not run in a frame records zero time."""
+        profiler = FrameProfiler()
+        profiler.start()
+        profiler.record("work", 0, 1_000_000)
+        profiler.end_frame()
+        profiler.end_frame()
+        assert list(profiler.windows["work"]) == [1_000_000, 0]
+
+    def test_rolling_window(self):
+        """Test only the most recent frames are kept."""
+        profiler = FrameProfiler(history=10)
+        profiler.start()
+        for _ in range(25):
+            profiler.end_frame()
+        assert len(profiler.windows[FRAME]) == 10
+
+    def test_stats_and_histogram(self):
+        """Test statistics and histogram buckets in milliseconds."""
+        profiler = FrameProfiler()
+        profiler.start()
+        for ms in (1, 1, 3, 50):
+            profiler.record("work", 0, ms * 1_000_000)
+            profiler.end_frame()
+        mean, p95, peak = profiler.stats("work")
+        assert mean == 13.75
+        assert peak == 50
+        counts = profiler.histogram("work")
+        assert len(counts) == len(HISTOGRAM_EDGES_MS) + 1
+        assert sum(counts) == 4
+        assert counts[-1] == 1
+
+    def test_chrome_trace_export(self, tmp_path):
+        """Test traced spans export as Chrome complete events."""
+        profiler = FrameProfiler()
+        profiler.start(tracing=True)
+        with profiler.span("work"):
+            pass
+        path = tmp_path / "trace.json"
+        profiler.export_chrome_trace(path)
+        events = json.loads(path.read_text())["traceEvents"]
+        assert len(events) == 1
+        assert events[0]["name"] == "work"
+        assert events[0]["ph"] == "X"
+        assert events[0]["dur"] >= 0
+
+
+class TestGameProfiling:
+    """Test the game's built-in instrumentation."""
+
+    def test_headless_spans(self):
+        """Test subsystems are timed during a headless run."""
+        game = BeaverSurvivalGame(headless=True, seed=1)
+        game.profiler.start()
+        game.run_headless(60, {pygame.K_d: True})
+        names = set(game.profiler.windows)
+        assert {"update", "Player.update", "FoodManager.update"} <= names
+        assert {"FoodManager.collect", FRAME} <= names
+        assert game.profiler.frames == 60
+
+    def test_overlay_toggle(self):
+        """Test F3 overlay toggling starts and stops profiling."""
+        game = BeaverSurvivalGame(headless=True, seed=1)
+        game.toggle_profiler_overlay()
+        assert game.profiler.enabled
+        game.run_headless(30)
+        game.draw()
+        assert "UI.draw_hud" in game.profiler.frame_totals
+        assert game.screen.get_rect().contains(game.profiler_overlay.rect)
+        game.toggle_profiler_overlay()
+        assert not game.profiler.enabled
+        assert game.profiler_overlay is None
+
+    def test_overlay_with_dirty_rects(self):
+        """Test the overlay is redrawn through the dirty-rect renderer."""
+        game = BeaverSurvivalGame(headless=True, seed=1, dirty_rects=True)
+        presented = []
+        game._present = presented.append
+        game.toggle_profiler_overlay()
+        game.draw()
+        game.step({pygame.K_d: True})
+        game.draw()
+        assert presented[0] is None
+        assert game.profiler_overlay.rect in presented[1]
+
+    def test_overlay_while_paused(self):
+        """Test the paused screen under the overlay does not darken."""
+        game = BeaverSurvivalGame(headless=True, seed=1, dirty_rects=True)
+        game._present = lambda rects: None
+        game.toggle_profiler_overlay()
+        game.step(actions=ACTION_PAUSE)
+        game.draw()
+        rect = game.profiler_overlay.rect
+        first = pygame.image.tobytes(game.screen.subsurface(rect), "RGB")
+        for _ in range(3):
+            game.draw()
+        assert pygame.image.tobytes(game.screen.subsurface(rect), "RGB") == first
+
+    def test_overlay_refresh(self):
+        """Test the overlay panel is only re-rendered periodically."""
+        profiler = FrameProfiler()
+        profiler.start()
+        overlay = ProfilerOverlay(profiler, refresh=5)
+        screen = pygame.Surface((800, 600))
+        overlay.draw(screen)
+        panel = overlay.surface
+        for _ in range(4):
+            profiler.end_frame()
+            overlay.draw(screen)
+        assert overlay.surface is panel
+        profiler.end_frame()
+        overlay.draw(screen)
+        assert overlay.surface is not panel
@@ -0,0 +1,78 @@
+"""
+Tests for the dirty-rectangle renderer.
+"""
+
+import random
+import pygame
+from newgame.core.game import BeaverSurvivalGame
+from newgame.config.constants import STATE_PAUSED, STATE_PLAYING
+from newgame.config.settings import FPS
+from newgame.utils.input import mask_to_keys
+
+
+def _pixels(surface):
+    return pygame.image.tobytes(surface, "RGB")
+
+
+class TestDirtyRectRenderer:
+    """Test partial redraws against full redraws."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.game = BeaverSurvivalGame(headless=True, seed=3, dirty_rects=True)
+        self.renderer = self.game.renderer
+
+    def _assert_matches_full_redraw(self):
+        reference = pygame.Surface(self.game.screen.get_size())
+        self.game.draw_scene(reference)
+        assert _pixels(self.game.screen) == _pixels(reference)
+
+    def test_first_frame_is_full(self):
+        """Test the first frame is a full redraw."""
+        assert self.renderer.render(self.game) is None
+
+    def test_idle_frame_updates_nothing(self):
+        """Test a frame where nothing changed pushes no rects."""
+        self.renderer.render(self.game)
+        assert self.renderer.render(self.game) == []
+
+    def test_player_movement_is_dirty(self):
+        """Test moving the player marks its old and new position."""
+        self.renderer.render(self.game)
+        old_rect = self.game.player.rect.copy()
+        self.game.step({pygame.K_d: True})
+        rects = self.renderer.render(self.game)
+        assert rects
+        assert rects[0].contains(old_rect)
+        assert rects[0].contains(self.game.player.rect)
+
+    def test_food_changes_are_dirty(self):
+        """Test spawned food marks its rect."""
+        self.renderer.render(self.game)
+        food = self.game.food_manager.add_food(400, 400)
+        assert food.rect in self.renderer.render(self.game)
+
+    def test_state_change_forces_full_redraw(self):
+        """Test pausing falls back to a full redraw, then goes idle."""
+        self.renderer.render(self.game)
+        self.game.game_state.set_state(STATE_PAUSED)
+        assert self.renderer.render(self.game) is None
+        assert self.renderer.render(self.game) == []
+        self.game.game_state.set_state(STATE_PLAYING)
+        assert self.renderer.render(self.game) is None
+
+    def test_matches_full_redraw(self):
+        """Test many partial frames produce the same image as a full redraw."""
+        rng = random.Random(8)
+        mask = 0
+        self.renderer.render(self.game)
+        for tick in range(FPS * 40):
+            if rng.random() < 0.05:
+                mask = rng.randrange(256)
+            self.game.step(mask_to_keys(mask))
+            if tick % 300 == 0:
+                self.game.food_manager.add_food(
+                    self.game.player.rect.x + 30, self.game.player.rect.y
+                )
+            self.renderer.render(self.game)
+        self._assert_matches_full_redraw()
@@ -0,0 +1,150 @@
+"""
+Tests for input recording and replay.
+"""
+
+import random
+from collections import defaultdict
+import pygame
+import pytest
+from newgame.core.game import BeaverSurvivalGame
+from newgame.core.replay import Replay, ReplayPlayer
+from newgame.config.constants import STATE_PAUSED, STATE_PLAYING
+from newgame.utils.input import ACTION_PAUSE, ACTION_RESTART, mask_to_keys
+
+
+def record_game(seed, ticks, world=False):
+    """Play a headless game with random held keys while recording it."""
+    replay = Replay(seed, world=world)
+    game = BeaverSurvivalGame(headless=True, seed=seed, world=world, recorder=replay)
+    rng = random.Random(seed)
+    mask = 0
+    for _ in range(ticks):
+        if rng.random() < 0.05:
+            mask = rng.randrange(256)
+        game.step(mask_to_keys(mask))
+    return replay, game
+
+
+def snapshot(game):
+    """Return the state that must match between a game and its replay."""
+    return (
+        tuple(game.player.rect),
+        list(game.food_manager.food_items),
+        game.food_amount,
+        game.game_state.current_state,
+        game.game_clock.get_ticks(),
+    )
+
+
+class TestReplayFormat:
+    """Test replay serialization."""
+
+    def test_round_trip(self):
+        """Test a replay survives serialization unchanged."""
+        replay = Replay(42, world=True)
+        for word in [0, 0, 0, 5, 5, ACTION_PAUSE, 0]:
+            replay.record(word)
+        restored = Replay.from_bytes(replay.to_bytes())
+        assert restored.seed == 42
+        assert restored.world
+        assert list(restored.inputs) == list(replay.inputs)
+
+    def test_run_length_encoding(self):
+        """Test held keys compress to a single run."""
+        replay = Replay(1)
+        for _ in range(3600):
+            replay.record(3)
+        assert replay.runs() == [(3, 3600)]
+        assert len(replay.to_bytes()) < 40
+
+    def test_rejects_bad_data(self):
+        """Test corrupt replay data raises ValueError."""
+        data = Replay(1).to_bytes()
+        with pytest.raises(ValueError):
+            Replay.from_bytes(b"XXXX" + data[4:])
+        with pytest.raises(ValueError):
+            Replay.from_bytes(data[:5])
+
+    def test_save_and_load(self, tmp_path):
+        """Test replays can be written to and read from disk."""
+        replay, _ = record_game(3, 300)
+        path = tmp_path / "game.bqr"
+        replay.save(path)
+        assert list(Replay.load(path).inputs) == list(replay.inputs)
+
+
+class TestReplayPlayer:
+    """Test deterministic re-simulation."""
+
+    def test_replay_matches_recording(self):
+        """Test replaying reproduces the recorded game exactly."""
+        replay, game = record_game(7, 2000)
+        replayed = ReplayPlayer(Replay.from_bytes(replay.to_bytes())).run()
+        assert snapshot(replayed) == snapshot(game)
+
+    def test_replay_matches_world_recording(self):
+        """Test replays of games in the streaming world."""
+        replay, game = record_game(11, 3000, world=True)
+        replayed = ReplayPlayer(replay).run()
+        assert snapshot(replayed) == snapshot(game)
+        assert replayed.current_screen.coord == game.current_screen.coord
+
+    def test_actions_are_replayed(self):
+        """Test pausing and restarting are part of the recording."""
+        replay = Replay(5)
+        game = BeaverSurvivalGame(headless=True, seed=5, recorder=replay)
+        game.step(mask_to_keys(1))
+        game.step(actions=ACTION_PAUSE)
+        assert game.game_state.current_state == STATE_PAUSED
+        game.run_headless(50)
+        game.step(actions=ACTION_PAUSE | ACTION_RESTART)
+        game.run_headless(50, mask_to_keys(4))
+
+        player = ReplayPlayer(replay)
+        player.seek(2)
+        assert player.game.game_state.current_state == STATE_PAUSED
+        replayed = player.run()
+        assert replayed.game_state.current_state == STATE_PLAYING
+        assert snapshot(replayed) == snapshot(game)
+
+    def test_repeated_presses_are_replayed(self, monkeypatch):
+        """Test several pause presses between two steps replay as pressed."""
+        replay = Replay(6)
+        game = BeaverSurvivalGame(headless=True, seed=6, recorder=replay)
+        monkeypatch.setattr(pygame.key, "get_pressed", lambda: defaultdict(bool))
+        states = []
+        for presses in (2, 3, 1, 4):
+            escape = pygame.event.Event(pygame.KEYDOWN, key=pygame.K_ESCAPE)
+            monkeypatch.setattr(pygame.event, "get", lambda: [escape] * presses)
+            game.handle_events()
+            game.step()
+            states.append(game.game_state.current_state)
+        assert states == [STATE_PLAYING, STATE_PAUSED, STATE_PLAYING, STATE_PLAYING]
+
+        player = ReplayPlayer(replay)
+        for state in states:
+            player.step()
+            assert player.game.game_state.current_state == state
+
+    def test_seek_backward(self):
+        """Test seeking back re-simulates to the same state."""
+        replay, _ = record_game(9, 600)
+        player = ReplayPlayer(replay)
+        player.seek(300)
+        expected = snapshot(player.game)
+        player.seek(600)
+        player.seek(300)
+        assert player.tick == 300
+        assert snapshot(player.game) == expected
+
+    def test_render_chosen_ticks(self):
+        """Test frames are only rendered at the requested ticks."""
+        replay, _ = record_game(13, 200)
+        player = ReplayPlayer(replay)
+        frames = [
+            (tick, pygame.image.tobytes(surface, "RGB"))
+            for tick, surface in player.frames([150, 50])
+        ]
+        assert [tick for tick, _ in frames] == [50, 150]
+        assert frames[0][1] != frames[1][1]
+        assert player.tick == 150
@@ -0,0 +1,148 @@
+"""
+Tests for binary save games.
+"""
+
+import random
+import pygame
+import pytest
+from newgame.core.game import BeaverSurvivalGame
+from newgame.core.savegame import SaveManager, read_save
+from newgame.config.constants import STATE_PAUSED
+from newgame.utils.input import ACTION_PAUSE, mask_to_keys
+
+
+def play(game, ticks, seed=0):
+    """Step a game with random held keys."""
+    rng = random.Random(seed)
+    mask = 0
+    for _ in range(ticks):
+        if rng.random() < 0.05:
+            mask = rng.randrange(256)
+        game.step(mask_to_keys(mask))
+
+
+def snapshot(game):
+    """Return the state a save must preserve."""
+    state = game.game_state
+    return (
+        tuple(game.player.rect),
+        game.player.current_zone,
+        game.food_amount,
+        game.last_food_decrease,
+        list(game.food_manager.food_items),
+        game.food_manager.last_spawn_time,
+        game.food_manager.spawn_interval,
+        state.current_state,
+        state.game_start_time,
+        game.game_clock.get_ticks(),
+        game.scheduler.get_ticks(),
+    )
+
+
+class TestSaveManager:
+    """Test saving and loading full snapshots and deltas."""
+
+    def test_round_trip(self, tmp_path):
+        """Test a loaded game matches the saved one."""
+        game = BeaverSurvivalGame(headless=True, seed=1)
+        play(game, 2000)
+        SaveManager(tmp_path / "save.bqs").save(game)
+
+        loaded = BeaverSurvivalGame(headless=True, seed=2)
+        SaveManager(tmp_path / "save.bqs").load(loaded)
+        assert snapshot(loaded) == snapshot(game)
+
+    def test_paused_state(self, tmp_path):
+        """Test pause timing survives a save."""
+        game = BeaverSurvivalGame(headless=True, seed=1)
+        play(game, 300)
+        game.step(actions=ACTION_PAUSE)
+        game.run_headless(100)
+        SaveManager(tmp_path / "save.bqs").save(game)
+
+        loaded = BeaverSurvivalGame(headless=True)
+        SaveManager(tmp_path / "save.bqs").load(loaded)
+        assert loaded.game_state.current_state == STATE_PAUSED
+        assert loaded.game_state.get_survival_time() == (
+            game.game_state.get_survival_time()
+        )
+
+    def test_later_saves_are_deltas(self, tmp_path):
+        """Test saves after the first append only what changed."""
+        path = tmp_path / "save.bqs"
+        game = BeaverSurvivalGame(headless=True, seed=3)
+        for x in range(0, 600, 10):
+            game.food_manager.add_food(x + 20, 500, "berry")
+        manager = SaveManager(path)
+        full_size = manager.save(game)
+        play(game, 60)
+        delta_size = manager.save(game)
+        assert manager.deltas == 1
+        assert delta_size < full_size // 2
+        assert path.stat().st_size == full_size + delta_size
+
+        loaded = BeaverSurvivalGame(headless=True)
+        SaveManager(path).load(loaded)
+        assert snapshot(loaded) == snapshot(game)
+
+    def test_snapshot_after_max_deltas(self, tmp_path):
+        """Test the file is compacted into a new snapshot."""
+        path = tmp_path / "save.bqs"
+        game = BeaverSurvivalGame(headless=True, seed=3)
+        for x in range(0, 600, 10):
+            game.food_manager.add_food(x + 20, 500, "berry")
+        manager = SaveManager(path, max_deltas=2)
+        for _ in range(5):
+            play(game, 10)
+            manager.save(game)
+        assert manager.deltas == 1
+        _, _, deltas = read_save(path.read_bytes())
+        assert deltas == 1
+
+    def test_truncated_delta_is_ignored(self, tmp_path):
+        """Test a delta cut short falls back to the last intact state."""
+        path = tmp_path / "save.bqs"
+        game = BeaverSurvivalGame(headless=True, seed=4)
+        for x in range(0, 600, 10):
+            game.food_manager.add_food(x + 20, 500, "berry")
+        manager = SaveManager(path)
+        manager.save(game)
+        play(game, 100)
+        manager.save(game)
+        expected = snapshot(game)
+        play(game, 100)
+        size = manager.save(game)
+        data = path.read_bytes()
+        path.write_bytes(data[: len(data) - size // 2])
+
+        loaded = BeaverSurvivalGame(headless=True)
+        SaveManager(path).load(loaded)
+        assert snapshot(loaded) == expected
+
+    def test_rejects_bad_data(self):
+        """Test data that is not a save raises ValueError."""
+        with pytest.raises(ValueError):
+            read_save(b"not a save file")
+
+    def test_world_round_trip(self, tmp_path):
+        """Test every visited screen of a world is saved."""
+        path = tmp_path / "save.bqs"
+        game = BeaverSurvivalGame(headless=True, seed=5, world=True)
+        game.food_manager.add_food(300, 300, "leaf")
+        game.run_headless(200, {pygame.K_d: True})
+        game.food_manager.add_food(500, 500, "berry")
+        SaveManager(path).save(game)
+
+        loaded = BeaverSurvivalGame(headless=True, world=True)
+        SaveManager(path).load(loaded)
+        assert loaded.current_screen.coord == game.current_screen.coord
+        assert snapshot(loaded) == snapshot(game)
+        loaded.run_headless(200, {pygame.K_a: True})
+        assert list(loaded.food_manager.food_items)[0].rect.topleft == (300, 300)
+
+    def test_world_mismatch(self, tmp_path):
+        """Test a world save cannot be loaded into a single-screen game."""
+        path = tmp_path / "save.bqs"
+        SaveManager(path).save(BeaverSurvivalGame(headless=True, world=True))
+        with pytest.raises(ValueError):
+            SaveManager(path).load(BeaverSurvivalGame(headless=True))
@@ -0,0 +1,97 @@
+"""
+Tests for the pause-aware timer scheduler.
+"""
+
+import pytest
+from newgame.config.settings import FPS, FOOD_DECREASE_INTERVAL, INITIAL_FOOD
+from newgame.core.clock import SimulationClock
+from newgame.core.game import BeaverSurvivalGame
+from newgame.core.scheduler import Scheduler
+from newgame.utils.input import ACTION_PAUSE
+
+
+def run(scheduler, ticks):
+    """Advance the source clock a tick at a time, updating the scheduler."""
+    for _ in range(ticks):
+        scheduler.clock.advance()
+        scheduler.update()
+
+
+class TestScheduler:
+    """Test timer ordering, repetition, cancellation and pausing."""
+
+    def setup_method(self):
+        self.scheduler = Scheduler(SimulationClock(1000))
+        self.calls = []
+
+    def test_fires_in_due_order(self):
+        """Test timers fire by due time, then in scheduling order."""
+        for delay, name in ((30, "c"), (10, "a"), (30, "d"), (20, "b")):
+            self.scheduler.schedule(delay, self.calls.append, name)
+        run(self.scheduler, 25)
+        assert self.calls == ["a", "b"]
+        run(self.scheduler, 10)
+        assert self.calls == ["a", "b", "c", "d"]
+        assert len(self.scheduler) == 0
+
+    def test_repeat_catches_up(self):
+        """Test a late update fires a repeating timer once per interval."""
+        timer = self.scheduler.repeat(10, self.calls.append, "tick", delay=5)
+        self.scheduler.clock.advance(36)
+        assert self.scheduler.update() == 4
+        assert timer.due == 45
+        with pytest.raises(ValueError):
+            self.scheduler.repeat(0, self.calls.append)
+
+    def test_cancel(self):
+        """Test cancelled timers never fire and are dropped from the heap."""
+        timers = [self.scheduler.schedule(i, self.calls.append, i) for i in range(200)]
+        for timer in timers[:150]:
+            self.scheduler.cancel(timer)
+        self.scheduler.cancel(timers[0])
+        assert len(self.scheduler) == 50
+        assert len(self.scheduler._heap) < 200
+        assert self.scheduler.next_due() == 150
+        run(self.scheduler, 200)
+        assert self.calls == list(range(150, 200))
+
+    def test_pause_freezes_time(self):
+        """Test game time and timers stand still while paused."""
+        self.scheduler.schedule(100, self.calls.append, "due")
+        run(self.scheduler, 50)
+        self.scheduler.pause()
+        run(self.scheduler, 500)
+        assert self.scheduler.get_ticks() == 50
+        assert self.calls == []
+        self.scheduler.resume()
+        run(self.scheduler, 50)
+        assert self.scheduler.get_ticks() == 100
+        assert self.calls == ["due"]
+
+
+class TestGameTimers:
+    """Test the game's timers run on game time."""
+
+    def test_food_does_not_drain_while_paused(self):
+        """Test a long pause costs no food and is not survival time."""
+        game = BeaverSurvivalGame(headless=True, seed=1)
+        interval_ticks = FOOD_DECREASE_INTERVAL * FPS // 1000
+        game.run_headless(interval_ticks // 2)
+        game.step(actions=ACTION_PAUSE)
+        game.run_headless(interval_ticks * 10)
+        game.step(actions=ACTION_PAUSE)
+        assert game.food_amount == INITIAL_FOOD
+        game.run_headless(interval_ticks // 2)
+        assert game.food_amount == INITIAL_FOOD - 1
+        assert game.game_state.get_survival_time() == FOOD_DECREASE_INTERVAL // 1000
+
+    def test_survival_time_stops_at_game_over(self):
+        """Test the game over screen does not keep counting."""
+        game = BeaverSurvivalGame(headless=True, seed=1)
+        game.food_amount = 1
+        game.run_headless(FPS * 60)
+        survival = game.game_state.get_survival_time()
+        assert game.game_state.is_game_over()
+        for _ in range(FPS * 60):
+            game.step()
+        assert game.game_state.get_survival_time() == survival
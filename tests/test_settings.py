@@ -0,0 +1,162 @@
+"""
+Tests for runtime Settings objects.
+"""
+
+import dataclasses
+import pygame
+import pytest
+from newgame.config import settings as config
+from newgame.config.settings import DEFAULT_SETTINGS, Settings
+from newgame.core.game import BeaverSurvivalGame
+from newgame.entities.objects import Dam, Lodge
+from newgame.entities.player import Player
+from newgame.systems.navigation import Autopilot
+from newgame.systems.ui import UI
+
+
+class TestSettings:
+    """Test defaults, derived values and overrides."""
+
+    def test_defaults_match_constants(self):
+        """Test the default settings are the module constants."""
+        assert DEFAULT_SETTINGS.fps == config.FPS
+        assert DEFAULT_SETTINGS.initial_food == config.INITIAL_FOOD
+        assert DEFAULT_SETTINGS.food_spawn_interval == config.FOOD_SPAWN_INTERVAL
+        assert DEFAULT_SETTINGS.lodge_position == config.LODGE_POSITION
+
+    def test_immutable(self):
+        """Test settings cannot be changed in place."""
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            DEFAULT_SETTINGS.fps = 30
+
+    def test_replace_recomputes_derived_values(self):
+        """Test a variant derives its rects from its own fields."""
+        wide = DEFAULT_SETTINGS.replace(screen_width=1000, fps=50)
+        assert wide.screen_size == (1000, config.SCREEN_HEIGHT)
+        assert wide.dam_rect == (0, 0, 1000, config.DAM_HEIGHT)
+        assert wide.step_seconds == pytest.approx(0.02)
+        assert pygame.Rect(wide.spawn_bounds).right == 1000 - config.FOOD_SIZE + 1
+        assert DEFAULT_SETTINGS.screen_width == config.SCREEN_WIDTH
+
+    def test_positions_follow_screen_size(self):
+        """Test the lodge and player start move with the screen unless set."""
+        small = DEFAULT_SETTINGS.replace(screen_width=640, screen_height=480)
+        assert small.lodge_position == (130, 220)
+        assert small.player_start_position == (310, 240)
+        assert small.lodge_rect == (130, 220, config.LODGE_WIDTH, config.LODGE_HEIGHT)
+
+        placed = DEFAULT_SETTINGS.replace(lodge_position=(10, 200))
+        moved = placed.replace(screen_width=640, screen_height=480)
+        assert moved.lodge_position == (10, 200)
+        assert moved.player_start_position == small.player_start_position
+
+    def test_from_env(self):
+        """Test NEWGAME_ variables are parsed into field types."""
+        settings = Settings.from_env(
+            {
+                "NEWGAME_INITIAL_FOOD": "80",
+                "NEWGAME_PLAYER_SPEED": "2.5",
+                "NEWGAME_FOOD_SPAWN_INTERVAL": "5000,8000",
+                "NEWGAME_AUDIO_ENABLED": "true",
+                "HOME": "/root",
+            }
+        )
+        assert settings.initial_food == 80
+        assert settings.player_speed == 2.5
+        assert settings.food_spawn_interval == (5000, 8000)
+        assert settings.audio_enabled is True
+        assert not Settings.from_env({"NEWGAME_AUDIO_ENABLED": "0"}).audio_enabled
+
+    def test_unknown_setting(self):
+        """Test misspelled settings are rejected."""
+        with pytest.raises(ValueError):
+            Settings.from_mapping({"initial_fod": 80})
+        with pytest.raises(ValueError):
+            Settings.from_mapping({"initial_food": 80.5})
+
+    def test_load_toml_then_env(self, tmp_path):
+        """Test the environment overrides the settings file."""
+        if config.tomllib is None:
+            pytest.skip("needs tomllib or tomli")
+        path = tmp_path / "settings.toml"
+        path.write_text(
+            "initial_food = 60\nmax_food = 100\nfood_spawn_interval = [1, 2]\n"
+        )
+        settings = Settings.load(
+            environ={"NEWGAME_SETTINGS": str(path), "NEWGAME_MAX_FOOD": "90"}
+        )
+        assert settings.initial_food == 60
+        assert settings.max_food == 90
+        assert settings.food_spawn_interval == (1, 2)
+        assert settings.low_food == 18
+
+
+class TestConfiguredGames:
+    """Test differently configured games in one process."""
+
+    def test_objects_use_settings(self):
+        """Test the player, lodge, dam and UI are built from settings."""
+        settings = DEFAULT_SETTINGS.replace(
+            player_size=30, lodge_width=80, dam_height=20, max_food=50
+        )
+        assert Player(0, 0, settings=settings).rect.size == (30, 30)
+        assert Lodge(0, 0, settings=settings).rect.size == (80, config.LODGE_HEIGHT)
+        assert Dam(settings=settings).rect.height == 20
+        ui = UI(settings)
+        screen = pygame.Surface(settings.screen_size)
+        width, height = ui.font.size("Food: 10/50")
+        assert ui.draw_hud(screen, 10).size == (width + 10, height + 5)
+
+    def test_games_side_by_side(self):
+        """Test two games with different settings run in one process."""
+        fast = DEFAULT_SETTINGS.replace(
+            initial_food=5, food_decrease_interval=1000, food_size=12
+        )
+        slow = BeaverSurvivalGame(headless=True, seed=1)
+        hungry = BeaverSurvivalGame(headless=True, seed=1, settings=fast)
+        hungry.food_manager.add_food(100, 400)
+        for _ in range(config.FPS * 6):
+            slow.step()
+            hungry.step()
+        assert hungry.game_state.is_game_over()
+        assert slow.game_state.is_playing()
+        assert slow.food_amount == config.INITIAL_FOOD - 1
+        assert next(iter(hungry.food_manager.food_items)).rect.size == (12, 12)
+        # Drawing uses sprites of the configured size
+        hungry.draw_scene(hungry.screen)
+        slow.draw_scene(slow.screen)
+
+    def test_navigation_uses_settings(self):
+        """Test the autopilot navigates the configured screen."""
+        settings = DEFAULT_SETTINGS.replace(
+            screen_width=640, screen_height=480, player_size=30
+        )
+        game = BeaverSurvivalGame(
+            headless=True, seed=1, settings=settings, autopilot=Autopilot()
+        )
+        game.food_manager.add_food(500, 400)
+        game.run_headless(config.FPS * 10)
+        grid = game.autopilot.navigator.grid
+        assert (grid.cols, grid.rows) == (32, 24)
+        assert grid.agent_size == 30
+        assert game.food_amount > config.INITIAL_FOOD
+
+    def test_world_uses_settings(self):
+        """Test the world's size, home screen and LRU come from settings."""
+        settings = DEFAULT_SETTINGS.replace(
+            world_size=3, home_screen_coord=(1, 2), max_resident_screens=2
+        )
+        game = BeaverSurvivalGame(headless=True, seed=1, world=True, settings=settings)
+        world = game.world
+        assert world.current.coord == (1, 2)
+        assert world.current.lodge is not None
+        assert world.max_resident == 2
+        assert world.in_bounds((2, 2))
+        assert not world.in_bounds((3, 2))
+
+    def test_player_speed(self):
+        """Test movement follows the configured speeds."""
+        settings = DEFAULT_SETTINGS.replace(player_speed_land=5)
+        player = Player(300, 300, settings=settings)
+        player.update({pygame.K_d: True}, pygame.Rect(0, 0, 0, 0), (0, 0, 0, 0))
+        assert player.rect.x == 305
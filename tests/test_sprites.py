@@ -0,0 +1,60 @@
+"""
+Tests for the sprite atlas.
+"""
+
+import pygame
+from newgame.config.constants import COLORS, FOOD_TYPES
+from newgame.config.settings import FOOD_SIZE, PLAYER_SIZE
+from newgame.entities.food import FoodManager
+from newgame.systems.sprites import SpriteAtlas, atlas
+
+
+class TestSpriteAtlas:
+    """Test sprite atlas building and drawing."""
+
+    def test_registered_sprites(self):
+        """Test food and beaver sprites are registered with their sizes."""
+        atlas.surface
+        for food_type in FOOD_TYPES:
+            assert atlas.regions[food_type].size == (FOOD_SIZE, FOOD_SIZE)
+        assert atlas.regions["beaver"].size == (PLAYER_SIZE, PLAYER_SIZE)
+        assert atlas.regions["beaver_water"].size == (PLAYER_SIZE, PLAYER_SIZE)
+
+    def test_regions_do_not_overlap(self):
+        """Test sprites are packed without overlapping."""
+        sheet = SpriteAtlas()
+        sheet.register("a", (8, 8), lambda surface, rect: None)
+        sheet.register("b", (20, 20), lambda surface, rect: None)
+        assert sheet.surface.get_size() == (28, 20)
+        assert not sheet.regions["a"].colliderect(sheet.regions["b"])
+
+    def test_built_once(self):
+        """Test the atlas surface is reused between draws."""
+        sheet = SpriteAtlas()
+        sheet.register("a", (8, 8), lambda surface, rect: None)
+        assert sheet.surface is sheet.surface
+
+    def test_transparent_background(self):
+        """Test pixels outside the sprite shape are not drawn."""
+        screen = pygame.Surface((20, 20))
+        screen.fill(COLORS["BLUE"])
+        atlas.blit(screen, "berry", (0, 0))
+        assert screen.get_at((0, 0))[:3] == COLORS["BLUE"]
+        assert screen.get_at((FOOD_SIZE // 2, FOOD_SIZE // 2))[:3] != COLORS["BLUE"]
+
+    def test_batched_food_matches_shape_drawing(self):
+        """Test batched food blits look like drawing each item's shapes."""
+        food_manager = FoodManager(pygame.Rect(0, 0, 0, 0), pygame.Rect(0, 0, 0, 0))
+        for i in range(50):
+            food_manager.add_food(i * 15, i * 11, FOOD_TYPES[i % 2])
+
+        batched = pygame.Surface((800, 600))
+        expected = pygame.Surface((800, 600))
+        food_manager.draw(batched)
+        for food in food_manager.food_items:
+            pygame.draw.ellipse(expected, food.color, food.rect)
+            highlight = pygame.Rect(food.rect.x + 1, food.rect.y + 1, 6, 6)
+            pygame.draw.ellipse(expected, COLORS["WHITE"], highlight, 1)
+        assert pygame.image.tobytes(batched, "RGB") == pygame.image.tobytes(
+            expected, "RGB"
+        )
@@ -0,0 +1,99 @@
+"""
+Tests for Monte Carlo balance sweeps.
+"""
+
+import pytest
+from newgame.config.settings import INITIAL_FOOD, FOOD_DECREASE_INTERVAL
+
+np = pytest.importorskip("numpy")
+from newgame.core.batch import BatchSimulator  # noqa: E402
+from newgame.core.sweep import (  # noqa: E402
+    PARAMETERS,
+    SweepResults,
+    grid_points,
+    run_sweep,
+    seek_food,
+    simulate,
+)
+
+
+def idle(batch):
+    """Policy that never moves."""
+    return 0
+
+
+class TestPolicy:
+    """Test the scripted food-seeking beaver."""
+
+    def test_walks_to_food(self):
+        """Test the policy reaches and collects placed food."""
+        batch = BatchSimulator(2, seed=0)
+        batch.spawn_interval[:] = 10**9
+        batch.place_food(0, 100, 500)
+        batch.place_food(1, 700, 150)
+        for _ in range(600):
+            batch.step(seek_food(batch))
+        assert not batch.food_active.any()
+        assert (batch.food_amount > INITIAL_FOOD - 10).all()
+
+    def test_outlives_idle_beaver(self):
+        """Test seeking food survives longer than standing still."""
+        params = dict(PARAMETERS, initial_food=10)
+        seeking, _ = simulate(params, 20, seed=1, max_seconds=60)
+        waiting, censored = simulate(params, 20, seed=1, max_seconds=60, policy=idle)
+        assert (waiting == 10 * FOOD_DECREASE_INTERVAL // 1000).all()
+        assert not censored.any()
+        assert seeking.mean() > waiting.mean()
+
+
+class TestSweep:
+    """Test parameter grids, seeding and result files."""
+
+    def test_grid_points(self):
+        """Test grids expand to every combination, defaulting the rest."""
+        points = grid_points(
+            {"initial_food": [50, 100], "food_spawn_interval": [(1, 2)]}
+        )
+        assert [point["initial_food"] for point in points] == [50, 100]
+        assert all(point["food_spawn_interval"] == (1, 2) for point in points)
+        assert points[0]["food_decrease_interval"] == FOOD_DECREASE_INTERVAL
+        with pytest.raises(ValueError):
+            grid_points({"player_speed": [1]})
+
+    def test_results_independent_of_workers(self):
+        """Test a sweep gives the same games inline and in a process pool."""
+        points = grid_points({"initial_food": [2, 4]})
+
+        def sweep(workers):
+            results = SweepResults(points, games=6)
+            complete = [
+                results.add(*chunk)
+                for chunk in run_sweep(
+                    points, 6, seed=4, max_seconds=20, workers=workers, chunk=4
+                )
+            ]
+            assert complete.count(True) == len(points)
+            return results.columns()
+
+        inline = sweep(1)
+        pooled = sweep(2)
+        assert list(inline) == list(pooled)
+        for name in ("point", "survival", "censored", "initial_food"):
+            assert (inline[name] == pooled[name]).all()
+
+    def test_save(self, tmp_path):
+        """Test results are written as one column per field."""
+        points = grid_points({"food_spawn_interval": [(5000, 8000), (10000, 15000)]})
+        results = SweepResults(points, games=3)
+        for point in range(len(points)):
+            results.add(point, 1, np.array([20, 30]), np.array([False, True]))
+            results.add(point, 0, np.array([10]), np.array([False]))
+        path = tmp_path / "sweep.npz"
+        results.save(path)
+        with np.load(path) as columns:
+            assert list(columns["point"]) == [0, 0, 0, 1, 1, 1]
+            assert list(columns["food_spawn_interval_min"]) == [5000] * 3 + [10000] * 3
+            assert list(columns["survival"]) == [10, 20, 30] * 2
+        summary = results.summary(0)
+        assert summary["median"] == 20
+        assert summary["censored"] == pytest.approx(1 / 3)
@@ -0,0 +1,130 @@
+"""
+Tests for the UI system.
+"""
+
+import pygame
+from newgame.config.constants import COLORS
+from newgame.config.settings import SCREEN_WIDTH, SCREEN_HEIGHT
+from newgame.systems import fonts
+from newgame.systems.text_cache import TextCache
+from newgame.systems.ui import UI
+
+
+class TestTextCache:
+    """Test the LRU text surface cache."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        pygame.font.init()
+        self.font = pygame.font.Font(None, 24)
+
+    def test_hit_returns_same_surface(self):
+        """Test rendering the same text twice reuses the surface."""
+        cache = TextCache()
+        first = cache.render(self.font, "Food", COLORS["WHITE"])
+        second = cache.render(self.font, "Food", COLORS["WHITE"])
+        assert first is second
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_key_includes_color_and_antialias(self):
+        """Test different colors or antialiasing are cached separately."""
+        cache = TextCache()
+        cache.render(self.font, "Food", COLORS["WHITE"])
+        cache.render(self.font, "Food", COLORS["RED"])
+        cache.render(self.font, "Food", COLORS["WHITE"], antialias=False)
+        assert cache.misses == 3
+        assert len(cache) == 3
+
+    def test_lru_eviction(self):
+        """Test the least recently used entry is evicted when full."""
+        cache = TextCache(max_entries=2)
+        cache.render(self.font, "a", COLORS["WHITE"])
+        cache.render(self.font, "b", COLORS["WHITE"])
+        cache.render(self.font, "a", COLORS["WHITE"])
+        cache.render(self.font, "c", COLORS["WHITE"])
+        assert len(cache) == 2
+        cache.render(self.font, "a", COLORS["WHITE"])
+        assert cache.hits == 2
+        cache.render(self.font, "b", COLORS["WHITE"])
+        assert cache.misses == 4
+
+
+class TestFonts:
+    """Test the shared lazy font cache."""
+
+    def test_font_loaded_once(self):
+        """Test each size is loaded once and then shared."""
+        font = fonts.get_font(30)
+        assert fonts.get_font(30) is font
+        assert UI().font is UI().font
+
+    def test_reloaded_after_quit(self):
+        """Test fonts are reloaded once the font module was shut down."""
+        font = fonts.get_font(30)
+        pygame.font.quit()
+        assert fonts.get_font(30) is not font
+        assert pygame.font.get_init()
+
+    def test_ui_creation_loads_nothing(self):
+        """Test fonts are only loaded when text is first drawn."""
+        pygame.font.quit()
+        fonts.get_font(18)
+        ui = UI()
+        assert set(fonts._fonts) == {(None, 18)}
+        ui.draw_hud(pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)), 100)
+        assert (None, 36) in fonts._fonts
+
+
+class TestUI:
+    """Test UI drawing."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        pygame.init()
+        self.ui = UI()
+        self.screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+
+    def test_steady_state_hud_uses_cache(self):
+        """Test redrawing an unchanged HUD renders no new text."""
+        for _ in range(60):
+            self.ui.draw_hud(self.screen, 100)
+        assert self.ui.text_cache.misses == 1
+        assert self.ui.text_cache.hits == 59
+
+    def test_menus_use_cache(self):
+        """Test pause and game over text is rendered once."""
+        for _ in range(10):
+            self.ui.draw_pause_menu(self.screen)
+            self.ui.draw_game_over_screen(self.screen, 42)
+        misses = self.ui.text_cache.misses
+        self.ui.draw_pause_menu(self.screen)
+        self.ui.draw_game_over_screen(self.screen, 42)
+        assert self.ui.text_cache.misses == misses
+
+    def test_menu_overlays_built_once(self):
+        """Test menus reuse their overlay and composed panel every frame."""
+        self.ui.draw_pause_menu(self.screen)
+        self.ui.draw_game_over_screen(self.screen, 1)
+        overlays = dict(self.ui.menus.overlays)
+        menus = dict(self.ui.menus.menus)
+        for _ in range(10):
+            self.ui.draw_pause_menu(self.screen)
+            self.ui.draw_game_over_screen(self.screen, 1)
+        assert len(overlays) == 1
+        assert self.ui.menus.overlays == overlays
+        assert self.ui.menus.menus == menus
+
+    def test_menus_per_resolution(self):
+        """Test each screen size gets its own composed menu."""
+        small = pygame.Surface((400, 300))
+        self.ui.draw_pause_menu(self.screen)
+        buttons = self.ui.draw_pause_menu(small)
+        assert len(self.ui.menus.overlays) == 2
+        assert buttons["resume"].centerx == 200
+
+    def test_survival_time_redrawn(self):
+        """Test the survival time counter still updates."""
+        self.ui.draw_game_over_screen(self.screen, 1)
+        misses = self.ui.text_cache.misses
+        self.ui.draw_game_over_screen(self.screen, 2)
+        assert self.ui.text_cache.misses == misses + 1
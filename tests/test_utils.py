@@ -2,8 +2,11 @@
 Tests for utility functions.
 """
 
+import random
 import pytest
 from newgame.utils.math import clamp, distance, rect_collision
+from newgame.utils.free_space import FreeSpaceSampler
+from newgame.utils.spatial import SpatialHashGrid
 import pygame
 
 
@@ -34,3 +37,147 @@ class TestMathUtils:
         assert rect_collision(rect1, rect2) == True
         assert rect_collision(rect1, rect3) == False
         assert rect_collision(rect2, rect3) == False
+
+
+class TestSpatialHashGrid:
+    """Test the uniform grid spatial index."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.grid = SpatialHashGrid(32, 8)
+        self.hit = lambda item, rect: rect.colliderect(item)
+
+    def _insert(self, x, y):
+        item = pygame.Rect(x, y, 8, 8)
+        self.grid.insert(item, x, y)
+        return item
+
+    def test_finds_items_across_cell_borders(self):
+        """Test items anchored in a neighbouring cell are still found."""
+        item = self._insert(28, 28)  # Anchored in cell (0, 0), reaches (1, 1)
+        assert self.grid.colliding(pygame.Rect(33, 33, 5, 5), self.hit) == [item]
+
+    def test_ignores_distant_items(self):
+        """Test items away from the query rect are not returned."""
+        self._insert(500, 500)
+        assert self.grid.colliding(pygame.Rect(0, 0, 20, 20), self.hit) == ()
+
+    def test_remove(self):
+        """Test removed items are no longer found."""
+        item = self._insert(10, 10)
+        self.grid.remove(item, 10, 10)
+        assert len(self.grid) == 0
+        assert self.grid.colliding(pygame.Rect(0, 0, 20, 20), self.hit) == ()
+        assert not self.grid.cells
+
+    def test_matches_linear_scan(self):
+        """Test grid queries agree with a brute-force scan."""
+        rng = random.Random(5)
+        items = [
+            self._insert(rng.randint(0, 300), rng.randint(0, 300)) for _ in range(300)
+        ]
+        for _ in range(100):
+            query = pygame.Rect(rng.randint(-20, 300), rng.randint(-20, 300), 20, 20)
+            expected = {id(item) for item in items if query.colliderect(item)}
+            found = {id(item) for item in self.grid.colliding(query, self.hit)}
+            assert found == expected
+
+
+class TestFreeSpaceSampler:
+    """Test the free-space spawn position sampler."""
+
+    def _brute_force(self, bounds, size, obstacles):
+        """Return every valid position by testing each one."""
+        return {
+            (x, y)
+            for x in range(bounds.left, bounds.right)
+            for y in range(bounds.top, bounds.bottom)
+            if pygame.Rect(x, y, size, size).collidelist(obstacles) == -1
+        }
+
+    def _covered(self, sampler):
+        """Return the positions covered by the free rects, checking disjointness."""
+        points = set()
+        total = 0
+        for rect in sampler.free_rects:
+            total += rect.width * rect.height
+            points.update(
+                (x, y)
+                for x in range(rect.left, rect.right)
+                for y in range(rect.top, rect.bottom)
+            )
+        assert total == len(points), "free rects overlap"
+        return points
+
+    def test_matches_brute_force_through_changes(self):
+        """Test incremental updates keep the exact free space."""
+        rng = random.Random(11)
+        bounds = pygame.Rect(2, 3, 40, 30)
+        sampler = FreeSpaceSampler(bounds, 4)
+        obstacles = []
+        for step in range(200):
+            if obstacles and rng.random() < 0.45:
+                rect = obstacles.pop(rng.randrange(len(obstacles)))
+                sampler.remove_obstacle(rect)
+            else:
+                rect = pygame.Rect(
+                    rng.randint(-5, 45), rng.randint(-5, 35), rng.randint(1, 9), 4
+                )
+                obstacles.append(rect)
+                sampler.add_obstacle(rect)
+            if step % 10 == 0:
+                expected = self._brute_force(bounds, 4, obstacles)
+                assert self._covered(sampler) == expected
+
+    def test_samples_are_free(self):
+        """Test sampled positions never overlap an obstacle."""
+        rng = random.Random(2)
+        obstacles = [pygame.Rect(50, 50, 60, 40), pygame.Rect(0, 0, 200, 10)]
+        sampler = FreeSpaceSampler(pygame.Rect(0, 0, 193, 193), 8, obstacles)
+        for _ in range(2000):
+            x, y = sampler.sample(rng)
+            assert pygame.Rect(x, y, 8, 8).collidelist(obstacles) == -1
+            assert 0 <= x < 193 and 0 <= y < 193
+
+    def test_sampling_is_uniform(self):
+        """Test each half of an L-shaped free area gets its share of samples."""
+        rng = random.Random(3)
+        # Free space: a 100x50 strip on top and a 50x50 block below-left
+        sampler = FreeSpaceSampler(
+            pygame.Rect(0, 0, 100, 100), 1, [pygame.Rect(50, 50, 50, 50)]
+        )
+        samples = [sampler.sample(rng) for _ in range(30000)]
+        top = sum(1 for x, y in samples if y < 50) / len(samples)
+        assert abs(top - 2 / 3) < 0.02
+
+    def test_occupants_are_avoided(self):
+        """Test unoccupied samples miss occupants until no cell is left."""
+        rng = random.Random(4)
+        obstacles = [pygame.Rect(50, 50, 60, 40)]
+        sampler = FreeSpaceSampler(pygame.Rect(0, 0, 193, 193), 8, obstacles)
+        items = []
+        while True:
+            position = sampler.sample_unoccupied(rng)
+            if position is None:
+                break
+            item = pygame.Rect(position, (8, 8))
+            assert item.collidelist(obstacles + items) == -1
+            sampler.add_occupant(item)
+            items.append(item)
+        assert len(items) > 50
+        assert not any(sampler._available)
+
+        # Removing an item frees its cells again, and only those
+        sampler.remove_occupant(items[0])
+        for _ in range(200):
+            position = sampler.sample_unoccupied(rng)
+            assert pygame.Rect(position, (8, 8)).collidelist(items[1:]) == -1
+        sampler.clear_occupants()
+        assert sampler.sample_unoccupied(rng) is not None
+
+    def test_full_area_returns_none(self):
+        """Test a fully blocked area reports that nothing is free."""
+        sampler = FreeSpaceSampler(pygame.Rect(0, 0, 10, 10), 2)
+        sampler.add_obstacle(pygame.Rect(-5, -5, 30, 30))
+        assert sampler.sample(random) is None
+        assert sampler.free_area() == 0
@@ -0,0 +1,267 @@
+"""
+Tests for the streaming world map.
+"""
+
+import random
+import threading
+import pygame
+from newgame.core.clock import SimulationClock
+from newgame.core.game import BeaverSurvivalGame
+from newgame.core.prefetch import ScreenPrefetcher
+from newgame.core.world import (
+    WorldManager,
+    Screen,
+    NO_RECT,
+    NORTH,
+    SOUTH,
+    WEST,
+    EAST,
+)
+from newgame.config.settings import (
+    HOME_SCREEN_COORD,
+    WORLD_SIZE,
+    SCREEN_WIDTH,
+    SCREEN_HEIGHT,
+    DEFAULT_SETTINGS,
+)
+from newgame.entities.player import Player
+from newgame.systems.sprites import atlas
+
+HOME = tuple(HOME_SCREEN_COORD)
+
+
+def make_world(max_resident=3):
+    return WorldManager(SimulationClock(), random.Random(0), max_resident=max_resident)
+
+
+class TestScreen:
+    """Test individual world screens."""
+
+    def test_home_has_lodge_and_dam(self):
+        """Test only the home screen holds the lodge and dam."""
+        home = Screen(HOME)
+        other = Screen((0, 0))
+        assert home.lodge is not None and home.dam is not None
+        assert other.lodge is None and other.dam is None
+        assert other.lodge_rect.width == 0
+
+    def test_pack_round_trip(self):
+        """Test a screen's food survives packing."""
+        screen = Screen((3, 4), SimulationClock(), random.Random(0))
+        screen.food_manager.add_food(100, 200, "berry")
+        screen.food_manager.add_food(300, 400, "leaf")
+        data = screen.pack()
+
+        restored = Screen((3, 4), SimulationClock(), random.Random(1))
+        restored.unpack(data)
+        assert list(restored.food_manager.food_items) == list(
+            screen.food_manager.food_items
+        )
+        assert restored.food_manager.spawn_interval == (
+            screen.food_manager.spawn_interval
+        )
+
+
+class TestWorldManager:
+    """Test screen loading, eviction and travel."""
+
+    def test_starts_at_home(self):
+        """Test the world starts on the home screen."""
+        assert make_world().current.coord == HOME
+
+    def test_dam_blocks_north(self):
+        """Test the dam blocks travel across the home screen's north border."""
+        world = make_world()
+        assert world.neighbor(HOME, NORTH) is None
+        assert world.neighbor((HOME[0], HOME[1] - 1), SOUTH) is None
+        assert world.neighbor(HOME, EAST) == (HOME[0] + 1, HOME[1])
+
+    def test_world_edges(self):
+        """Test there are no screens outside the world."""
+        world = make_world()
+        assert world.neighbor((0, 0), WEST) is None
+        assert world.neighbor((WORLD_SIZE - 1, 0), EAST) is None
+
+    def test_resident_screens_are_bounded(self):
+        """Test far screens are evicted to the archive."""
+        world = make_world(max_resident=3)
+        for _ in range(4):
+            world.enter(EAST)
+        for _ in range(4):
+            world.enter(SOUTH)
+        assert len(world.screens) == 3
+        assert world.current.coord in world.screens
+        assert len(world.archive) == 6
+
+    def test_evicted_screen_is_restored(self):
+        """Test revisiting an evicted screen brings its food back."""
+        world = make_world(max_resident=2)
+        world.current.food_manager.add_food(120, 240, "leaf")
+        before = list(world.current.food_manager.food_items)
+        world.enter(WEST)
+        world.enter(WEST)
+        assert HOME in world.archive
+
+        world.enter(EAST)
+        world.enter(EAST)
+        assert world.current.coord == HOME
+        assert list(world.current.food_manager.food_items) == before
+        assert HOME not in world.archive
+
+    def test_preload_near_edge(self):
+        """Test screens next to the player are loaded ahead of time."""
+        world = make_world(max_resident=4)
+        world.preload_near(pygame.Rect(5, 300, 20, 20))
+        assert (HOME[0] - 1, HOME[1]) in world.screens
+        assert (HOME[0] + 1, HOME[1]) not in world.screens
+        assert next(reversed(world.screens)) == HOME
+
+
+class TestWorldGame:
+    """Test walking between screens in the game."""
+
+    def test_walk_east_to_next_screen(self):
+        """Test leaving through the east edge enters the neighbouring screen."""
+        game = BeaverSurvivalGame(headless=True, seed=1, world=True)
+        keys = {pygame.K_d: True}
+        for _ in range(SCREEN_WIDTH):
+            game.step(keys)
+            if game.current_screen.coord != HOME:
+                break
+        assert game.current_screen.coord == (HOME[0] + 1, HOME[1])
+        assert game.player.rect.left == 0
+        assert game.lodge is None
+        assert game.food_manager is game.current_screen.food_manager
+
+    def test_walk_through_every_edge(self):
+        """Test the north, west and south edges can be crossed too."""
+        game = BeaverSurvivalGame(headless=True, seed=1, world=True)
+        east = (HOME[0] + 1, HOME[1])
+        game._set_screen(game.world.enter(EAST))
+        for key, direction in (
+            (pygame.K_w, NORTH),
+            (pygame.K_s, SOUTH),
+            (pygame.K_a, WEST),
+        ):
+            coord = game.current_screen.coord
+            for _ in range(SCREEN_WIDTH):
+                game.step({key: True})
+                if game.current_screen.coord != coord:
+                    break
+            assert game.current_screen.coord == (
+                coord[0] + direction[0],
+                coord[1] + direction[1],
+            )
+        assert game.current_screen.coord == HOME
+        assert east in game.world.screens
+
+    def test_dam_keeps_player_home(self):
+        """Test walking north on the home screen never leaves it."""
+        game = BeaverSurvivalGame(headless=True, seed=1, world=True)
+        game.run_headless(SCREEN_HEIGHT, {pygame.K_w: True})
+        assert game.current_screen.coord == HOME
+
+    def test_restart_returns_home(self):
+        """Test restarting resets the world."""
+        game = BeaverSurvivalGame(headless=True, seed=1, world=True)
+        game.run_headless(SCREEN_HEIGHT // 3, {pygame.K_s: True})
+        assert game.current_screen.coord == (HOME[0], HOME[1] + 1)
+        game._restart_game()
+        assert game.current_screen.coord == HOME
+        assert game.world.archive == {}
+
+
+class TestScreenPrefetcher:
+    """Test building screens ahead of the player on a worker thread."""
+
+    def make_prefetcher(self, max_resident=3):
+        world = make_world(max_resident)
+        return world, ScreenPrefetcher(world, lookahead=30)
+
+    def test_predicts_screen_ahead(self):
+        """Test the screen the player is walking towards is prefetched."""
+        world, prefetcher = self.make_prefetcher()
+        player = Player(SCREEN_WIDTH - 60, 300)
+        player.update({pygame.K_d: True}, NO_RECT, NO_RECT)
+        prefetcher.update(player)
+        east = (HOME[0] + 1, HOME[1])
+        assert list(prefetcher.pending) == [east]
+
+        screen = world.enter(EAST)
+        assert screen.coord == east
+        assert screen.food_manager.rng is world.rng
+        assert not prefetcher.pending
+        prefetcher.shutdown()
+
+    def test_no_prefetch_when_far_from_edges(self):
+        """Test nothing is built while the player is far from every edge."""
+        world, prefetcher = self.make_prefetcher()
+        player = Player(400, 300)
+        player.update({pygame.K_d: True}, NO_RECT, NO_RECT)
+        prefetcher.update(player)
+        assert not prefetcher.pending
+        prefetcher.shutdown()
+
+    def test_prefetch_restores_archived_screen(self):
+        """Test a prefetched screen comes back with its archived food."""
+        world, prefetcher = self.make_prefetcher(max_resident=1)
+        world.current.food_manager.add_food(120, 240, "berry")
+        before = list(world.current.food_manager.food_items)
+        world.enter(EAST)
+        assert HOME in world.archive
+
+        prefetcher.submit(HOME)
+        world.enter(WEST)
+        assert list(world.current.food_manager.food_items) == before
+        assert world.current.background.surface is None
+        prefetcher.shutdown()
+
+    def test_background_prerendered(self):
+        """Test prefetched screens arrive with their background rendered."""
+        world, prefetcher = self.make_prefetcher()
+        target = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        prefetcher.submit((HOME[0] - 1, HOME[1]), target)
+        screen = world.enter(WEST)
+        assert screen.background.surface is not None
+        assert screen.background.builds == 1
+        prefetcher.shutdown()
+
+    def test_sprites_registered_on_main_thread(self, monkeypatch):
+        """Test builds with a custom food size never write to the atlas."""
+        settings = DEFAULT_SETTINGS.replace(food_size=11)
+        world = WorldManager(SimulationClock(), random.Random(0), settings=settings)
+        # As if the home screen had not registered them already
+        for name in ("berry_11", "leaf_11"):
+            monkeypatch.delitem(atlas.sprites, name)
+        prefetcher = ScreenPrefetcher(world)
+        assert "berry_11" in atlas.sprites and "leaf_11" in atlas.sprites
+
+        register = atlas.register
+        writers = []
+
+        def record(*args):
+            writers.append(threading.current_thread())
+            register(*args)
+
+        monkeypatch.setattr(atlas, "register", record)
+        prefetcher.submit((HOME[0] - 1, HOME[1]))
+        screen = world.enter(WEST)
+        assert screen.food_manager.sprites[0] == "berry_11"
+        assert all(thread is threading.main_thread() for thread in writers)
+        prefetcher.shutdown()
+
+    def test_reset_cancels_pending(self):
+        """Test resetting the world drops pending builds."""
+        world, prefetcher = self.make_prefetcher()
+        prefetcher.submit((HOME[0] - 1, HOME[1]))
+        world.reset()
+        assert not prefetcher.pending
+        prefetcher.shutdown()
+
+    def test_game_with_prefetch(self):
+        """Test walking across a screen edge with prefetching enabled."""
+        game = BeaverSurvivalGame(headless=True, seed=1, world=True, prefetch=True)
+        game.run_headless(SCREEN_WIDTH // 4, {pygame.K_d: True})
+        assert game.current_screen.coord == (HOME[0] + 1, HOME[1])
+        assert game.current_screen.background.surface is not None
+        game.prefetcher.shutdown()